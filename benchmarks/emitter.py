@@ -0,0 +1,61 @@
+import argparse
+import sys
+import timeit
+
+from network.base.emitter import EventEmitter
+from network.base.machine import StateMachine
+
+
+# Utils
+class Listener:
+    def __init__(self):
+        self.count = 0
+
+    def on_event(self, *args, **kwargs):
+        self.count += 1
+
+
+def bench(name: str, emitter, number: int, listeners: int):
+    objs = [Listener() for _ in range(listeners)]
+
+    for obj in objs:
+        emitter.on('event', obj.on_event)
+
+    duration = timeit.timeit(lambda: emitter.emit('event', 1, was='down'), number=number)
+    print(f'{name:<26} {duration / number * 1e9:8.0f} ns/emit ({listeners} listeners)')
+
+
+def bench_machine(number: int):
+    machine = StateMachine('down')
+    listener = Listener()
+
+    machine.on('up', listener.on_event)
+    machine.on('down', listener.on_event)
+
+    def toggle():
+        machine.state = 'up'
+        machine.state = 'down'
+
+    duration = timeit.timeit(toggle, number=number)
+    print(f'{"StateMachine":<26} {duration / number / 2 * 1e9:8.0f} ns/state change')
+
+
+if __name__ == '__main__':
+    # Arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", "-n", type=int, default=200000)
+
+    args = parser.parse_args(sys.argv[1:])
+
+    # Run !
+    for count in (1, 4):
+        bench('network EventEmitter', EventEmitter(), args.number, count)
+
+        try:
+            from pyee.asyncio import AsyncIOEventEmitter
+            bench('pyee AsyncIOEventEmitter', AsyncIOEventEmitter(), args.number, count)
+
+        except ImportError:
+            print('pyee is not installed, skipping comparison')
+
+    bench_machine(args.number)
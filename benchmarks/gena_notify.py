@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import sys
+import time
+
+from network.gena.server import GENAServer, TRANSPORT_AIOHTTP, TRANSPORT_ASYNCIO
+
+# Constants
+BODY = b'''<?xml version="1.0"?>
+<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">
+    <e:property><Status>OK</Status></e:property>
+</e:propertyset>'''
+
+
+# Utils
+class Subscription:
+    def __init__(self):
+        self.id = 'bench'
+        self.expired = False
+        self.count = 0
+
+    def _event(self, seq: int, body: bytes):
+        self.count += 1
+
+    def _drop(self, seq: int):
+        pass
+
+
+def request(seq: int) -> bytes:
+    return (
+        f'NOTIFY /cb HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        f'NT: upnp:event\r\nNTS: upnp:propchange\r\nSID: uuid:bench\r\nSEQ: {seq}\r\n'
+        f'Content-Type: text/xml\r\nContent-Length: {len(BODY)}\r\n\r\n'
+    ).encode() + BODY
+
+
+async def client(port: int, number: int):
+    # Raw keep-alive connection, one request at a time
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    for seq in range(number):
+        writer.write(request(seq))
+        await reader.readuntil(b'\r\n\r\n')
+
+    writer.close()
+
+
+async def bench(transport: str, port: int, number: int, connections: int):
+    # Queue large enough to hold every event: nothing dropped
+    server = GENAServer(host='127.0.0.1', port=port, transport=transport, max_queue=number * connections)
+    sub = Subscription()
+    server.register(sub)
+
+    await server.start()
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(port, number) for _ in range(connections)))
+        duration = time.perf_counter() - start
+
+    finally:
+        await server.stop()
+
+    total = number * connections
+    print(
+        f'{transport:<8} {duration / total * 1e6:8.1f} us/notify '
+        f'({total / duration:8.0f} notify/s, {connections} connections)'
+    )
+
+
+if __name__ == '__main__':
+    # Arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", "-n", type=int, default=5000)
+    parser.add_argument("--port", "-p", type=int, default=8765)
+
+    args = parser.parse_args(sys.argv[1:])
+
+    # Run !
+    for count in (1, 8):
+        asyncio.run(bench(TRANSPORT_AIOHTTP, args.port, args.number, count))
+        asyncio.run(bench(TRANSPORT_ASYNCIO, args.port, args.number, count))
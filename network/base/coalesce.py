@@ -0,0 +1,128 @@
+import asyncio
+
+from typing import Any, Callable, Optional, Tuple
+
+# Types
+Merge = Callable[[Tuple[Any, ...], Tuple[Any, ...]], Optional[Tuple[Any, ...]]]
+
+
+# Utils
+def keep_latest(pending: Tuple[Any, ...], args: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    return args
+
+
+# Class
+class Coalescer:
+    """
+    class Coalescer:
+    Wraps a listener, coalescing calls according to a policy (latest value wins):
+    - window       : a call is delayed until no other call came for window seconds
+    - min_interval : at least min_interval seconds between two calls of the listener (rate limit)
+    - max_delay    : a delayed call is never held more than max_delay seconds (unless min_interval forbids it)
+
+    Pending and new arguments are combined by merge (default keeps the latest ones), merge may return None
+    to drop the pending call. Can be registered on an emitter in place of its target:
+    emitter.remove_listener(event, target) also removes the coalescer.
+    """
+
+    __slots__ = (
+        'target', 'window', 'min_interval', 'max_delay', 'merge',
+        'calls', 'emitted',
+        '_pending', '_first', '_last', '_handle'
+    )
+
+    def __init__(
+            self, target: Callable, *,
+            window: float = 0, min_interval: float = 0, max_delay: Optional[float] = None,
+            merge: Merge = keep_latest
+    ):
+        # Attributes
+        self.target = target
+        self.window = window
+        self.min_interval = min_interval
+        self.max_delay = max_delay
+        self.merge = merge
+
+        # - metrics
+        self.calls = 0
+        self.emitted = 0
+
+        # - internals
+        self._pending = None  # type: Optional[Tuple[Any, ...]]
+        self._first = 0.0     # first pending call
+        self._last = None     # type: Optional[float]
+        self._handle = None   # type: Optional[asyncio.TimerHandle]
+
+    def __repr__(self):
+        return f'<Coalescer: {self.emitted}/{self.calls} calls of {self.target!r}>'
+
+    def __call__(self, *args):
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        self.calls += 1
+
+        if self._pending is None:
+            self._pending = args
+            self._first = now
+        else:
+            self._pending = self.merge(self._pending, args)
+
+            if self._pending is None:
+                self.cancel()
+                return
+
+        # Compute due time
+        due = now + self.window
+
+        if self.max_delay is not None:
+            due = min(due, self._first + self.max_delay)
+
+        if self._last is not None:
+            due = max(due, self._last + self.min_interval)
+
+        if due <= now:
+            self.flush()
+            return
+
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._handle = loop.call_at(due, self.flush)
+
+    # Methods
+    def flush(self):
+        """
+        Calls the listener with pending arguments, if any.
+        """
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if self._pending is None:
+            return
+
+        args, self._pending = self._pending, None
+        self._last = asyncio.get_event_loop().time()
+        self.emitted += 1
+
+        result = self.target(*args)
+
+        if result is not None and asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    def cancel(self):
+        """
+        Drops pending arguments.
+        """
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        self._pending = None
+
+    # Properties
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
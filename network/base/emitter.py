@@ -1,13 +1,334 @@
 import asyncio
+import inspect
+import logging
+import weakref
 
-from pyee import AsyncIOEventEmitter
+from collections import deque
+from types import MethodType
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Optional, Set, Tuple
+
+# Types
+Listener = Callable[..., Any]
+
+# Logging
+logger = logging.getLogger('emitter')
 
 
 # Class
-class EventEmitter(AsyncIOEventEmitter):
+class SerialDispatcher:
+    """
+    class SerialDispatcher:
+    Runs coroutine handlers of each emitter one after the other, in emit order.
+    The number of handlers running at the same time across all emitters is bounded by concurrency.
+    """
+
+    def __init__(self, concurrency: int = 32):
+        # Attributes
+        self.concurrency = concurrency
+
+        # - metrics
+        self.queued = 0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.max_depth = 0
+
+        # - internals
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._queues = {}       # type: Dict[EventEmitter, Deque[Coroutine]]
+
+    def __repr__(self):
+        return f'<SerialDispatcher: {self.in_flight} running, {self.queued} queued>'
+
     # Methods
-    async def wait(self, event: str):
-        e = asyncio.Event()
-        self.on(event, lambda *_: e.set())
+    async def _run(self, emitter: 'EventEmitter', queue: Deque[Coroutine]):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        try:
+            while queue:
+                coro = queue.popleft()
+                self.queued -= 1
+
+                async with self._semaphore:
+                    self.in_flight += 1
+
+                    try:
+                        await coro
+
+                    except asyncio.CancelledError:
+                        raise
+
+                    except Exception as exc:
+                        try:
+                            emitter.emit('error', exc)
+
+                        except Exception:
+                            logger.exception(f'Unhandled error in {emitter!r} handler')
+
+                    finally:
+                        self.in_flight -= 1
+                        self.dispatched += 1
+
+        finally:
+            # Cancelled: drop remaining handlers
+            while queue:
+                queue.popleft().close()
+                self.queued -= 1
+
+            del self._queues[emitter]
+
+    def dispatch(self, emitter: 'EventEmitter', coro: Coroutine):
+        queue = self._queues.get(emitter)
+
+        if queue is None:
+            queue = deque()
+            self._queues[emitter] = queue
+
+            asyncio.ensure_future(self._run(emitter, queue))
+
+        queue.append(coro)
+        self.queued += 1
+        self.max_depth = max(self.max_depth, len(queue))
+
+    def depth(self, emitter: 'EventEmitter') -> int:
+        queue = self._queues.get(emitter)
+        return 0 if queue is None else len(queue)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self.queued,
+            'in_flight': self.in_flight,
+            'dispatched': self.dispatched,
+            'queues': len(self._queues),
+            'max_depth': self.max_depth,
+        }
+
+
+class _WeakListener:
+    """
+    References a bound method without keeping its instance alive
+    """
+
+    __slots__ = ('ref', 'func')
+
+    def __init__(self, method: Callable, on_dead: Callable):
+        self.ref = weakref.ref(method.__self__, on_dead)
+        self.func = method.__func__
+
+    # Properties
+    @property
+    def target(self) -> Optional[Callable]:
+        obj = self.ref()
+        return None if obj is None else MethodType(self.func, obj)
+
+
+class _OnceListener:
+    """
+    Removes itself from the emitter before calling the listener
+    """
+
+    __slots__ = ('emitter', 'event', 'target')
+
+    def __init__(self, emitter: 'EventEmitter', event: str, listener: Listener):
+        self.emitter = emitter
+        self.event = event
+        self.target = listener
+
+    def __call__(self, *args, **kwargs):
+        if not self.emitter.remove_listener(self.event, self):
+            return None
+
+        return self.target(*args, **kwargs)
+
+
+class EventEmitter:
+    """
+    class EventEmitter:
+    Calls listeners registered for an event each time it is emitted.
+
+    Listeners of each event are kept in a tuple rebuilt on registration, so emit only iterates over it.
+    Bound methods are weakly referenced (unless weak=False), their listener is removed as soon as
+    their instance is garbage collected. Coroutine listeners are scheduled as tasks, or queued
+    on the dispatcher if one is set. Errors raised by listeners are emitted as 'error' events,
+    an 'error' event without listener raises the error.
+    """
+
+    # Attributes
+    dispatcher = None  # type: Optional[SerialDispatcher]
+
+    def __init__(self):
+        super().__init__()
+
+        # Attributes
+        self._events = {}      # type: Dict[str, Tuple[Listener, ...]]
+        self._running = set()  # type: Set[asyncio.Future]
+
+    # Methods
+    def _schedule(self, coro: Coroutine):
+        if self.dispatcher is not None:
+            self.dispatcher.dispatch(self, coro)
+            return
+
+        task = asyncio.ensure_future(coro)
+        self._running.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Future):
+        self._running.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            self.emit('error', task.exception())
+
+    def _prune(self, event: str):
+        listeners = tuple(
+            listener for listener in self._events.get(event, ())
+            if not (isinstance(listener, _WeakListener) and listener.target is None)
+        )
+
+        if listeners:
+            self._events[event] = listeners
+        else:
+            self._events.pop(event, None)
+
+    def _find(self, event: str, f: Listener) -> Optional[Listener]:
+        for listener in self._events.get(event, ()):
+            if listener is f or getattr(listener, 'target', listener) == f:
+                return listener
+
+        return None
+
+    def _add(self, event: str, listener: Listener):
+        self._events[event] = self._events.get(event, ()) + (listener,)
+
+    def _listener(self, event: str, f: Listener, weak: bool) -> Listener:
+        if weak and inspect.ismethod(f):
+            ref = weakref.ref(self)
+
+            def on_dead(_):
+                emitter = ref()
+
+                if emitter is not None:
+                    emitter._prune(event)
+
+            return _WeakListener(f, on_dead)
+
+        return f
+
+    def on(self, event: str, f: Optional[Listener] = None, *, weak: bool = True):
+        """
+        Registers f as listener of event. Can also be used as a decorator (when f is not given).
+        A listener registered with once becomes a permanent one.
+        """
+
+        if f is None:
+            return lambda g: self.on(event, g, weak=weak)
+
+        found = self._find(event, f)
+
+        if found is None:
+            self._add(event, self._listener(event, f, weak))
+
+        elif isinstance(found, _OnceListener):
+            # Upgraded in place (keeps its order)
+            listener = self._listener(event, f, weak)
+            self._events[event] = tuple(listener if other is found else other for other in self._events[event])
+
+        return f
+
+    add_listener = on
+
+    def once(self, event: str, f: Optional[Listener] = None):
+        """
+        Registers f as listener of the next event. Can also be used as a decorator (when f is not given).
+        Does nothing if f is already a listener of event.
+        """
+
+        if f is None:
+            return lambda g: self.once(event, g)
+
+        if self._find(event, f) is None:
+            self._add(event, _OnceListener(self, event, f))
+
+        return f
+
+    def remove_listener(self, event: str, f: Listener) -> bool:
+        listener = self._find(event, f)
+
+        if listener is None:
+            return False
+
+        listeners = tuple(other for other in self._events[event] if other is not listener)
+
+        if listeners:
+            self._events[event] = listeners
+        else:
+            del self._events[event]
+
+        return True
+
+    def remove_all_listeners(self, event: Optional[str] = None):
+        if event is None:
+            self._events = {}
+        else:
+            self._events.pop(event, None)
+
+    def listeners(self, event: str) -> List[Listener]:
+        return [getattr(listener, 'target', listener) for listener in self._events.get(event, ())]
+
+    def event_names(self) -> Set[str]:
+        return set(self._events)
+
+    def emit(self, event: str, *args, **kwargs) -> bool:
+        listeners = self._events.get(event)
+
+        if not listeners:
+            if event == 'error':
+                error = args[0] if args else None
+
+                if isinstance(error, Exception):
+                    raise error
+
+                raise Exception(f'Uncaught, unspecified "error" event: {error}')
+
+            return False
+
+        for listener in listeners:
+            try:
+                if type(listener) is _WeakListener:
+                    obj = listener.ref()
+
+                    if obj is None:
+                        continue
+
+                    result = listener.func(obj, *args, **kwargs)
+
+                else:
+                    result = listener(*args, **kwargs)
+
+            except Exception as exc:
+                self.emit('error', exc)
+                continue
+
+            if result is not None and asyncio.iscoroutine(result):
+                self._schedule(result)
+
+        return True
+
+    async def wait(self, event: str) -> Tuple[Any, ...]:
+        """
+        Waits for the next event, and returns its arguments.
+        """
+
+        future = asyncio.get_event_loop().create_future()
+
+        def listener(*args, **kwargs):
+            if not future.done():
+                future.set_result(args)
+
+        self.on(event, listener)
+
+        try:
+            return await future
 
-        await e.wait()
+        finally:
+            self.remove_listener(event, listener)
@@ -1,5 +1,12 @@
-from .error import GENAError
-from .run import get_gena_server, get_gena_session
+from .client import GENAClient
+from .error import GENAError, GENAShardError
+from .protocol import GENANotifyProtocol
+from .persist import GENASubscriptionStore
+from .run import configure_gena_server, configure_gena_store, get_gena_client, get_gena_server, get_gena_session
 from .server import GENAServer
 from .session import GENASession
+from .shard import shard_for
 from .subscription import GENASubscription
+
+# Uses the SSDP receive path: imported last, network.ssdp depends on the names above
+from .multicast import GENAMulticastListener
@@ -0,0 +1,220 @@
+import aiohttp
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+
+from collections import Counter
+from network.utils.http import close_session
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .subscription import GENASubscription
+
+# Types
+Renew = Callable[[GENASubscription], Awaitable[Any]]
+
+# Logging
+logger = logging.getLogger('gena')
+
+
+# Class
+class GENAClient:
+    """
+    class GENAClient:
+    HTTP client shared by GENA sessions, and central scheduler of their renewals.
+
+    Renewals are due after ratio * timeout seconds, minus a random jitter (up to jitter * timeout)
+    so that subscriptions made together do not renew together. All renewals due within batch seconds
+    are sent at once. Initial SUBSCRIBE requests are spread, at most rate per second.
+    """
+
+    def __init__(
+            self, *,
+            limit_per_host: int = 2, keepalive_timeout: float = 30,
+            ratio: float = 0.8, jitter: float = 0.1, batch: float = 1, rate: float = 50
+    ):
+        # Attributes
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ratio = ratio
+        self.jitter = jitter
+        self.batch = batch
+        self.rate = rate
+
+        # - metrics
+        self.metrics = Counter()  # type: Counter[str]
+
+        # - internals
+        self._loop = None     # type: Optional[asyncio.AbstractEventLoop]
+        self._session = None  # type: Optional[aiohttp.ClientSession]
+        self._next_slot = 0.0
+
+        self._heap = []     # heap of (due, order, subscription)
+        self._due = {}      # type: Dict[GENASubscription, float]
+        self._renews = {}   # type: Dict[GENASubscription, Renew]
+        self._counter = itertools.count()
+        self._worker_loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._wakeup = None       # type: Optional[asyncio.Event]
+        self._worker = None       # type: Optional[asyncio.Task]
+
+    def __repr__(self):
+        return f'<GENAClient: {len(self._due)} subscriptions>'
+
+    # Methods
+    def _push(self, sub: GENASubscription, due: float):
+        self._due[sub] = due
+        heapq.heappush(self._heap, (due, next(self._counter), sub))
+
+        # Wake up worker (bound to its loop)
+        loop = asyncio.get_event_loop()
+
+        if self._worker is None or self._worker.done() or self._worker_loop is not loop:
+            self._worker_loop = loop
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._work())
+
+        self._wakeup.set()
+
+    def _pop_due(self, until: float) -> List[GENASubscription]:
+        subs = []
+
+        while self._heap and self._heap[0][0] <= until:
+            due, _, sub = heapq.heappop(self._heap)
+
+            # Skip cancelled or rescheduled entries
+            if self._due.get(sub) != due:
+                continue
+
+            del self._due[sub]
+
+            if not sub.expired:
+                subs.append(sub)
+
+        return subs
+
+    async def _renew(self, sub: GENASubscription):
+        renew = self._renews.get(sub)
+
+        if renew is None:
+            return
+
+        try:
+            await renew(sub)
+
+        except Exception as err:
+            self.metrics['failures'] += 1
+            self._renews.pop(sub, None)
+            logger.warning(f'Unable to renew subscription {sub.id}: {err!r}')
+
+        else:
+            self.metrics['renewals'] += 1
+
+            # Cancelled meanwhile ?
+            if self._renews.get(sub) is renew:
+                self.schedule(sub, renew)
+
+    async def _work(self):
+        loop = asyncio.get_event_loop()
+
+        while True:
+            self._wakeup.clear()
+
+            # Wait for the next due renewal (or an earlier one)
+            if self._heap:
+                delay = self._heap[0][0] - loop.time()
+
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+
+                    except asyncio.TimeoutError:
+                        pass
+
+                    continue
+
+            else:
+                await self._wakeup.wait()
+                continue
+
+            # Renew batch
+            subs = self._pop_due(loop.time() + self.batch)
+
+            if subs:
+                self.metrics['batches'] += 1
+                await asyncio.gather(*(self._renew(sub) for sub in subs))
+
+    async def open(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_event_loop()
+
+        # Sessions are bound to their loop
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None:
+                await close_session(self._session, self._loop)
+
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+
+            self._loop = loop
+            self._session = aiohttp.ClientSession(connector=connector)
+            logger.debug('GENA client opened')
+
+        return self._session
+
+    async def pace(self):
+        """
+        Waits for the next initial SUBSCRIBE slot.
+        """
+
+        now = asyncio.get_event_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+
+        if slot > now:
+            self.metrics['paced'] += 1
+            await asyncio.sleep(slot - now)
+
+    def schedule(self, sub: GENASubscription, renew: Renew):
+        """
+        Schedule renewal of the given subscription, by calling renew(sub).
+        """
+
+        if sub.timeout <= 0:
+            return
+
+        now = asyncio.get_event_loop().time()
+        delay = sub.timeout * self.ratio - random.uniform(0, sub.timeout * self.jitter)
+
+        self._renews[sub] = renew
+        self._push(sub, now + max(delay, 0))
+
+    def cancel(self, sub: GENASubscription):
+        self._due.pop(sub, None)
+        self._renews.pop(sub, None)
+
+    def due(self, sub: GENASubscription) -> Optional[float]:
+        return self._due.get(sub)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        self._heap = []     # heap of (due, order, subscription)
+        self._due = {}
+        self._renews = {}
+
+        if self._session is not None:
+            await self._session.close()
+
+            self._session = None
+            self._loop = None
+            logger.debug('GENA client closed')
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'subscriptions': len(self._due),
+            **self.metrics,
+        }
@@ -6,3 +6,12 @@ class GENAError(Exception):
         # Attributes
         self.code = code
         self.description = description
+
+
+class GENAShardError(Exception):
+    def __init__(self, event: str, shard: int):
+        super().__init__(f'Events of {event} are handled by GENA shard {shard}')
+
+        # Attributes
+        self.event = event
+        self.shard = shard
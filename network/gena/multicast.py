@@ -0,0 +1,139 @@
+import asyncio
+import logging
+
+from network.base.emitter import EventEmitter
+from network.ssdp.limiter import SSDPRateLimiter
+from network.ssdp.message import SSDPMessage
+from network.ssdp.protocol import SSDPProtocol
+from network.ssdp.server import REUSE_PORT
+from network.typing import Address
+from typing import Callable, Dict, Optional
+
+from .server import parse_seq
+from .subscription import parse_propertyset
+
+# Constants
+MULTICAST_EVENT_ADDR = ('239.255.255.246', 7900)
+
+# Types
+EventHandler = Callable[[Dict[str, str], int], None]
+
+# Logging
+logger = logging.getLogger('gena')
+
+
+# Class
+class GENAMulticastListener(EventEmitter):
+    """
+    class GENAMulticastListener:
+    Receives UPnP multicast events (multicast state variables), sent by devices on 239.255.255.246:7900.
+    Datagrams go through the SSDP receive path (SSDPProtocol), then are routed by device uuid
+    (from USN header) and service id (SVCID header) to the registered handlers.
+
+    Events:
+    - event (uuid: str, service_id: str, values: Dict[str, str], seq: int) : each time an event is received
+    """
+
+    def __init__(
+            self, multicast: Address = MULTICAST_EVENT_ADDR, *,
+            ttl: int = 4, limiter: Optional[SSDPRateLimiter] = None
+    ):
+        super().__init__()
+
+        # Attributes
+        self.multicast = multicast
+        self.ttl = ttl
+        self.limiter = limiter
+
+        # - metrics
+        self.received = 0
+        self.routed = 0
+        self.dropped = 0
+
+        # - internals
+        self._protocol = None  # type: Optional[SSDPProtocol]
+        self._handlers = {}    # type: Dict[tuple, EventHandler]
+        self._seqs = {}        # type: Dict[tuple, int]
+
+    def __repr__(self):
+        return f'<GENAMulticastListener: {len(self._handlers)} services>'
+
+    # Methods
+    def _on_message(self, msg: SSDPMessage, addr: Address):
+        if msg.method != 'NOTIFY' or msg.nt != 'upnp:event' or msg.nts != 'upnp:propchange':
+            return
+
+        self.received += 1
+
+        try:
+            usn = msg.usn
+            key = (usn.uuid, msg.headers['SVCID'])
+            seq = parse_seq(msg.headers.get('SEQ'))
+
+            if seq is None:
+                raise ValueError('invalid SEQ header')
+
+            values = parse_propertyset(msg.body)
+
+        except Exception as err:
+            self.dropped += 1
+            logger.warning(f'Invalid multicast event from {addr[0]}: {err!r}')
+            return
+
+        # Out of order events (seq restarts at 0)
+        last = self._seqs.get(key)
+
+        if last is not None and 0 < seq <= last:
+            self.dropped += 1
+            return
+
+        self._seqs[key] = seq
+        self.emit('event', key[0], key[1], values, seq)
+
+        # Route
+        handler = self._handlers.get(key)
+
+        if handler is not None:
+            self.routed += 1
+            handler(values, seq)
+
+    def register(self, uuid: str, service_id: str, handler: EventHandler):
+        self._handlers[(uuid.lower(), service_id)] = handler
+
+    def unregister(self, uuid: str, service_id: str):
+        key = (uuid.lower(), service_id)
+
+        self._handlers.pop(key, None)
+        self._seqs.pop(key, None)
+
+    async def start(self):
+        if self._protocol is not None:
+            return
+
+        loop = asyncio.get_event_loop()
+        _, self._protocol = await loop.create_datagram_endpoint(
+            lambda: SSDPProtocol(self.multicast, ttl=self.ttl, limiter=self.limiter),
+            local_addr=('0.0.0.0', self.multicast[1]),
+            reuse_address=True, reuse_port=REUSE_PORT,
+            allow_broadcast=True
+        )
+
+        self._protocol.on('recv', self._on_message)
+
+    async def stop(self):
+        if self._protocol is not None:
+            await self._protocol.close()
+            self._protocol = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'services': len(self._handlers),
+            'received': self.received,
+            'routed': self.routed,
+            'dropped': self.dropped,
+        }
+
+    # Properties
+    @property
+    def started(self) -> bool:
+        return self._protocol is not None
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+from typing import Optional
+
+from .subscription import GENASubscription
+
+# Constants
+VERSION = 1
+
+# Logging
+logger = logging.getLogger('gena')
+
+
+# Class
+class GENASubscriptionStore:
+    """
+    class GENASubscriptionStore:
+    JSON file holding active subscriptions (SID, event url, timeout, SEQ and last values) by session callback,
+    so that they can be renewed after a restart instead of subscribing again.
+    Changes are written at most every delay seconds (write then rename), save() writes immediately.
+    """
+
+    def __init__(self, path: str, *, delay: float = 1):
+        # Attributes
+        self.path = path
+        self.delay = delay
+
+        # - internals
+        self._sessions = {}   # callback => event url => saved subscription
+        self._callbacks = {}  # event url => callback
+        self._handle = None   # type: Optional[asyncio.TimerHandle]
+
+        self.load()
+
+    def __repr__(self):
+        return f'<GENASubscriptionStore: {len(self._callbacks)} subscriptions>'
+
+    # Methods
+    def _schedule(self):
+        if self._handle is None:
+            self._handle = asyncio.get_event_loop().call_later(self.delay, self.save)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        except FileNotFoundError:
+            return
+
+        except ValueError:
+            logger.warning(f'Invalid subscription store {self.path}, ignored')
+            return
+
+        if data.get('version') != VERSION:
+            return
+
+        self._sessions = data['sessions']
+        self._callbacks = {
+            event: callback
+            for callback, subs in self._sessions.items() for event in subs
+        }
+
+    def save(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        directory = os.path.dirname(self.path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION, 'sessions': self._sessions}, f)
+
+        os.replace(tmp, self.path)
+
+    def callback(self, event: str) -> Optional[str]:
+        """
+        Callback of the session which subscribed to the given event url.
+        """
+
+        return self._callbacks.get(event)
+
+    def get(self, callback: str, event: str) -> Optional[GENASubscription]:
+        """
+        Restores the subscription of the given session to the given event url, if still valid.
+        """
+
+        state = self._sessions.get(callback, {}).get(event)
+
+        if state is None:
+            return None
+
+        if state['expires'] <= time.time():
+            self.remove(callback, event)
+            return None
+
+        return GENASubscription.restore(state)
+
+    def put(self, callback: str, sub: GENASubscription):
+        self._sessions.setdefault(callback, {})[sub.event] = sub.to_dict()
+        self._callbacks[sub.event] = callback
+        self._schedule()
+
+    def remove(self, callback: str, event: str):
+        subs = self._sessions.get(callback)
+
+        if subs is None or event not in subs:
+            return
+
+        del subs[event]
+
+        if not subs:
+            del self._sessions[callback]
+
+        if self._callbacks.get(event) == callback:
+            del self._callbacks[event]
+
+        self._schedule()
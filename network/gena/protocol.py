@@ -0,0 +1,151 @@
+import asyncio
+import logging
+
+from typing import Callable, Dict, Optional
+
+# Constants
+MAX_HEADER_SIZE = 8 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    412: 'Precondition Failed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    503: 'Service Unavailable',
+}
+
+# Types
+NotifyHandler = Callable[[str, Dict[str, str], bytes], int]
+
+# Logging
+logger = logging.getLogger('gena')
+
+
+# Class
+class GENANotifyProtocol(asyncio.Protocol):
+    """
+    class GENANotifyProtocol:
+    Minimal HTTP/1.1 server, only accepting NOTIFY requests with a Content-Length (no chunked bodies).
+    Each request is handed to handler(callback path, headers, body), which returns the response status.
+    Connections are kept alive unless the client asks otherwise.
+    """
+
+    def __init__(self, handler: NotifyHandler):
+        # Attributes
+        self.handler = handler
+
+        # - internals
+        self._buffer = bytearray()
+        self._transport = None  # type: Optional[asyncio.Transport]
+        self._request = None    # type: Optional[tuple]
+
+    # Methods
+    def _respond(self, status: int, close: bool = False):
+        reason = REASONS.get(status, 'Unknown')
+        connection = b'Connection: close\r\n' if close else b''
+
+        self._transport.write(
+            b'HTTP/1.1 %d %s\r\nContent-Length: 0\r\n%s\r\n' % (status, reason.encode(), connection)
+        )
+
+        if close:
+            self._transport.close()
+
+    def _parse_head(self, head: bytes):
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+
+        if len(parts) != 3:
+            return None
+
+        method, path, version = parts
+        headers = {}
+
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+
+            if not sep:
+                return None
+
+            headers[name.strip().upper()] = value.strip()
+
+        return method, path, version, headers
+
+    def _process(self):
+        while not self._transport.is_closing():
+            # Request head
+            if self._request is None:
+                end = self._buffer.find(b'\r\n\r\n')
+
+                if end < 0:
+                    if len(self._buffer) > MAX_HEADER_SIZE:
+                        self._respond(431, close=True)
+
+                    return
+
+                request = self._parse_head(bytes(self._buffer[:end]))
+                del self._buffer[:end + 4]
+
+                if request is None:
+                    self._respond(400, close=True)
+                    return
+
+                method, path, version, headers = request
+
+                if 'CHUNKED' in headers.get('TRANSFER-ENCODING', '').upper():
+                    self._respond(411, close=True)
+                    return
+
+                length = headers.get('CONTENT-LENGTH', '0')
+
+                if not length.isdigit():
+                    self._respond(400, close=True)
+                    return
+
+                if int(length) > MAX_BODY_SIZE:
+                    self._respond(413, close=True)
+                    return
+
+                self._request = (method, path, version, headers, int(length))
+
+            # Request body
+            method, path, version, headers, length = self._request
+
+            if len(self._buffer) < length:
+                return
+
+            body = bytes(self._buffer[:length])
+            del self._buffer[:length]
+            self._request = None
+
+            # Handle
+            connection = headers.get('CONNECTION', '').lower()
+            close = connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive')
+
+            if method != 'NOTIFY':
+                status = 405
+            else:
+                try:
+                    status = self.handler(path.strip('/'), headers, body)
+
+                except Exception:
+                    logger.exception('Error while handling NOTIFY request')
+                    status = 400
+
+            self._respond(status, close=close)
+
+    # Callbacks
+    def connection_made(self, transport: asyncio.Transport):
+        self._transport = transport
+
+    def data_received(self, data: bytes):
+        self._buffer.extend(data)
+        self._process()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._buffer.clear()
+        self._request = None
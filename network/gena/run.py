@@ -1,16 +1,70 @@
+from typing import Optional
+
+from .client import GENAClient
+from .persist import GENASubscriptionStore
 from .server import GENAServer
 from .session import GENASession
+from .shard import shard_path
 
-__all__ = ['get_gena_server', 'get_gena_session']
+__all__ = [
+    'configure_gena_server', 'configure_gena_store',
+    'get_gena_client', 'get_gena_server', 'get_gena_session'
+]
 
 # Constants
+_client = GENAClient()
 _server = GENAServer()
+_store = None  # type: Optional[GENASubscriptionStore]
 
 
 # Utils
+def configure_gena_server(**options) -> GENAServer:
+    """
+    Replace the process wide server, options are the ones of GENAServer (like shards and shard).
+    Must be called before any session is created.
+
+    With shards, each process only subscribes to the services whose event url belongs to its shard
+    (SSDPService.subscribe raises GENAShardError for the others), so every service is subscribed once.
+    """
+
+    global _server
+    _server = GENAServer(**options)
+
+    return _server
+
+
+def configure_gena_store(path: Optional[str]) -> Optional[GENASubscriptionStore]:
+    """
+    Persist subscriptions in the given file (None disables it), to resume them after a restart.
+    Must be called before any session is created, after configure_gena_server: with shards,
+    each process has its own file (the shard number is added to path, see shard_path).
+    """
+
+    global _store
+
+    if path is not None and _server.sharded:
+        path = shard_path(path, _server.shard)
+
+    _store = None if path is None else GENASubscriptionStore(path)
+
+    return _store
+
+
+def get_gena_client() -> GENAClient:
+    return _client
+
+
 def get_gena_server() -> GENAServer:
     return _server
 
 
-def get_gena_session() -> GENASession:
-    return _server.new_session()
+def get_gena_session(event: Optional[str] = None) -> GENASession:
+    """
+    New session, reusing the callback of the saved subscriptions to the given event url if any.
+    """
+
+    if _store is None:
+        return _server.new_session(_client)
+
+    callback = None if event is None else _store.callback(event)
+    return _server.new_session(_client, callback=callback, store=_store)
@@ -1,28 +1,125 @@
+import asyncio
 import logging
+import os
+import stat
 
 from aiohttp import web
+from collections import deque
 from network.base.server import BaseServer
 from network.utils.str import generate_random_str
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 from weakref import WeakValueDictionary
 
+from .client import GENAClient
+from .persist import GENASubscriptionStore
+from .protocol import GENANotifyProtocol
 from .session import GENASession
+from .shard import (
+    GENAShardLink, GENAShardProtocol,
+    callback_shard, ensure_private_dir, shard_dir, shard_for, shard_socket
+)
+from .subscription import GENASubscription
 
 # Constants
 CALLBACK_SIZE = 10
 
+OVERFLOW_DROP_OLDEST = 'drop-oldest'
+OVERFLOW_DROP_NEWEST = 'drop-newest'
+OVERFLOW_REJECT = 'reject'
+
+TRANSPORT_AIOHTTP = 'aiohttp'
+TRANSPORT_ASYNCIO = 'asyncio'
+
 # Logging
 logger = logging.getLogger('gena')
 
 
+# Utils
+def parse_sid(sid: Optional[str]) -> Optional[str]:
+    if not sid or not sid.startswith('uuid:'):
+        return None
+
+    return sid[5:]
+
+
+def parse_seq(seq: Optional[str]) -> Optional[int]:
+    if seq is None or not seq.isdigit():
+        return None
+
+    return int(seq)
+
+
 # Class
 class GENAServer(BaseServer):
-    def __init__(self):
+    """
+    class GENAServer:
+    Receives GENA events. NOTIFY requests are checked (NT, NTS, SID and SEQ headers), answered
+    immediately, then processed in order by a worker.
+
+    The worker queue holds at most max_queue events, overflow policy decides what happens when it is full:
+    - drop-oldest : the oldest waiting event is dropped (default)
+    - drop-newest : the received event is dropped
+    - reject      : the received event is refused with a 503 response
+
+    Events only hold the variables that changed, so a lost event leaves stale values: subscriptions
+    whose events are dropped or refused are flagged (stale) and emit a dropped event, a new subscription
+    (like SSDPService.resync) brings a fresh initial event with all values.
+
+    Requests are received by an aiohttp server (default), or by GENANotifyProtocol
+    (transport='asyncio'), a lighter HTTP/1.1 server only accepting NOTIFY requests.
+
+    Sharded mode (shards > 1): one server per process, all bound to the same port (SO_REUSEPORT).
+    Callbacks start with the shard of the server that created them, so subscriptions belong to
+    the process that made them. Events received by another process are acknowledged, then
+    forwarded to their shard through a unix socket, in ipc_dir (by default a private directory,
+    per user and per port, in the temporary directory). Events are refused (503) while the link
+    to their shard is saturated (see GENAShardLink.max_buffer), counted as forward_dropped.
+    Subscriptions are partitioned too: each process only subscribes to the event urls it owns (see owns).
+    """
+
+    def __init__(
+            self, *,
+            host: Optional[str] = None, port: int = 8080, transport: str = TRANSPORT_AIOHTTP,
+            max_queue: int = 1024, overflow: str = OVERFLOW_DROP_OLDEST,
+            shards: int = 1, shard: int = 0, ipc_dir: Optional[str] = None
+    ):
+        assert overflow in (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_REJECT)
+        assert transport in (TRANSPORT_AIOHTTP, TRANSPORT_ASYNCIO)
+        assert 0 <= shard < shards
+
         # Attributes
-        self._server = web.Server(self._handler)
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.shards = shards
+        self.shard = shard
+        self.ipc_dir = ipc_dir or shard_dir(port)
+
+        # - metrics
+        self.forwarded = 0
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.errors = 0
+        self.max_depth = 0
+
+        # - internals
+        self._server = None  # type: Optional[web.Server]
         self._site = None    # type: Optional[web.TCPSite]
         self._runner = None  # type: Optional[web.ServerRunner]
+        self._asyncio_server = None  # type: Optional[asyncio.AbstractServer]
+        self._ipc_server = None      # type: Optional[asyncio.AbstractServer]
+        self._link = GENAShardLink(self.ipc_dir)
         self._sessions = WeakValueDictionary()
+        self._subscriptions = WeakValueDictionary()  # type: WeakValueDictionary[str, GENASubscription]
+
+        self._queue = deque()  # (subscription, seq, body)
+        self._loop = None      # type: Optional[asyncio.AbstractEventLoop]
+        self._wakeup = None    # type: Optional[asyncio.Event]
+        self._worker = None    # type: Optional[asyncio.Task]
 
     # Methods
     def _gen_callback(self) -> str:
@@ -31,58 +128,293 @@ class GENAServer(BaseServer):
         while cb is None or cb in self._sessions:
             cb = generate_random_str(CALLBACK_SIZE)
 
+            if self.sharded:
+                cb = f'{self.shard}-{cb}'
+
         return cb
 
+    def _push(self, sub: GENASubscription, seq: int, body: bytes) -> bool:
+        if len(self._queue) >= self.max_queue:
+            if self.overflow == OVERFLOW_REJECT:
+                self.rejected += 1
+                self._drop(sub, seq)
+                return False
+
+            self.dropped += 1
+
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                self._drop(sub, seq)
+                return True
+
+            self._drop(*self._queue.popleft()[:2])
+
+        self._queue.append((sub, seq, body))
+        self.max_depth = max(self.max_depth, len(self._queue))
+
+        # Wake up worker (bound to its loop)
+        loop = asyncio.get_event_loop()
+
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._work())
+
+        self._wakeup.set()
+        return True
+
+    def _drop(self, sub: GENASubscription, seq: int):
+        try:
+            sub._drop(seq)
+
+        except Exception:
+            logger.exception(f'Error while flagging dropped event for {sub.id}')
+
+    async def _work(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._queue:
+                sub, seq, body = self._queue.popleft()
+
+                try:
+                    sub._event(seq, body)
+                    self.processed += 1
+
+                except Exception:
+                    self.errors += 1
+                    logger.exception(f'Error while processing event for {sub.id}')
+
+                # Let the server answer other requests
+                await asyncio.sleep(0)
+
+    def _route(self, headers: Mapping[str, str]) -> Tuple[int, Optional[GENASubscription], int]:
+        if headers.get('NT') != 'upnp:event' or headers.get('NTS') != 'upnp:propchange':
+            return 412, None, 0
+
+        sid = parse_sid(headers.get('SID'))
+        seq = parse_seq(headers.get('SEQ'))
+
+        if sid is None or seq is None:
+            return 400 if sid is not None else 412, None, 0
+
+        sub = self._subscriptions.get(sid)
+
+        if sub is None or sub.expired:
+            logger.warning(f'Received notify for unknown subscription: {sid}')
+            return 412, None, 0
+
+        return 200, sub, seq
+
+    def _accept(self, sub: GENASubscription, seq: int, body: bytes) -> int:
+        self.received += 1
+
+        return 200 if self._push(sub, seq, body) else 503
+
+    def _owner(self, callback: str) -> Optional[int]:
+        """
+        Shard owning the given callback, if it is not this one.
+        """
+
+        if not self.sharded:
+            return None
+
+        shard = callback_shard(callback)
+
+        if shard is None or shard == self.shard or shard >= self.shards:
+            return None
+
+        return shard
+
+    def _forward(self, shard: int, callback: str, headers: Mapping[str, str], body: bytes) -> int:
+        if headers.get('NT') != 'upnp:event' or headers.get('NTS') != 'upnp:propchange':
+            return 412
+
+        if not self._link.send(shard, callback, {name.upper(): value for name, value in headers.items()}, body):
+            return 503
+
+        self.forwarded += 1
+        return 200
+
+    def _notify(self, callback: str, headers: Dict[str, str], body: bytes) -> int:
+        owner = self._owner(callback)
+
+        if owner is not None:
+            return self._forward(owner, callback, headers, body)
+
+        status, sub, seq = self._route(headers)
+
+        if sub is None:
+            return status
+
+        return self._accept(sub, seq, body)
+
     async def _handler(self, request: web.BaseRequest) -> web.StreamResponse:
-        logger.debug(f'{request.host} => {repr(request.content)}')
+        if request.method != 'NOTIFY':
+            return web.Response(status=405)
+
+        callback = request.path.strip('/')
+        owner = self._owner(callback)
+
+        if owner is not None:
+            body = await request.read()
+            return web.Response(status=self._forward(owner, callback, request.headers, body))
+
+        status, sub, seq = self._route(request.headers)
+
+        if sub is None:
+            return web.Response(status=status)
+
+        body = await request.read()
+        return web.Response(status=self._accept(sub, seq, body))
 
-        if request.method == 'NOTIFY':
-            cb = request.path.strip('/')
-            session = self._sessions.get(cb)
+    async def _start_ipc(self):
+        if self._ipc_server is None:
+            ensure_private_dir(self.ipc_dir)
+            path = shard_socket(self.ipc_dir, self.shard)
 
-            if session is not None:
-                await session.handler(request)
-            else:
-                logger.warning(f'Received notify for unknown callback: {cb}')
+            # Left by a previous run
+            if os.path.exists(path) and stat.S_ISSOCK(os.lstat(path).st_mode):
+                os.remove(path)
 
-        return web.Response(status=200)
+            loop = asyncio.get_event_loop()
+            self._ipc_server = await loop.create_unix_server(lambda: GENAShardProtocol(self._notify), path)
 
     async def start(self):
+        if self.sharded:
+            await self._start_ipc()
+
+        if self.transport == TRANSPORT_ASYNCIO:
+            if self._asyncio_server is None:
+                loop = asyncio.get_event_loop()
+                self._asyncio_server = await loop.create_server(
+                    lambda: GENANotifyProtocol(self._notify), self.host, self.port,
+                    reuse_port=self.sharded or None
+                )
+
+                logger.info(f'GENA server started: {self.url}')
+
+            return
+
         if self._runner is None:
             # Runner
+            self._server = web.Server(self._handler)
             self._runner = web.ServerRunner(self._server)
             await self._runner.setup()
 
             # Site
-            self._site = web.TCPSite(self._runner)
+            self._site = web.TCPSite(self._runner, self.host, self.port, reuse_port=self.sharded or None)
 
         # Start site
         await self._site.start()
         logger.info(f'GENA server started: {self._site.name}')
 
-    def new_session(self) -> GENASession:
-        cb = self._gen_callback()
-        session = GENASession(cb, self)
+    def new_session(
+            self, client: GENAClient, *,
+            callback: Optional[str] = None, store: Optional[GENASubscriptionStore] = None
+    ) -> GENASession:
+        """
+        Creates a session, on the given callback if still free (to keep the callback of saved subscriptions).
+        """
 
-        self._sessions[cb] = session
+        if callback is None or callback in self._sessions or self._owner(callback) is not None:
+            callback = self._gen_callback()
+
+        session = GENASession(callback, self, client, store)
+
+        self._sessions[callback] = session
 
         return session
 
+    def owner(self, event: str) -> int:
+        """
+        Shard subscribing to the given event url (this one if not sharded)
+        """
+
+        return shard_for(event, self.shards) if self.sharded else self.shard
+
+    def owns(self, event: str) -> bool:
+        """
+        Should this process subscribe to the given event url ? (always true if not sharded)
+        """
+
+        return self.owner(event) == self.shard
+
+    def register(self, sub: GENASubscription):
+        self._subscriptions[sub.id] = sub
+
+    def unregister(self, sub: GENASubscription):
+        if self._subscriptions.get(sub.id) is sub:
+            del self._subscriptions[sub.id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'shard': self.shard,
+            'subscriptions': len(self._subscriptions),
+            'depth': len(self._queue),
+            'max_depth': self.max_depth,
+            'received': self.received,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'forwarded': self.forwarded,
+            'forward_dropped': self._link.dropped,
+        }
+
     async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        await self._link.close()
+
+        if self._ipc_server is not None:
+            self._ipc_server.close()
+            await self._ipc_server.wait_closed()
+
+            self._ipc_server = None
+            path = shard_socket(self.ipc_dir, self.shard)
+
+            if os.path.exists(path):
+                os.remove(path)
+
+        if self._asyncio_server is not None:
+            self._asyncio_server.close()
+            await self._asyncio_server.wait_closed()
+
+            self._asyncio_server = None
+            logger.info('GENA server stopped')
+
         if self._runner is None:
             return
 
         await self._runner.cleanup()
+
+        self._runner = None
+        self._site = None
+        self._server = None
         logger.info('GENA server stopped')
 
     # Properties
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def sharded(self) -> bool:
+        return self.shards > 1
+
     @property
     def started(self) -> bool:
-        return self._runner is not None
+        return self._runner is not None or self._asyncio_server is not None
 
     @property
     def url(self) -> Optional[str]:
-        if self._site is not None:
+        if self._asyncio_server is not None:
+            return f'http://{self.host or "0.0.0.0"}:{self.port}'
+
+        if self._site is None:
             return None
 
         return self._site.name
@@ -2,23 +2,41 @@ import aiohttp
 import asyncio
 import logging
 
-from aiohttp import web
 from network.base.session import BaseSession
-from network.base.server import BaseServer
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
+from .client import GENAClient
 from .error import GENAError
+from .persist import GENASubscriptionStore
 from .subscription import GENASubscription
 
+if TYPE_CHECKING:
+    from .server import GENAServer
+
 
 # Class
 class GENASession(BaseSession):
-    def __init__(self, callback: str, server: BaseServer):
+    """
+    class GENASession:
+    Manages the subscriptions of one callback. Requests go through the shared GENA client,
+    which also renews subscriptions automatically. When an automatic renewal fails, the subscription
+    is ended (its expired event is emitted).
+
+    With a store, subscriptions are persisted. Subscribing to an event url found in the store renews
+    the saved SID first, and only sends a new subscription if the device answers 412.
+    """
+
+    def __init__(
+            self, callback: str, server: 'GENAServer', client: GENAClient,
+            store: Optional[GENASubscriptionStore] = None
+    ):
         # Attributes
         self._callback = callback
         self._logger = logging.getLogger(f'gena:{self._callback}')
 
         self._server = server
+        self._client = client
+        self._store = store
         self._session = None  # type: Optional[aiohttp.ClientSession]
         self._subscriptions = {}  # type: Dict[str, GENASubscription]
 
@@ -26,8 +44,9 @@ class GENASession(BaseSession):
     async def _request(self, method: str, event: str, headers: Dict[str, str]):
         assert self._session is not None, 'GENA session must be opened !'
 
-        # Send request
-        res = await self._session.request(method, event, headers=headers)
+        # Send request (headers are all we need, connection goes back to the pool)
+        async with self._session.request(method, event, headers=headers) as res:
+            pass
 
         # Parse response
         if res.status == 200:
@@ -46,43 +65,113 @@ class GENASession(BaseSession):
         else:
             raise GENAError(res.status, 'Unknown error')
 
+    def owner(self, event: str) -> int:
+        """
+        Shard subscribing to the given event url (see GENAServer.owner)
+        """
+
+        return self._server.owner(event)
+
+    def owns(self, event: str) -> bool:
+        """
+        Should this process subscribe to the given event url ? (see GENAServer.owns)
+        """
+
+        return self._server.owns(event)
+
     async def open(self):
-        self._session = aiohttp.ClientSession()
+        self._session = await self._client.open()
         self._subscriptions = {}
 
         if not self._server.started:
             await self._server.start()
 
-    async def handler(self, request: web.BaseRequest):
-        sid = request.headers.getone('SID')
+    def _persist(self, sub: GENASubscription):
+        if self._store is not None and not sub.expired:
+            self._store.put(self._callback, sub)
 
-        # Transfer to subscription
-        if sid and sid in self._subscriptions:
-            sub = self._subscriptions[sid]
+    async def _resume(self, event: str, timeout: int) -> Optional[GENASubscription]:
+        sub = self._store.get(self._callback, event)
 
-            if not sub.expired:
-                await sub._handler(request)
+        if sub is None:
+            return None
 
-            else:
-                self._logger.warning(f'Received notify for expired subscription: {sid}')
-        else:
-            self._logger.warning(f'Received notify for unknown subscription: {sid}')
+        # Events may come before the answer
+        self._server.register(sub)
 
-    async def subscribe(self, event: str, *variables: str, timeout: int = 1800) -> GENASubscription:
-        # Request
-        res = await self._request('SUBSCRIBE', event, {
+        try:
+            res = await self._request('SUBSCRIBE', event, {
+                'SID': f'uuid:{sub.id}',
+                'TIMEOUT': f'Second-{timeout}'
+            })
+
+        except GENAError as err:
+            self._server.unregister(sub)
+
+            if err.code != 412:
+                raise
+
+            self._logger.info(f'Subscription {sub.id} to {event} is gone, subscribing again')
+            self._store.remove(self._callback, event)
+            return None
+
+        sub._update(res)
+        self._logger.info(f'Resumed subscription {sub.id} to {event}')
+
+        return sub
+
+    async def subscribe(
+            self, event: str, *variables: str, timeout: int = 1800, renew: bool = True
+    ) -> GENASubscription:
+        # Saved subscription
+        if self._store is not None:
+            sub = await self._resume(event, timeout)
+
+            if sub is not None:
+                return self._add(sub, renew)
+
+        headers = {
             'NT': 'upnp:event',
             'CALLBACK': self._callback,
             'TIMEOUT': f'Second-{timeout}',
-            'STATEVAR': ','.join(variables)
-        })
+        }
+
+        if variables:
+            headers['STATEVAR'] = ','.join(variables)
+
+        # Request
+        await self._client.pace()
+        res = await self._request('SUBSCRIBE', event, headers)
 
         # Parse answer
         sub = GENASubscription(event, res)
+        self._server.register(sub)
+
+        return self._add(sub, renew)
+
+    def _add(self, sub: GENASubscription, renew: bool) -> GENASubscription:
         self._subscriptions[sub.id] = sub
+        self._persist(sub)
+
+        # Save SEQ and values
+        if self._store is not None:
+            sub.on('update', lambda values, seq: self._persist(sub))
+
+        # Automatic renew
+        if renew:
+            self._client.schedule(sub, self._auto_renew)
 
         return sub
 
+    async def _auto_renew(self, sub: GENASubscription):
+        # A failed renewal ends the subscription (emitting expired), so that its owner can subscribe again
+        try:
+            await self.renew(sub)
+
+        except Exception:
+            self._forget(sub)
+            raise
+
     async def renew(self, sub: GENASubscription, *, timeout: Optional[int] = None) -> GENASubscription:
         assert not sub.expired, 'GENA subscription has expired'
 
@@ -97,6 +186,8 @@ class GENASession(BaseSession):
 
         # Parse answer
         sub._update(res)
+        self._persist(sub)
+
         return sub
 
     async def unsubscribe(self, sub: GENASubscription) -> GENASubscription:
@@ -109,17 +200,44 @@ class GENASession(BaseSession):
         })
 
         # Success
-        sub._end()
-        del self._subscriptions[sub.id]
+        self._forget(sub)
 
         return sub
 
+    def _forget(self, sub: GENASubscription):
+        self._client.cancel(sub)
+        sub._end()
+        self._subscriptions.pop(sub.id, None)
+        self._server.unregister(sub)
+
+        if self._store is not None:
+            self._store.remove(self._callback, sub.event)
+
+    async def resubscribe(self, sub: GENASubscription, *, timeout: Optional[int] = None) -> GENASubscription:
+        """
+        Replace the given subscription by a new one, whose initial event holds all values (after lost events).
+        The old one is cancelled, even if the device does not answer.
+        """
+
+        if timeout is None:
+            timeout = sub.timeout or 1800
+
+        if not sub.expired:
+            try:
+                await self.unsubscribe(sub)
+
+            except (GENAError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+                self._logger.warning(f'Unable to unsubscribe {sub.id}: {err!r}')
+                self._forget(sub)
+
+        return await self.subscribe(sub.event, timeout=timeout)
+
     async def close(self):
         # Unsubscribe all subscriptions
         await asyncio.gather(
-            self.unsubscribe(sub) for sub in self._subscriptions.values()
+            *(self.unsubscribe(sub) for sub in list(self._subscriptions.values())),
+            return_exceptions=True
         )
 
-        # Close session
-        await self._session.close()
+        # Connections stay in the client's pool
         self._session = None
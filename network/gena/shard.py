@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+import os
+import stat
+import struct
+import tempfile
+import zlib
+
+from collections import deque
+from typing import Callable, Dict, Optional
+
+# Constants
+FRAME_HEADER = struct.Struct('!III')  # callback, headers and body sizes
+
+# Types
+FrameHandler = Callable[[str, Dict[str, str], bytes], int]
+
+# Logging
+logger = logging.getLogger('gena')
+
+
+# Utils
+def shard_for(key: str, shards: int) -> int:
+    """
+    Stable shard of the given key (like a device uuid), to partition subscriptions between processes.
+    """
+
+    return zlib.crc32(key.encode('utf-8')) % shards
+
+
+def callback_shard(callback: str) -> Optional[int]:
+    shard, sep, _ = callback.partition('-')
+
+    if not sep or not shard.isdigit():
+        return None
+
+    return int(shard)
+
+
+def shard_dir(port: int) -> str:
+    """
+    Default directory of the shards' sockets: private to the current user, and to the server port.
+    """
+
+    return os.path.join(tempfile.gettempdir(), f'gena-{os.getuid()}-{port}')
+
+
+def ensure_private_dir(directory: str):
+    """
+    Creates the given directory (mode 0700), and checks that no one else can use it.
+    """
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f'Unsafe GENA shard directory {directory}: must be a private directory')
+
+
+def shard_socket(directory: str, shard: int) -> str:
+    return os.path.join(directory, f'gena-{shard}.sock')
+
+
+def shard_path(path: str, shard: int) -> str:
+    """
+    File of the given shard (like subscriptions.1.json for subscriptions.json)
+    """
+
+    root, ext = os.path.splitext(path)
+    return f'{root}.{shard}{ext}'
+
+
+def encode_frame(callback: str, headers: Dict[str, str], body: bytes) -> bytes:
+    cb = callback.encode('utf-8')
+    hdrs = json.dumps(headers).encode('utf-8')
+
+    return FRAME_HEADER.pack(len(cb), len(hdrs), len(body)) + cb + hdrs + body
+
+
+# Classes
+class GENAShardProtocol(asyncio.Protocol):
+    """
+    class GENAShardProtocol:
+    Receives events forwarded by other shards (see encode_frame) and hands them to handler(callback, headers, body).
+    """
+
+    def __init__(self, handler: FrameHandler):
+        # Attributes
+        self.handler = handler
+
+        # - internals
+        self._buffer = bytearray()
+
+    # Callbacks
+    def data_received(self, data: bytes):
+        self._buffer.extend(data)
+
+        while len(self._buffer) >= FRAME_HEADER.size:
+            sizes = FRAME_HEADER.unpack_from(self._buffer)
+            end = FRAME_HEADER.size + sum(sizes)
+
+            if len(self._buffer) < end:
+                return
+
+            frame = bytes(self._buffer[FRAME_HEADER.size:end])
+            del self._buffer[:end]
+
+            cb_size, hdrs_size, _ = sizes
+            callback = frame[:cb_size].decode('utf-8')
+            headers = json.loads(frame[cb_size:cb_size + hdrs_size].decode('utf-8'))
+
+            try:
+                self.handler(callback, headers, frame[cb_size + hdrs_size:])
+
+            except Exception:
+                logger.exception('Error while handling forwarded event')
+
+
+class GENAShardLink:
+    """
+    class GENAShardLink:
+    Forwards events to the other shards, through their unix sockets.
+    Frames sent while connecting are buffered (at most max_pending per shard, oldest dropped).
+    Once connected, frames are dropped while more than max_buffer bytes wait to be written to a shard
+    (slow or stuck process).
+    """
+
+    def __init__(self, directory: str, *, max_pending: int = 1024, max_buffer: int = 1024 * 1024):
+        # Attributes
+        self.directory = directory
+        self.max_pending = max_pending
+        self.max_buffer = max_buffer
+
+        # - metrics
+        self.forwarded = 0
+        self.dropped = 0
+
+        # - internals
+        self._writers = {}     # type: Dict[int, asyncio.StreamWriter]
+        self._pending = {}     # type: Dict[int, deque]
+        self._connecting = {}  # type: Dict[int, asyncio.Task]
+
+    # Methods
+    async def _connect(self, shard: int):
+        try:
+            _, writer = await asyncio.open_unix_connection(shard_socket(self.directory, shard))
+
+        except OSError as err:
+            pending = self._pending.pop(shard, ())
+            self.dropped += len(pending)
+
+            logger.warning(f'Unable to reach GENA shard {shard}: {err!r}')
+            return
+
+        finally:
+            self._connecting.pop(shard, None)
+
+        self._writers[shard] = writer
+
+        for frame in self._pending.pop(shard, ()):
+            writer.write(frame)
+            self.forwarded += 1
+
+    def send(self, shard: int, callback: str, headers: Dict[str, str], body: bytes) -> bool:
+        """
+        Forwards the event to the given shard, returns False if it was dropped.
+        """
+
+        frame = encode_frame(callback, headers, body)
+        writer = self._writers.get(shard)
+
+        if writer is not None and writer.is_closing():
+            del self._writers[shard]
+            writer = None
+
+        if writer is not None:
+            if writer.transport.get_write_buffer_size() + len(frame) > self.max_buffer:
+                self.dropped += 1
+                return False
+
+            writer.write(frame)
+            self.forwarded += 1
+            return True
+
+        # Connect, then send
+        pending = self._pending.setdefault(shard, deque())
+
+        if len(pending) >= self.max_pending:
+            pending.popleft()
+            self.dropped += 1
+
+        pending.append(frame)
+
+        if shard not in self._connecting:
+            self._connecting[shard] = asyncio.ensure_future(self._connect(shard))
+
+        return True
+
+    async def close(self):
+        for task in self._connecting.values():
+            task.cancel()
+
+        for writer in self._writers.values():
+            writer.close()
+
+        self._writers = {}
+        self._pending = {}     # type: Dict[int, deque]
+        self._connecting = {}
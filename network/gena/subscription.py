@@ -1,13 +1,33 @@
 import asyncio
+import time
 
-from aiohttp import web, ClientResponse
+from aiohttp import ClientResponse
+from functools import partial
+from network.base.coalesce import Coalescer
 from network.base.machine import StateMachine
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 from xml.etree import ElementTree as ET
 
 from .constants import XML_GENA_NS
 
 
+# Utils
+def parse_propertyset(body: Union[bytes, str]) -> Dict[str, str]:
+    pset = ET.fromstring(body)
+    values = {}
+
+    for prop in pset.findall('event:property', XML_GENA_NS):
+        var = list(prop)[0]
+
+        values[var.tag] = var.text
+
+    return values
+
+
+def merge_events(pending: Tuple[Dict[str, str], int], event: Tuple[Dict[str, str], int]) -> Tuple[Dict[str, str], int]:
+    return {**pending[0], **event[0]}, event[1]
+
+
 # Class
 class GENASubscription(StateMachine):
     """
@@ -15,21 +35,48 @@ class GENASubscription(StateMachine):
     Represent and manage a GENA subscription.
 
     Events:
-    - update (values: Dict[str, str], seq: int) : each time a new value is emitted
+    - update (values: Dict[str, str], seq: int) : each time an event is received (values it contains)
+    - dropped (seq: int)                        : first time an event is dropped by the server (queue overflow),
+                                                  merged values are stale until a new subscription
     - expired (was: str)                        : each time the subscription goes expired
     """
 
-    def __init__(self, event: str, res: ClientResponse):
+    def __init__(self, event: str, res: Optional[ClientResponse] = None):
         super().__init__('valid')
 
         # Attributes
         self.event = event
+        self.id = None       # type: Optional[str]
+        self.date = None     # type: Optional[str]
+        self.timeout = 0
+        self.expires = 0.0   # wall clock
+        self.variables = []
+        self.stale = False
+
         self._seq = 0
-        self._values = {}  # type: Dict[str, str]
+        self._values = {}  # type: Dict[str, str]  # merged values of all received events
         self.__invalid_handle = None  # type: Optional[asyncio.TimerHandle]
+        self._emit_update = partial(self.emit, 'update')
 
         # Parse response
-        self._update(res)
+        if res is not None:
+            self._update(res)
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> 'GENASubscription':
+        """
+        Rebuild a subscription saved by to_dict, it should be renewed before use.
+        """
+
+        sub = cls(state['event'])
+        sub.id = state['sid']
+        sub.timeout = state['timeout']
+        sub.expires = state['expires']
+        sub.variables = state['variables']
+        sub._seq = state['seq']
+        sub._values = dict(state['values'])
+
+        return sub
 
     def __hash__(self):
         return hash(self.id)
@@ -41,32 +88,21 @@ class GENASubscription(StateMachine):
         return False
 
     # Methods
-    def _parse_xml(self, xml: ET.Element) -> Dict[str, str]:
-        pset = xml.find('event:propertyset', XML_GENA_NS)
-        values = {}
-
-        for prop in pset.findall('event:property', XML_GENA_NS):
-            var = list(prop)[0]
-
-            values[var.tag] = var.text
+    def _event(self, seq: int, body: bytes):
+        # Events already checked (headers) and acknowledged by the server
+        if seq == 0 or seq > self._seq:
+            values = parse_propertyset(body)
 
-        return values
+            self._seq = seq
+            self._values.update(values)
 
-    async def _handler(self, request: web.BaseRequest):
-        nt = request.headers.getone('NT')
-        nts = request.headers.getone('NTS')
+            self._emit_update(values, seq)
 
-        if nt == 'upnp:event' and nts == 'upnp:propchange':
-            seq = int(request.headers.getone('SEQ'))
-
-            if seq == 0 or seq > self._seq:
-                data = await request.read()
-                xml = ET.fromstring(data)
-
-                self._seq = seq
-                self._values = self._parse_xml(xml)
-
-                self.emit('update', self._values, seq=seq)
+    def _drop(self, seq: int):
+        # Values of the lost event are unknown
+        if not self.stale:
+            self.stale = True
+            self.emit('dropped', seq)
 
     def _update(self, res: ClientResponse):
         # Parse response
@@ -74,6 +110,7 @@ class GENASubscription(StateMachine):
         self.date = res.headers.getone('DATE', None)
         self.timeout = int(res.headers.getone('TIMEOUT')[7:])
         self.variables = res.headers.getone('ACCEPTED-STATEVAR', '').split(',')
+        self.expires = time.time() + self.timeout
 
         # Automatic timeout
         if self.__invalid_handle is not None:
@@ -82,6 +119,35 @@ class GENASubscription(StateMachine):
         loop = asyncio.get_running_loop()
         self.__invalid_handle = loop.call_later(self.timeout, self.__end)
 
+    def coalesce(self, *, window: float = 0, min_interval: float = 0, max_delay: Optional[float] = None):
+        """
+        Coalesce update events (values of coalesced events are merged, see Coalescer).
+        Without arguments, events are emitted as they come.
+        """
+
+        if isinstance(self._emit_update, Coalescer):
+            self._emit_update.flush()
+
+        if not window and not min_interval and max_delay is None:
+            self._emit_update = partial(self.emit, 'update')
+
+        else:
+            self._emit_update = Coalescer(
+                partial(self.emit, 'update'),
+                window=window, min_interval=min_interval, max_delay=max_delay, merge=merge_events
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sid': self.id,
+            'event': self.event,
+            'timeout': self.timeout,
+            'expires': self.expires,
+            'variables': self.variables,
+            'seq': self._seq,
+            'values': self._values,
+        }
+
     def _end(self):
         if self.__invalid_handle is not None:
             self.__invalid_handle.cancel()
@@ -1,4 +1,10 @@
-from .error import SOAPError
+from .cache import SOAPCache
+from .error import SOAPCircuitOpenError, SOAPError
+from .policy import CircuitBreaker, RetryPolicy
 from .request import SOAPRequest
 from .response import SOAPResponse
+from .run import get_soap_transport
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, SOAPScheduler, fragile_limit, register_fragile_model
 from .session import SOAPSession
+from .template import SOAPTemplate, compile_template
+from .transport import SOAPTransport
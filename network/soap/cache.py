@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Types
+Key = Tuple[str, Tuple[Tuple[str, Hashable], ...]]
+Results = Dict[str, Any]
+
+
+# Class
+class SOAPCache:
+    """
+    class SOAPCache:
+    Keeps results of idempotent actions during their ttl (in seconds, per action name).
+    Concurrent identical calls share the same request. Actions without ttl are not cached.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, *, clock: Callable[[], float] = time.monotonic):
+        # Attributes
+        self.ttls = dict(ttls or {})
+
+        # - metrics
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+        # - internals
+        self._clock = clock
+        self._entries = {}  # type: Dict[Key, Tuple[float, Results]]
+        self._pending = {}  # type: Dict[Key, asyncio.Future]
+
+    def __repr__(self):
+        return f'<SOAPCache: {len(self._entries)} entries, {self.hits} hits, {self.misses} misses>'
+
+    def __contains__(self, action: str) -> bool:
+        return action in self.ttls
+
+    # Methods
+    @staticmethod
+    def _key(action: str, args: Dict[str, Hashable]) -> Key:
+        return action, tuple(sorted(args.items()))
+
+    def _done(self, key: Key, ttl: float, task: asyncio.Future):
+        failed = task.cancelled() or task.exception() is not None
+
+        # Invalidated while running
+        if self._pending.get(key) is not task:
+            return
+
+        del self._pending[key]
+
+        if not failed:
+            self._entries[key] = (self._clock() + ttl, task.result())
+
+    async def get(self, action: str, args: Dict[str, Hashable], fetch: Callable[[], Awaitable[Results]]) -> Results:
+        ttl = self.ttls.get(action)
+
+        if ttl is None:
+            return await fetch()
+
+        # Cached
+        key = self._key(action, args)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if entry[0] > self._clock():
+                self.hits += 1
+                return dict(entry[1])
+
+            del self._entries[key]
+
+        # Running
+        task = self._pending.get(key)
+
+        if task is None:
+            self.misses += 1
+
+            task = asyncio.ensure_future(fetch())
+            task.add_done_callback(partial(self._done, key, ttl))
+            self._pending[key] = task
+
+        else:
+            self.shared += 1
+
+        return dict(await asyncio.shield(task))
+
+    def invalidate(self, action: Optional[str] = None):
+        if action is None:
+            self._entries = {}
+            self._pending = {}
+            return
+
+        for entries in (self._entries, self._pending):
+            for key in [k for k in entries if k[0] == action]:
+                del entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'pending': len(self._pending),
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+        }
@@ -6,3 +6,11 @@ class SOAPError(Exception):
         # Attributes
         self.code = code
         self.description = description
+
+
+class SOAPCircuitOpenError(Exception):
+    def __init__(self, control_url: str):
+        super().__init__(f'Circuit open for {control_url}')
+
+        # Attributes
+        self.control_url = control_url
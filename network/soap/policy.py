@@ -0,0 +1,94 @@
+import random
+import time
+
+from typing import Callable
+
+
+# Classes
+class RetryPolicy:
+    """
+    class RetryPolicy:
+    Retries transport errors (never UPnP faults) up to attempts times, with exponential backoff and jitter.
+    """
+
+    def __init__(self, attempts: int = 3, *, backoff: float = 0.2, max_backoff: float = 5, jitter: float = 0.1):
+        # Attributes
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def __repr__(self):
+        return f'<RetryPolicy: {self.attempts} attempts>'
+
+    # Methods
+    def delay(self, attempt: int) -> float:
+        delay = min(self.backoff * (2 ** (attempt - 1)), self.max_backoff)
+        return delay + random.uniform(0, delay * self.jitter)
+
+
+class CircuitBreaker:
+    """
+    class CircuitBreaker:
+    Opens after threshold consecutive failures, and rejects calls during reset_timeout seconds.
+    Then lets one call through (half-open): its success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30, *, clock: Callable[[], float] = time.monotonic):
+        # Attributes
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+
+        # - internals
+        self._clock = clock
+        self._opened_at = None
+        self._probing = False
+
+    def __repr__(self):
+        return f'<CircuitBreaker: {self.state}>'
+
+    # Methods
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        if self._probing or self._clock() - self._opened_at < self.reset_timeout:
+            return False
+
+        self._probing = True
+        return True
+
+    def release(self):
+        """
+        Ends a half-open probe without result (like a cancelled call), another call may probe.
+        """
+
+        self._probing = False
+
+    def success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def failure(self):
+        self.failures += 1
+
+        if self._probing or self.failures >= self.threshold:
+            self._opened_at = self._clock()
+            self._probing = False
+
+    # Properties
+    @property
+    def probing(self) -> bool:
+        return self._probing
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+
+        if self._probing or self._clock() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+
+        return 'open'
@@ -1,18 +1,25 @@
-from network.utils.xml import add_ns
-from typing import Dict
-from xml.etree import ElementTree as ET
+from typing import Dict, Optional, Sequence
 
 from .constants import XML_SOAP_NS
+from .scheduler import PRIORITY_INTERACTIVE
+from .template import SOAPTemplate, compile_template
 
 
 # Class
 class SOAPRequest:
-    def __init__(self, control_url: str, service_type: str, action: str, args: Dict[str, str]):
+    def __init__(
+            self, control_url: str, service_type: str, action: str, args: Dict[str, str],
+            template: Optional[SOAPTemplate] = None, results: Optional[Sequence[str]] = None,
+            priority: int = PRIORITY_INTERACTIVE
+    ):
         # Attributes
         self.control_url = control_url
         self.service_type = service_type
         self.action = action
         self.args = args
+        self.results = results
+        self.priority = priority
+        self.template = template or compile_template(service_type, action, tuple(args))
 
     # Methods
     def xml_ns(self) -> Dict[str, str]:
@@ -21,24 +28,9 @@ class SOAPRequest:
             'upnp': self.service_type
         }
 
-    def headers(self):
-        return {
-            'Content-Type': 'text/xml; charset="utf-8"',
-            'SOAPAction': f'"{self.service_type}#{self.action}"'
-        }
+    def headers(self) -> Dict[str, str]:
+        # Shared by all requests using the same template, must not be modified
+        return self.template.headers
 
     def body(self) -> bytes:
-        xml_ns = self.xml_ns()
-
-        root = ET.Element(add_ns('soap:Envelope', xml_ns))
-        root.set(add_ns('soap:encodingStyle', xml_ns), 'http://schemas.xmlsoap.org/soap/encoding/')
-
-        body = ET.SubElement(root, add_ns('soap:Body', xml_ns))
-        action = ET.SubElement(body, add_ns(f'upnp:{self.action}', xml_ns))
-
-        for n, v in self.args.items():
-            arg = ET.SubElement(action, n)
-            arg.text = v
-
-        xml = ET.tostring(root, 'utf-8')
-        return xml
+        return self.template.render(self.args)
@@ -1,18 +1,33 @@
-from typing import Dict
+from typing import Dict, Optional, Sequence, Union
 from xml.etree import ElementTree as ET
 
 from .constants import XML_SOAP_NS
 
+# Constants
+CHUNK_SIZE = 64 * 1024
+
 
 # Class
 class SOAPResponse:
-    def __init__(self, service_type: str, action: str, data: str, is_error: bool = False):
+    """
+    class SOAPResponse:
+    Parse SOAP responses.
+
+    Successful responses are parsed incrementally from bytes, parsing stops at the end of the
+    action response element. If results is given, only those out arguments are kept, in that order.
+    Faults are parsed separately.
+    """
+
+    def __init__(
+            self, service_type: str, action: str, data: Union[bytes, str], is_error: bool = False,
+            results: Optional[Sequence[str]] = None
+    ):
         # Attributes
         self.is_error = is_error
         self.service_type = service_type
         self.action = action
 
-        self._parse_data(data)
+        self._parse_data(data, results)
 
     # Methods
     def xml_ns(self) -> Dict[str, str]:
@@ -21,20 +36,21 @@ class SOAPResponse:
             'upnp': self.service_type
         }
 
-    def _parse_data(self, data: str):
-        xml_ns = self.xml_ns()
-        xml = ET.fromstring(data)
-
-        body = xml.find('soap:Body', xml_ns)
+    def _parse_data(self, data: Union[bytes, str], results: Optional[Sequence[str]]):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
 
         if self.is_error:
-            self._parse_error(body)
+            self._parse_error(data)
         else:
-            self._parse_response(body)
+            self._parse_response(data, results)
 
-    def _parse_error(self, xml: ET.Element):
+    def _parse_error(self, data: bytes):
         xml_ns = self.xml_ns()
-        fault = xml.find('soap:Fault', xml_ns)
+        xml = ET.fromstring(data)
+
+        body = xml.find('soap:Body', xml_ns)
+        fault = body.find('soap:Fault', xml_ns)
 
         # fault data (fixed by UPnP)
         self.fault_code = fault.find('faultcode').text
@@ -47,9 +63,44 @@ class SOAPResponse:
         self.error_code = int(err.find('control:errorCode', xml_ns).text)
         self.error_description = err.find('control:errorDescription', xml_ns).text
 
-    def _parse_response(self, xml: ET.Element):
-        xml_ns = self.xml_ns()
-        rep = xml.find(f'upnp:{self.action}Response', xml_ns)
+    def _parse_response(self, data: bytes, results: Optional[Sequence[str]]):
+        tag = f'{{{self.service_type}}}{self.action}Response'
+        suffix = f'}}{self.action}Response'
+        expected = None if results is None else frozenset(results)
+
+        parser = ET.XMLPullParser(('start', 'end'))
+        values = {}  # type: Dict[str, Optional[str]]
+        depth = 0    # depth inside the action response element
+        view = memoryview(data)
+
+        for offset in range(0, len(data), CHUNK_SIZE):
+            parser.feed(view[offset:offset + CHUNK_SIZE])
+
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if depth > 0:
+                        depth += 1
+
+                    elif elem.tag == tag or elem.tag.endswith(suffix):
+                        depth = 1
+
+                elif depth > 0:
+                    if depth == 1:
+                        # End of response element, ignore the rest of the document
+                        if results is not None:
+                            values = {n: values[n] for n in results if n in values}
+
+                        self.results = values
+                        return
+
+                    if depth == 2:
+                        name = elem.tag.rpartition('}')[2]
+
+                        if expected is None or name in expected:
+                            values[name] = elem.text
+
+                        elem.clear()
+
+                    depth -= 1
 
-        # Get out arguments
-        self.results = {arg.tag: arg.text for arg in rep}
+        raise ValueError(f'Invalid SOAP response: no {self.action}Response element')
@@ -0,0 +1,11 @@
+from .transport import SOAPTransport
+
+__all__ = ['get_soap_transport']
+
+# Constants
+_transport = SOAPTransport()
+
+
+# Utils
+def get_soap_transport() -> SOAPTransport:
+    return _transport
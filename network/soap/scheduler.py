@@ -0,0 +1,213 @@
+import asyncio
+import time
+
+from collections import deque, OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# Constants
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+# Models known to fail on concurrent requests (modelName => max in flight).
+# Empty by default, extended through register_fragile_model.
+FRAGILE_MODELS = {}  # type: Dict[str, int]
+
+
+# Utils
+def register_fragile_model(model_name: str, max_in_flight: int = 1):
+    FRAGILE_MODELS[model_name] = max_in_flight
+
+
+def fragile_limit(model_name: Optional[str]) -> Optional[int]:
+    if model_name is None:
+        return None
+
+    return FRAGILE_MODELS.get(model_name)
+
+
+# Classes
+class _HostQueue:
+    def __init__(self, max_in_flight: int):
+        # Attributes
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+
+        # - waiters, by priority then by service (round robin)
+        self.waiters = [OrderedDict() for _ in PRIORITIES]
+        self.depth = 0
+
+        # - metrics
+        self.requests = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.max_depth = 0
+
+    # Methods
+    def push(self, priority: int, service: str, fut: asyncio.Future):
+        self.waiters[priority].setdefault(service, deque()).append(fut)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def remove(self, priority: int, service: str, fut: asyncio.Future):
+        queue = self.waiters[priority].get(service)
+
+        if queue is not None and fut in queue:
+            queue.remove(fut)
+            self.depth -= 1
+
+            if not queue:
+                del self.waiters[priority][service]
+
+    def pop(self) -> Optional[asyncio.Future]:
+        for services in self.waiters:
+            if services:
+                service, queue = next(iter(services.items()))
+                fut = queue.popleft()
+                self.depth -= 1
+
+                # Next service gets the next slot
+                if queue:
+                    services.move_to_end(service)
+                else:
+                    del services[service]
+
+                return fut
+
+        return None
+
+    def wake(self):
+        while self.in_flight < self.max_in_flight:
+            fut = self.pop()
+
+            if fut is None:
+                break
+
+            # Cancelled while waiting (removed later by its waiter)
+            if fut.done():
+                continue
+
+            fut.set_result(None)
+            self.in_flight += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_in_flight': self.max_in_flight,
+            'in_flight': self.in_flight,
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'requests': self.requests,
+            'waited': self.waited,
+            'wait_time': self.wait_time,
+            'max_wait': self.max_wait,
+        }
+
+
+class _Slot:
+    def __init__(self, scheduler: 'SOAPScheduler', host: str, service: str, priority: int):
+        self.scheduler = scheduler
+        self.host = host
+        self.service = service
+        self.priority = priority
+
+    async def __aenter__(self):
+        await self.scheduler.acquire(self.host, self.service, self.priority)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.scheduler.release(self.host)
+
+
+class SOAPScheduler:
+    """
+    class SOAPScheduler:
+    Limits the SOAP requests in flight to each device host (max_in_flight, overridable per host).
+    Waiting requests are served by priority (interactive before background),
+    then in round robin across services of the host.
+    """
+
+    def __init__(self, max_in_flight: int = 4, *, clock: Callable[[], float] = time.monotonic):
+        # Attributes
+        self.max_in_flight = max_in_flight
+
+        # - internals
+        self._clock = clock
+        self._hosts = {}   # type: Dict[str, _HostQueue]
+        self._limits = {}  # type: Dict[str, int]
+
+    def __repr__(self):
+        return f'<SOAPScheduler: {len(self._hosts)} hosts>'
+
+    # Methods
+    def _host(self, host: str) -> _HostQueue:
+        queue = self._hosts.get(host)
+
+        if queue is None:
+            queue = _HostQueue(self._limits.get(host, self.max_in_flight))
+            self._hosts[host] = queue
+
+        return queue
+
+    def limit(self, host: str, max_in_flight: Optional[int]):
+        """
+        Set max in flight requests for the given host, None restores the default.
+        """
+
+        if max_in_flight is None:
+            self._limits.pop(host, None)
+        else:
+            self._limits[host] = max_in_flight
+
+        queue = self._hosts.get(host)
+
+        if queue is not None:
+            queue.max_in_flight = self._limits.get(host, self.max_in_flight)
+            queue.wake()
+
+    async def acquire(self, host: str, service: str, priority: int = PRIORITY_INTERACTIVE):
+        queue = self._host(host)
+        queue.requests += 1
+
+        if queue.in_flight < queue.max_in_flight and queue.depth == 0:
+            queue.in_flight += 1
+            return
+
+        # Wait for a slot
+        fut = asyncio.get_event_loop().create_future()
+        queue.push(priority, service, fut)
+        start = self._clock()
+
+        try:
+            await fut
+
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot granted meanwhile
+                self.release(host)
+            else:
+                queue.remove(priority, service, fut)
+
+            raise
+
+        finally:
+            wait = self._clock() - start
+
+            queue.waited += 1
+            queue.wait_time += wait
+            queue.max_wait = max(queue.max_wait, wait)
+
+    def release(self, host: str):
+        queue = self._hosts[host]
+        queue.in_flight -= 1
+        queue.wake()
+
+    def slot(self, host: str, service: str, priority: int = PRIORITY_INTERACTIVE) -> _Slot:
+        return _Slot(self, host, service, priority)
+
+    def depth(self, host: str) -> int:
+        queue = self._hosts.get(host)
+        return 0 if queue is None else queue.depth
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: queue.stats() for host, queue in self._hosts.items()}
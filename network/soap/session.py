@@ -1,12 +1,23 @@
 import aiohttp
+import asyncio
 import logging
 
+from collections import Counter
 from network.base.session import BaseSession
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Sequence
+from urllib.parse import urlsplit
 
-from .error import SOAPError
+from .error import SOAPCircuitOpenError, SOAPError
+from .policy import RetryPolicy
 from .request import SOAPRequest
 from .response import SOAPResponse
+from .run import get_soap_transport
+from .scheduler import PRIORITY_INTERACTIVE
+from .template import SOAPTemplate
+from .transport import SOAPTransport
+
+# Constants
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
 
 # Logging
 logger = logging.getLogger('soap')
@@ -14,16 +25,53 @@ logger = logging.getLogger('soap')
 
 # Class
 class SOAPSession(BaseSession):
-    def __init__(self):
+    """
+    class SOAPSession:
+    Sends SOAP requests over a transport, by default the process wide one (see get_soap_transport).
+
+    Options:
+    - timeout         : deadline of a whole call (all attempts included), in seconds
+    - attempt_timeout : deadline of each attempt, in seconds
+    - retry           : retry policy for transport errors (UPnP faults are never retried)
+    - hedge           : delay after which a second identical request is sent if the first one is still running
+    - hedged_actions  : actions allowed to be hedged (none by default), they must be idempotent
+
+    Calls to a control url whose circuit breaker is open fail immediately with SOAPCircuitOpenError.
+    Requests wait for a slot of their device host in the transport's scheduler, according to their priority.
+    Only sent attempts failing or reaching a deadline count as failures of the breaker: waiting for a slot
+    and cancelled calls do not.
+    """
+
+    def __init__(
+            self, transport: Optional[SOAPTransport] = None, *,
+            timeout: Optional[float] = 30, attempt_timeout: Optional[float] = None,
+            retry: Optional[RetryPolicy] = None,
+            hedge: Optional[float] = None, hedged_actions: Iterable[str] = ()
+    ):
         # Attributes
+        self.transport = transport or get_soap_transport()
+        self.timeout = timeout
+        self.attempt_timeout = attempt_timeout
+        self.retry = retry
+        self.hedge = hedge
+        self.hedged_actions = set(hedged_actions)
+
+        # - metrics
+        self.metrics = Counter()  # type: Counter[str]
+
+        # - internals
         self._session = None  # type: Optional[aiohttp.ClientSession]
 
     # Methods
     async def open(self):
-        self._session = aiohttp.ClientSession()
+        self._session = await self.transport.open()
 
-    async def call(self, control_url: str, service_type: str, action: str, args: Dict[str, str]) -> Dict[str, str]:
-        req = SOAPRequest(control_url, service_type, action, args)
+    async def call(
+            self, control_url: str, service_type: str, action: str, args: Dict[str, str],
+            template: Optional[SOAPTemplate] = None, results: Optional[Sequence[str]] = None,
+            priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, str]:
+        req = SOAPRequest(control_url, service_type, action, args, template, results, priority)
         rep = await self.send(req)
 
         if rep.is_error:
@@ -31,22 +79,145 @@ class SOAPSession(BaseSession):
 
         return rep.results
 
-    async def send(self, request: SOAPRequest) -> SOAPResponse:
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+
+        return max(deadline - asyncio.get_event_loop().time(), 0)
+
+    async def _post(self, request: SOAPRequest) -> SOAPResponse:
         headers = request.headers()
         body = request.body()
 
+        session = await self.transport.open()
         logger.debug(f'{request.control_url} <= {body}')
-        async with self._session.post(request.control_url, headers=headers, data=body) as resp:
+
+        async with session.post(request.control_url, headers=headers, data=body) as resp:
+            if resp.status not in (200, 500):
+                resp.raise_for_status()
+
             is_error = (resp.status == 500)
-            data = await resp.text(encoding='utf-8')
+            data = await resp.read()
 
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f'{request.control_url} => {data}')
 
-            return SOAPResponse(
-                request.service_type, request.action,
-                data, is_error=is_error
-            )
+        return SOAPResponse(
+            request.service_type, request.action,
+            data, is_error=is_error, results=request.results
+        )
+
+    async def _attempt(self, request: SOAPRequest, deadline: Optional[float]) -> SOAPResponse:
+        scheduler = self.transport.scheduler
+        host = urlsplit(request.control_url).hostname
+
+        # Waiting for a slot is only bounded by the call deadline
+        await asyncio.wait_for(scheduler.acquire(host, request.control_url, request.priority), self._remaining(deadline))
+
+        try:
+            timeout = self._remaining(deadline)
+
+            if self.attempt_timeout is not None:
+                timeout = self.attempt_timeout if timeout is None else min(timeout, self.attempt_timeout)
+
+            return await asyncio.wait_for(self._post(request), timeout)
+
+        except TRANSPORT_ERRORS:
+            # Sent, but no (valid) answer in time
+            self.transport.breaker(request.control_url).failure()
+            raise
+
+        finally:
+            scheduler.release(host)
+
+    async def _hedged_attempt(self, request: SOAPRequest, deadline: Optional[float]) -> SOAPResponse:
+        first = asyncio.ensure_future(self._attempt(request, deadline))
+        tasks = {first}
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge)
+
+            if not done:
+                self.metrics['hedged'] += 1
+                tasks.add(asyncio.ensure_future(self._attempt(request, deadline)))
+
+            # First successful response wins
+            error = None  # type: Optional[BaseException]
+
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+
+                    error = task.exception()
+
+            raise error
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(self, request: SOAPRequest, deadline: Optional[float]) -> SOAPResponse:
+        breaker = self.transport.breaker(request.control_url)
+        hedge = self.hedge is not None and request.action in self.hedged_actions
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                self.metrics['rejected'] += 1
+                raise SOAPCircuitOpenError(request.control_url)
+
+            probing = breaker.probing
+            attempt += 1
+
+            try:
+                if hedge:
+                    response = await self._hedged_attempt(request, deadline)
+                else:
+                    response = await self._attempt(request, deadline)
+
+            except TRANSPORT_ERRORS as err:
+                self.metrics['errors'] += 1
+                error = err
+
+            else:
+                # UPnP faults are answers: the device is alive
+                breaker.success()
+                return response
+
+            finally:
+                # Cancelled, or not sent: another call may probe
+                if probing:
+                    breaker.release()
+
+            # Retry (within the deadline)
+            if self.retry is None or attempt >= self.retry.attempts:
+                raise error
+
+            delay = self.retry.delay(attempt)
+            remaining = self._remaining(deadline)
+
+            if remaining is not None and delay >= remaining:
+                raise error
+
+            logger.warning(f'{request.control_url}: {request.action} failed ({error!r}), retrying')
+            self.metrics['retries'] += 1
+
+            await asyncio.sleep(delay)
+
+    async def send(self, request: SOAPRequest) -> SOAPResponse:
+        self.metrics['calls'] += 1
+        deadline = None if self.timeout is None else asyncio.get_event_loop().time() + self.timeout
+
+        try:
+            return await self._send(request, deadline)
+
+        except asyncio.TimeoutError:
+            self.metrics['timeouts'] += 1
+            raise
 
     async def close(self):
-        await self._session.close()
+        # Connections stay in the transport's pool
         self._session = None
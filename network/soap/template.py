@@ -0,0 +1,69 @@
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from .constants import XML_SOAP_NS
+
+# Constants
+ENCODING_STYLE = 'http://schemas.xmlsoap.org/soap/encoding/'
+
+
+# Class
+class SOAPTemplate:
+    """
+    class SOAPTemplate:
+    Precompiled SOAP request of an action with a fixed argument order.
+    Envelope and headers are generated once, rendering only escapes and inserts argument values.
+    """
+
+    def __init__(self, service_type: str, action: str, arguments: Sequence[str]):
+        # Attributes
+        self.service_type = service_type
+        self.action = action
+        self.arguments = tuple(arguments)
+
+        # Precompute request
+        self.headers = {
+            'Content-Type': 'text/xml; charset="utf-8"',
+            'SOAPAction': f'"{service_type}#{action}"'
+        }  # type: Dict[str, str]
+
+        stype = escape(service_type, {'"': '&quot;'})
+
+        self._prefix = (
+            f'<ns0:Envelope xmlns:ns0="{XML_SOAP_NS["soap"]}" xmlns:ns1="{stype}" ns0:encodingStyle="{ENCODING_STYLE}">'
+            f'<ns0:Body><ns1:{action}>'
+        ).encode('utf-8')
+        self._suffix = f'</ns1:{action}></ns0:Body></ns0:Envelope>'.encode('utf-8')
+        self._tags = [
+            (f'<{n}>'.encode('utf-8'), f'</{n}>'.encode('utf-8'), f'<{n} />'.encode('utf-8'))
+            for n in self.arguments
+        ]
+
+    def __repr__(self):
+        return f'<SOAPTemplate: {self.action}({", ".join(self.arguments)})>'
+
+    # Methods
+    def render(self, args: Dict[str, Optional[str]]) -> bytes:
+        chunks = [self._prefix]
+
+        for name, (start, end, empty) in zip(self.arguments, self._tags):
+            value = args[name]
+
+            if value:
+                chunks.append(start)
+                chunks.append(escape(value).encode('utf-8'))
+                chunks.append(end)
+
+            else:
+                chunks.append(empty)
+
+        chunks.append(self._suffix)
+
+        return b''.join(chunks)
+
+
+# Utils
+@lru_cache(maxsize=1024)
+def compile_template(service_type: str, action: str, arguments: Tuple[str, ...]) -> SOAPTemplate:
+    return SOAPTemplate(service_type, action, arguments)
@@ -0,0 +1,125 @@
+import aiohttp
+import asyncio
+import logging
+
+from collections import Counter
+from network.utils.http import close_session
+from typing import Any, Dict
+
+from .policy import CircuitBreaker
+from .scheduler import SOAPScheduler
+
+# Logging
+logger = logging.getLogger('soap')
+
+
+# Class
+class SOAPTransport:
+    """
+    class SOAPTransport:
+    HTTP client shared by SOAP sessions, keeping connections to devices alive between calls.
+
+    Connections are limited globally (limit) and per host (limit_per_host), idle connections
+    are closed after keepalive_timeout seconds. Circuit breakers of control urls and the per host
+    request scheduler (by default limit_per_host requests in flight) are also shared here.
+    """
+
+    def __init__(
+            self, *,
+            limit: int = 100, limit_per_host: int = 4, keepalive_timeout: float = 30,
+            breaker_threshold: int = 5, breaker_reset: float = 30
+    ):
+        # Attributes
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.scheduler = SOAPScheduler(limit_per_host)
+
+        # - metrics
+        self.requests = Counter()     # type: Counter[str]
+        self.connections = Counter()  # type: Counter[str]
+        self.reused = Counter()       # type: Counter[str]
+        self.in_flight = 0
+
+        # - internals
+        self._loop = None
+        self._session = None
+        self._breakers = {}  # type: Dict[str, CircuitBreaker]
+
+    def __repr__(self):
+        return f'<SOAPTransport: {self.in_flight} running, {sum(self.requests.values())} requests>'
+
+    # Methods
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params: aiohttp.TraceRequestStartParams):
+            ctx.host = params.url.host
+            self.requests[ctx.host] += 1
+            self.in_flight += 1
+
+        async def on_request_end(session, ctx, params):
+            self.in_flight -= 1
+
+        async def on_connection_create(session, ctx, params):
+            self.connections[ctx.host] += 1
+
+        async def on_connection_reuse(session, ctx, params):
+            self.reused[ctx.host] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_end)
+        trace.on_connection_create_end.append(on_connection_create)
+        trace.on_connection_reuseconn.append(on_connection_reuse)
+
+        return trace
+
+    async def open(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_event_loop()
+
+        # Sessions are bound to their loop
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None:
+                await close_session(self._session, self._loop)
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+
+            self._loop = loop
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[self._trace_config()])
+            logger.debug('SOAP transport opened')
+
+        return self._session
+
+    def breaker(self, control_url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(control_url)
+
+        if breaker is None:
+            breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            self._breakers[control_url] = breaker
+
+        return breaker
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+            self._session = None
+            self._loop = None
+            logger.debug('SOAP transport closed')
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': self.in_flight,
+            'requests': dict(self.requests),
+            'connections': dict(self.connections),
+            'reused': dict(self.reused),
+            'breakers': {url: b.state for url, b in self._breakers.items() if b.state != 'closed'},
+            'hosts': self.scheduler.stats(),
+        }
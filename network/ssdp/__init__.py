@@ -1,7 +1,12 @@
+from .advertiser import SSDPAdvertiser, SSDPLocalDevice
 from .device import SSDPRemoteDevice
+from .lastchange import Change, LastChange
+from .limiter import SSDPRateLimiter
 from .message import SSDPMessage
+from .scpd import SCPD, parse_scpd
 from .server import SSDPServer
 from .service import SSDPService
-from .store import SSDPStore
+from .store import FanOutResult, SSDPStore
+from .stubs import ServiceStub, StubCache
 from .urn import URN
 from .usn import USN
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import random
+import time
+
+from network.typing import Address
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .message import SSDPMessage
+from .server import SSDPServer
+from .urn import URN
+
+# Constants
+SSDP_ALL = 'ssdp:all'
+SSDP_ROOT = 'upnp:rootdevice'
+MAX_MX = 5
+
+# Logging
+logger = logging.getLogger('ssdp:advertiser')
+
+
+# Utils
+def lower_versions(target: str) -> List[str]:
+    """
+    Returns all the targets a search may use to find the given one (URNs match lower versions)
+    """
+
+    if not target.startswith('urn:'):
+        return [target]
+
+    urn = URN(target)
+
+    if not urn.version.isdigit():
+        return [target]
+
+    base = f'urn:{urn.domain}:{urn.kind}:{urn.type}'
+    return [f'{base}:{v}' for v in range(int(urn.version), 0, -1)]
+
+
+# Classes
+class SSDPLocalDevice:
+    """
+    class SSDPLocalDevice:
+    Describe a local device (and its services and embedded devices) to advertise
+    """
+
+    def __init__(
+            self, uuid: str, dtype: Union[str, URN], *,
+            location: Optional[str] = None,
+            services: Iterable[Union[str, URN]] = (),
+            children: Iterable['SSDPLocalDevice'] = ()
+    ):
+        # Attributes
+        self.uuid = uuid.lower()
+        self.type = dtype if isinstance(dtype, URN) else URN(dtype)
+        self.location = location
+        self.services = [s if isinstance(s, URN) else URN(s) for s in services]
+        self.children = list(children)
+
+    def __repr__(self):
+        return f'<SSDPLocalDevice: {self.uuid} ({self.type})>'
+
+    # Methods
+    def targets(self, root: bool = True) -> List[Tuple[str, str]]:
+        """
+        Returns all (NT, USN) couples advertised by this device and its embedded devices
+        """
+
+        udn = f'uuid:{self.uuid}'
+        targets = []
+
+        if root:
+            targets.append((SSDP_ROOT, f'{udn}::{SSDP_ROOT}'))
+
+        targets.append((udn, udn))
+        targets.append((self.type.urn, f'{udn}::{self.type.urn}'))
+
+        for stype in self.services:
+            targets.append((stype.urn, f'{udn}::{stype.urn}'))
+
+        for child in self.children:
+            targets.extend(child.targets(root=False))
+
+        return targets
+
+
+class _Advertisement:
+    def __init__(self, device: SSDPLocalDevice, headers: Dict[str, str], max_age: int):
+        # Attributes
+        self.device = device
+        self.alive = []      # type: List[bytes]
+        self.byebye = []     # type: List[bytes]
+        self.responses = {}  # type: Dict[str, List[bytes]]
+        self.handle = None   # type: Optional[asyncio.TimerHandle]
+
+        # Precompute datagrams
+        for nt, usn in device.targets():
+            self.alive.append(SSDPMessage(method='NOTIFY', headers={
+                'HOST': '239.255.255.250:1900',
+                'CACHE-CONTROL': f'max-age={max_age}',
+                'LOCATION': device.location,
+                'NT': nt,
+                'NTS': 'ssdp:alive',
+                'SERVER': headers['SERVER'],
+                'USN': usn,
+                'BOOTID.UPNP.ORG': headers['BOOTID.UPNP.ORG'],
+                'CONFIGID.UPNP.ORG': headers['CONFIGID.UPNP.ORG'],
+            }).message.encode())
+
+            self.byebye.append(SSDPMessage(method='NOTIFY', headers={
+                'HOST': '239.255.255.250:1900',
+                'NT': nt,
+                'NTS': 'ssdp:byebye',
+                'USN': usn,
+                'BOOTID.UPNP.ORG': headers['BOOTID.UPNP.ORG'],
+                'CONFIGID.UPNP.ORG': headers['CONFIGID.UPNP.ORG'],
+            }).message.encode())
+
+            for st in lower_versions(nt):
+                response = SSDPMessage(is_response=True, headers={
+                    'CACHE-CONTROL': f'max-age={max_age}',
+                    'EXT': '',
+                    'LOCATION': device.location,
+                    'SERVER': headers['SERVER'],
+                    'ST': st,
+                    'USN': usn,
+                    'BOOTID.UPNP.ORG': headers['BOOTID.UPNP.ORG'],
+                    'CONFIGID.UPNP.ORG': headers['CONFIGID.UPNP.ORG'],
+                }).message.encode()
+
+                self.responses.setdefault(st, []).append(response)
+
+                if st == nt:
+                    self.responses.setdefault(SSDP_ALL, []).append(response)
+
+
+class SSDPAdvertiser:
+    """
+    class SSDPAdvertiser:
+    Advertise local devices through the given server and answers to M-SEARCH requests.
+
+    All datagrams are computed once when a device is registered, search targets are
+    resolved using an index (ST => responses).
+    The server only keeps a weak reference to the advertiser, its owner must keep it alive.
+    """
+
+    def __init__(
+            self, server: SSDPServer, *,
+            max_age: int = 1800, server_name: str = 'Python/3 UPnP/1.1 network/1.1', config_id: int = 1
+    ):
+        # Attributes
+        self.max_age = max_age
+
+        # - internals
+        self._loop = asyncio.get_event_loop()
+        self._server = server
+        self._headers = {
+            'SERVER': server_name,
+            'BOOTID.UPNP.ORG': str(int(time.time())),
+            'CONFIGID.UPNP.ORG': str(config_id),
+        }
+
+        self._devices = {}  # type: Dict[str, _Advertisement]
+        self._index = {}    # type: Dict[str, List[bytes]]
+        self._pending = set()  # (search target, address) of scheduled responses
+
+        # Callbacks
+        server.on('search', self.on_search)
+
+    def __repr__(self):
+        return f'<SSDPAdvertiser: {len(self._devices)} devices>'
+
+    # Methods
+    def _build_index(self):
+        index = {}  # type: Dict[str, List[bytes]]
+
+        for adv in self._devices.values():
+            for st, responses in adv.responses.items():
+                index.setdefault(st, []).extend(responses)
+
+        self._index = index
+
+    def _send(self, datagrams: List[bytes], addr: Optional[Address] = None):
+        if not self._server.started:
+            return
+
+        for data in datagrams:
+            self._server.send_raw(data, addr)
+
+    def _advertise(self, adv: _Advertisement):
+        self._send(adv.alive)
+
+        # Re-advertise before half the max-age, spread over the window
+        delay = random.uniform(self.max_age / 4, self.max_age / 2)
+        adv.handle = self._loop.call_later(delay, self._advertise, adv)
+
+    def _respond(self, st: str, addr: Address):
+        self._pending.discard((st, addr))
+        self._send(self._index.get(st, []), addr)
+
+    def register(self, device: SSDPLocalDevice):
+        assert device.location is not None, f'Invalid device: root device must have a location ({device.uuid})'
+
+        self.unregister(device.uuid)
+
+        adv = _Advertisement(device, self._headers, self.max_age)
+        self._devices[device.uuid] = adv
+        self._build_index()
+
+        # Initial advertisement, randomly delayed as required by UDA
+        adv.handle = self._loop.call_later(random.uniform(0, 0.1), self._advertise, adv)
+        logger.info(f'Advertising {device.uuid}')
+
+    def unregister(self, uuid: str):
+        adv = self._devices.pop(uuid.lower(), None)
+
+        if adv is None:
+            return
+
+        if adv.handle is not None:
+            adv.handle.cancel()
+
+        self._build_index()
+        self._send(adv.byebye)
+
+        logger.info(f'Stopped advertising {uuid}')
+
+    def responses(self, st: str) -> List[bytes]:
+        return self._index.get(st, [])
+
+    def stop(self):
+        for uuid in list(self._devices):
+            self.unregister(uuid)
+
+    # Callbacks
+    def on_search(self, msg: SSDPMessage, addr: Address):
+        if msg.man != '"ssdp:discover"':
+            return
+
+        st = msg.headers.get('ST')
+
+        if st not in self._index or (st, addr) in self._pending:
+            return
+
+        try:
+            mx = msg.mx
+
+        except ValueError:
+            return
+
+        # Unicast searches are answered immediately
+        if mx is None:
+            delay = 0
+        else:
+            delay = random.uniform(0, min(max(mx, 1), MAX_MX))
+
+        self._pending.add((st, addr))
+        self._loop.call_later(delay, self._respond, st, addr)
+
+    # Properties
+    @property
+    def devices(self) -> List[SSDPLocalDevice]:
+        return [adv.device for adv in self._devices.values()]
@@ -2,14 +2,25 @@ import asyncio
 import logging
 
 from network.base.device import RemoteDevice
+from network.base.emitter import SerialDispatcher
+from network.soap import fragile_limit, get_soap_transport
 from network.utils.xml import strip_ns
-from typing import Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+from urllib.parse import urlsplit
 from xml.etree import ElementTree as ET
 
 from .message import SSDPMessage
+from .scpd import SCPD, call_signature, parse_scpd
 from .service import SSDPService
+from .standard import get_standard_scpd
+from .stubs import StubCache
 from .urn import URN
-from .xml import log_xml_errors, get_device_uuid, get_service_xml, get_service_id
+from .xml import (
+    log_xml_errors, get_data, get_device_uuid, get_service_id, get_service_scpd_url, get_service_type, get_service_xml
+)
+
+if TYPE_CHECKING:
+    from network.gena import GENAMulticastListener
 
 
 # Utils
@@ -29,10 +40,19 @@ class SSDPRemoteDevice(RemoteDevice):
     - down (was: str)            : each time the device goes to the state 'down' (was is the previous state)
     """
 
-    def __init__(self, msg: SSDPMessage, xml: ET.Element, addr: str, parent: Optional['SSDPRemoteDevice'] = None):
+    def __init__(
+            self, msg: SSDPMessage, xml: ET.Element, addr: str, parent: Optional['SSDPRemoteDevice'] = None, *,
+            dispatcher: Optional[SerialDispatcher] = None, trust_standard: bool = False,
+            multicast: Optional['GENAMulticastListener'] = None, stubs: Optional[StubCache] = None
+    ):
         super().__init__(addr, 'down')
 
         # Attributes
+        self.dispatcher = dispatcher
+        self.trust_standard = trust_standard
+        self.multicast = multicast
+        self.stubs = stubs
+
         # - metadata
         self.parent = parent
         self.location = msg.location
@@ -104,22 +124,66 @@ class SSDPRemoteDevice(RemoteDevice):
             elif child.text is not None:
                 self.metadata[tag] = child.text.strip()
 
+    def _add_service(self, sid: str, xmld: ET.Element, xmls: Union[ET.Element, SCPD]):
+        self._logger.info(f'New service: {sid}')
+        service = SSDPService(xmld, xmls, self.location, dispatcher=self.dispatcher)
+        self._services[sid] = service
+
+        # Fragile models get less concurrent requests
+        limit = fragile_limit(self.metadata.get('modelName'))
+
+        if limit is not None:
+            get_soap_transport().scheduler.limit(urlsplit(service.control).hostname, limit)
+
+        # Multicast state variables
+        if self.multicast is not None and any(var.multicast for var in service.state_variables):
+            service.listen_multicast(self.multicast, self.uuid)
+
+        # Emit new event
+        self.emit('new', service)
+
+    async def _get_scpd(self, xmld: ET.Element) -> Union[ET.Element, SCPD]:
+        if self.stubs is None:
+            xmls, _ = await get_service_xml(xmld, self.location)
+            return xmls
+
+        # Known descriptions (same hash) are not parsed again
+        data = await get_data(get_service_scpd_url(xmld, self.location))
+        return self.stubs.get(get_service_type(xmld, self.location), data).DEFINITION
+
     @log_xml_errors
     async def _update_service(self, xmld: ET.Element):
-        xmls, sid = await get_service_xml(xmld, self.location)
+        sid = get_service_id(xmld, self.location)
+        standard = None  # type: Optional[SCPD]
+
+        # Trust standard description, checked against the real one below
+        if self.trust_standard and sid not in self._services:
+            standard = get_standard_scpd(get_service_type(xmld, self.location))
+
+            if standard is not None:
+                self._add_service(sid, xmld, standard)
+
+        xmls = await self._get_scpd(xmld)
         service = self._services.get(sid)
 
-        if service is not None:
-            self._logger.info(f'Update service: {sid}')
-            service.update(xmld, xmls, self.location)
+        if service is None:
+            self._add_service(sid, xmld, xmls)
 
-        else:
-            self._logger.info(f'New service: {sid}')
-            service = SSDPService(xmld, xmls, self.location)
-            self._services[sid] = service
+        elif standard is not None:
+            scpd = xmls if isinstance(xmls, SCPD) else parse_scpd(xmls)
+            theirs, ours = call_signature(scpd), call_signature(standard)
 
-            # Emit new event
-            self.emit('new', service)
+            if any(theirs.get(name) != signature for name, signature in ours.items()):
+                self._logger.warning(f'Service {sid} does not match its standard description, updating')
+                service.update(xmld, scpd, self.location)
+
+            elif theirs.keys() != ours.keys():
+                self._logger.info(f'Service {sid} has optional actions, updating')
+                service.update(xmld, scpd, self.location)
+
+        else:
+            self._logger.info(f'Update service: {sid}')
+            service.update(xmld, xmls, self.location)
 
     def _update_sub_device(self, xml: ET.Element, msg: SSDPMessage):
         uuid = get_device_uuid(xml, self.location)
@@ -129,7 +193,11 @@ class SSDPRemoteDevice(RemoteDevice):
             device.update(msg, xml)
 
         else:
-            device = SSDPRemoteDevice(msg, xml, self.address, parent=self)
+            device = SSDPRemoteDevice(
+                msg, xml, self.address, parent=self,
+                dispatcher=self.dispatcher, trust_standard=self.trust_standard, multicast=self.multicast,
+                stubs=self.stubs
+            )
             self._children[uuid] = device
 
     def update(self, msg: SSDPMessage, xml: ET.Element):
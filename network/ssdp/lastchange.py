@@ -0,0 +1,133 @@
+import logging
+
+from network.base.emitter import EventEmitter
+from network.utils.xml import strip_ns
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from .service import SSDPService
+
+# Types
+StateKey = Tuple[str, Optional[str]]  # name, channel
+
+# Logging
+logger = logging.getLogger('ssdp')
+
+
+# Utils
+def parse_lastchange(text: str) -> Dict[int, Dict[StateKey, str]]:
+    """
+    Parse a LastChange document, returns raw values by instance id then by (name, channel).
+    """
+
+    xml = ET.fromstring(text)
+    instances = {}
+
+    for xi in xml:
+        if strip_ns(xi.tag) != 'InstanceID':
+            continue
+
+        values = {}
+
+        for xv in xi:
+            values[(strip_ns(xv.tag), xv.attrib.get('channel'))] = xv.attrib.get('val', '')
+
+        instances[int(xi.attrib['val'])] = values
+
+    return instances
+
+
+# Classes
+class Change(NamedTuple):
+    instance: int
+    name: str
+    old: Any
+    new: Any
+    channel: Optional[str] = None
+
+
+class LastChange(EventEmitter):
+    """
+    class LastChange:
+    Decodes LastChange events (RenderingControl, AVTransport) into a typed state table per instance.
+    Each event document is parsed once, only the variables it holds are converted and compared.
+
+    Events:
+    - changed (change: Change)         : each time a variable of an instance changes
+    - changed:<name> (change: Change)  : same, for the given variable only
+    """
+
+    def __init__(self, service: Optional[SSDPService] = None):
+        super().__init__()
+
+        # Attributes
+        self.service = service
+
+        # - internals
+        self._instances = {}  # type: Dict[int, Dict[StateKey, Any]]
+
+        # Listen to LastChange updates
+        if service is not None:
+            service.state_variable('LastChange').on('update', self.decode)
+
+    def __repr__(self):
+        return f'<LastChange: {len(self._instances)} instances>'
+
+    # Methods
+    def _to_python(self, name: str, raw: str) -> Any:
+        if self.service is None:
+            return raw
+
+        try:
+            return self.service.state_variable(name).type.to_python(raw)
+
+        except (KeyError, TypeError, ValueError):
+            return raw
+
+    def decode(self, text: Optional[str]) -> List[Change]:
+        """
+        Apply the given LastChange document, returns (and emits) changed variables.
+        """
+
+        if not text:
+            return []
+
+        try:
+            instances = parse_lastchange(text)
+
+        except (ET.ParseError, KeyError, ValueError):
+            logger.warning(f'Invalid LastChange document: {text!r}')
+            return []
+
+        changes = []
+
+        for instance, values in instances.items():
+            state = self._instances.setdefault(instance, {})
+
+            for key, raw in values.items():
+                value = self._to_python(key[0], raw)
+                old = state.get(key)
+
+                if key in state and old == value:
+                    continue
+
+                state[key] = value
+                changes.append(Change(instance, key[0], old, value, key[1]))
+
+        for change in changes:
+            self.emit('changed', change)
+            self.emit(f'changed:{change.name}', change)
+
+        return changes
+
+    def value(self, name: str, instance: int = 0, channel: Optional[str] = None) -> Any:
+        return self._instances.get(instance, {}).get((name, channel))
+
+    def instance(self, instance: int = 0) -> Mapping[StateKey, Any]:
+        return MappingProxyType(self._instances.get(instance, {}))
+
+    # Properties
+    @property
+    def instances(self) -> List[int]:
+        return list(self._instances)
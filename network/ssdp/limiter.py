@@ -0,0 +1,178 @@
+import heapq
+import logging
+import time
+
+from typing import Callable, Dict, List, Optional
+
+from .message import SSDPMessage
+
+# Logging
+logger = logging.getLogger('ssdp:limiter')
+
+
+# Classes
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'stamp', 'strikes', 'dropped')
+
+    def __init__(self, rate: float, burst: float, now: float):
+        # Attributes
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+        self.strikes = 0  # drops since the bucket was last full
+        self.dropped = 0
+
+    # Methods
+    def consume(self, now: float) -> bool:
+        tokens = self.tokens + (now - self.stamp) * self.rate
+        self.stamp = now
+
+        if tokens >= self.burst:
+            tokens = self.burst
+            self.strikes = 0
+
+        if tokens < 1:
+            self.tokens = tokens
+            self.strikes += 1
+            self.dropped += 1
+
+            return False
+
+        self.tokens = tokens - 1
+        return True
+
+    def idle(self, now: float) -> bool:
+        return self.tokens + (now - self.stamp) * self.rate >= self.burst
+
+
+class SSDPRateLimiter:
+    """
+    class SSDPRateLimiter:
+    Per source address and per device uuid token buckets, checked before SSDP messages are dispatched.
+    Sources dropping more than quarantine_after messages in a row are ignored during quarantine_time seconds.
+    At most max_sources buckets are kept of each kind: idle ones are pruned first, then the least recently used.
+    """
+
+    def __init__(
+            self, *,
+            address_rate: float = 50, address_burst: float = 100,
+            uuid_rate: float = 20, uuid_burst: float = 50,
+            quarantine_after: int = 500, quarantine_time: float = 300,
+            max_sources: int = 4096, clock: Callable[[], float] = time.monotonic
+    ):
+        # Attributes
+        self.address_rate = address_rate
+        self.address_burst = address_burst
+        self.uuid_rate = uuid_rate
+        self.uuid_burst = uuid_burst
+        self.quarantine_after = quarantine_after
+        self.quarantine_time = quarantine_time
+        self.max_sources = max_sources
+
+        # - counters
+        self.dropped = {
+            'quarantine': 0,
+            'address': 0,
+            'uuid': 0,
+        }
+
+        # - internals
+        self._clock = clock
+        self._addresses = {}   # type: Dict[str, TokenBucket]
+        self._uuids = {}       # type: Dict[str, TokenBucket]
+        self._quarantine = {}  # type: Dict[str, float]
+
+    def __repr__(self):
+        return f'<SSDPRateLimiter: {sum(self.dropped.values())} dropped, {len(self._quarantine)} quarantined>'
+
+    # Methods
+    def _in_quarantine(self, key: str, now: float) -> bool:
+        until = self._quarantine.get(key)
+
+        if until is None:
+            return False
+
+        if until <= now:
+            del self._quarantine[key]
+            logger.info(f'{key} released from quarantine')
+
+            return False
+
+        return True
+
+    def _allow(self, buckets: Dict[str, TokenBucket], key: str, rate: float, burst: float, kind: str) -> bool:
+        now = self._clock()
+
+        if self._quarantine and self._in_quarantine(key, now):
+            self.dropped['quarantine'] += 1
+            return False
+
+        bucket = buckets.get(key)
+
+        if bucket is None:
+            if len(buckets) >= self.max_sources:
+                self._prune(buckets, now)
+
+            bucket = TokenBucket(rate, burst, now)
+            buckets[key] = bucket
+
+        if bucket.consume(now):
+            return True
+
+        self.dropped[kind] += 1
+
+        if bucket.strikes >= self.quarantine_after:
+            self.quarantine(key)
+
+        return False
+
+    def _prune(self, buckets: Dict[str, TokenBucket], now: float):
+        # Idle buckets first (full again, nothing is lost)
+        for key in [k for k, b in buckets.items() if b.idle(now)]:
+            del buckets[key]
+
+        # Then least recently used ones, down to 3/4 of max_sources so that evictions stay rare
+        if len(buckets) >= self.max_sources:
+            count = len(buckets) - self.max_sources * 3 // 4
+
+            for key in heapq.nsmallest(count, buckets, key=lambda k: buckets[k].stamp):
+                del buckets[key]
+
+    def allow_address(self, address: str) -> bool:
+        return self._allow(self._addresses, address, self.address_rate, self.address_burst, 'address')
+
+    def allow_uuid(self, uuid: str) -> bool:
+        return self._allow(self._uuids, uuid, self.uuid_rate, self.uuid_burst, 'uuid')
+
+    def allow_message(self, msg: SSDPMessage) -> bool:
+        usn = msg.headers.get('USN')
+
+        if usn is None or not usn.startswith('uuid:'):
+            return True
+
+        return self.allow_uuid(usn[5:].split('::', 1)[0].lower())
+
+    def quarantine(self, key: str, duration: Optional[float] = None):
+        self._quarantine[key] = self._clock() + (self.quarantine_time if duration is None else duration)
+        logger.warning(f'{key} quarantined')
+
+    def release(self, key: str):
+        self._quarantine.pop(key, None)
+
+        for buckets in (self._addresses, self._uuids):
+            if key in buckets:
+                buckets[key].strikes = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            'dropped': dict(self.dropped),
+            'addresses': {k: b.dropped for k, b in self._addresses.items() if b.dropped},
+            'uuids': {k: b.dropped for k, b in self._uuids.items() if b.dropped},
+        }
+
+    # Properties
+    @property
+    def quarantined(self) -> List[str]:
+        now = self._clock()
+        return [key for key, until in self._quarantine.items() if until > now]
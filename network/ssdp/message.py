@@ -15,7 +15,8 @@ class SSDPMessage:
     def __init__(
             self, *,
             message: Optional[str] = None,
-            method: Optional[str] = None, is_response: bool = False, headers: Optional[Headers] = None
+            method: Optional[str] = None, is_response: bool = False, headers: Optional[Headers] = None,
+            body: str = ''
     ):
         if message is not None:
             self._parse_message(message)
@@ -25,6 +26,7 @@ class SSDPMessage:
             self.http_version = "HTTP/1.1"
 
             self.headers = headers
+            self.body = body
             if not is_response and 'HOST' not in self.headers:
                 self.headers['HOST'] = "239.255.255.250:1900"
 
@@ -32,8 +34,10 @@ class SSDPMessage:
         return f'<ssdp.SSDPMessage: {self.kind}>'
 
     # Methods
-    def _parse_message(self, message):
-        lines = message.splitlines()
+    def _parse_message(self, message: str):
+        # Body (multicast events)
+        head, _, self.body = message.partition('\r\n\r\n')
+        lines = head.splitlines()
 
         self._parse_request(lines[0])
         self._parse_headers(lines[1:])
@@ -59,7 +63,7 @@ class SSDPMessage:
             self.headers[header[:dp].upper()] = header[dp+1:].strip()
 
     def _gen_message(self) -> str:
-        return '\r\n'.join([self._gen_request(), *self._gen_headers()]) + '\r\n' * 2
+        return '\r\n'.join([self._gen_request(), *self._gen_headers()]) + '\r\n' * 2 + self.body
 
     def _gen_request(self) -> str:
         return f'{self.http_version} 200 OK' if self.is_response else f'{self.method} * {self.http_version}'
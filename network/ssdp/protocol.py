@@ -7,6 +7,7 @@ from network.base.protocol import BaseProtocol
 from network.typing import Address
 from typing import Optional, Union, Text
 
+from .limiter import SSDPRateLimiter
 from .message import SSDPMessage
 
 # Logging
@@ -19,7 +20,7 @@ class SSDPProtocol(BaseProtocol[SSDPMessage], asyncio.DatagramProtocol):
     Receive SSDP messages from the given multicast
     """
 
-    def __init__(self, multicast: Address, ttl: int = 4):
+    def __init__(self, multicast: Address, ttl: int = 4, limiter: Optional[SSDPRateLimiter] = None):
         super().__init__()
 
         # Attributes
@@ -27,6 +28,7 @@ class SSDPProtocol(BaseProtocol[SSDPMessage], asyncio.DatagramProtocol):
 
         self.multicast = multicast
         self.ttl = ttl
+        self.limiter = limiter
 
     # Methods
     def connection_made(self, transport: asyncio.transports.DatagramTransport) -> None:
@@ -53,9 +55,18 @@ class SSDPProtocol(BaseProtocol[SSDPMessage], asyncio.DatagramProtocol):
         self.emit('disconnected')
 
     def datagram_received(self, data: Union[bytes, Text], addr: Address) -> None:
+        # Flood protection (before any parsing)
+        if self.limiter is not None and not self.limiter.allow_address(addr[0]):
+            return
+
         # logging
         logger.debug(f'{addr[0]}:{addr[1]} => {data}')
-        self.emit('recv', SSDPMessage(message=data.decode('utf-8')), addr)
+        msg = SSDPMessage(message=data.decode('utf-8'))
+
+        if self.limiter is not None and not self.limiter.allow_message(msg):
+            return
+
+        self.emit('recv', msg, addr)
 
     async def send(self, request: SSDPMessage):
         assert self.transport is not None
@@ -68,6 +79,15 @@ class SSDPProtocol(BaseProtocol[SSDPMessage], asyncio.DatagramProtocol):
         # logging
         logger.debug(f'{self.multicast[0]}:{self.multicast[1]} <= {data}')
 
+    def send_raw(self, data: bytes, addr: Optional[Address] = None):
+        assert self.transport is not None
+
+        addr = addr or self.multicast
+        self.transport.sendto(data, addr)
+
+        # logging
+        logger.debug(f'{addr[0]}:{addr[1]} <= {data}')
+
     async def close(self):
         if self.transport is not None:
             self.transport.close()
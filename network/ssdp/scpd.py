@@ -0,0 +1,110 @@
+import hashlib
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from .constants import XML_SERVICE_NS
+
+
+# Classes
+class ArgumentDef(NamedTuple):
+    name: str
+    direction: str
+    state_variable: str
+    retval: bool = False
+
+
+class StateVariableDef(NamedTuple):
+    name: str
+    data_type: str
+    default_value: Optional[str] = None
+    allowed_values: Optional[Tuple[str, ...]] = None
+    allowed_range: Optional[Tuple[str, str, Optional[str]]] = None  # (minimum, maximum, step)
+    send_events: bool = True
+    multicast: bool = False
+
+
+class SCPD(NamedTuple):
+    """
+    class SCPD:
+    Plain tables of a service description: actions (name => arguments) and state variables (name => definition).
+    Can be written as python literals, and used to build services without any XML parsing.
+    """
+
+    actions: Dict[str, Tuple[ArgumentDef, ...]]
+    state_variables: Dict[str, StateVariableDef]
+
+
+# Utils
+def _text(xml: ET.Element, path: str) -> Optional[str]:
+    e = xml.find(path, XML_SERVICE_NS)
+    return None if e is None else e.text
+
+
+def parse_scpd(xml: ET.Element) -> SCPD:
+    actions = {}  # type: Dict[str, Tuple[ArgumentDef, ...]]
+    state_variables = {}  # type: Dict[str, StateVariableDef]
+
+    # Actions
+    xactions = xml.find('upnp:actionList', XML_SERVICE_NS)
+
+    for xa in (xactions if xactions is not None else ()):
+        args = []
+        xal = xa.find('upnp:argumentList', XML_SERVICE_NS)
+
+        for child in (xal if xal is not None else ()):
+            args.append(ArgumentDef(
+                _text(child, 'upnp:name'),
+                _text(child, 'upnp:direction'),
+                _text(child, 'upnp:relatedStateVariable'),
+                child.find('upnp:retval', XML_SERVICE_NS) is not None
+            ))
+
+        actions[_text(xa, 'upnp:name')] = tuple(args)
+
+    # State variables
+    xstate = xml.find('upnp:serviceStateTable', XML_SERVICE_NS)
+
+    for xv in (xstate if xstate is not None else ()):
+        xtype = xv.find('upnp:dataType', XML_SERVICE_NS)
+
+        xavl = xv.find('upnp:allowedValueList', XML_SERVICE_NS)
+        allowed_values = None if xavl is None else tuple(child.text for child in xavl)
+
+        xavr = xv.find('upnp:allowedValueRange', XML_SERVICE_NS)
+        allowed_range = None if xavr is None else (
+            _text(xavr, 'upnp:minimum'), _text(xavr, 'upnp:maximum'), _text(xavr, 'upnp:step')
+        )
+
+        var = StateVariableDef(
+            _text(xv, 'upnp:name'),
+            xtype.attrib.get('type', xtype.text),
+            _text(xv, 'upnp:defaultValue'),
+            allowed_values, allowed_range,
+            xv.attrib.get('sendEvents', 'yes') == 'yes',
+            xv.attrib.get('multicast', 'no') == 'yes'
+        )
+
+        state_variables[var.name] = var
+
+    return SCPD(actions, state_variables)
+
+
+def call_signature(scpd: SCPD) -> Dict[str, Tuple[Tuple[str, str, Optional[str]], ...]]:
+    """
+    What matters to call the actions of a description: by action, its arguments names, directions
+    and related types. Defaults, allowed values and unrelated variables are ignored.
+    """
+
+    def data_type(name: str) -> Optional[str]:
+        var = scpd.state_variables.get(name)
+        return None if var is None else var.data_type
+
+    return {
+        name: tuple((arg.name, arg.direction, data_type(arg.state_variable)) for arg in arguments)
+        for name, arguments in scpd.actions.items()
+    }
+
+
+def scpd_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
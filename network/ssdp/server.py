@@ -6,8 +6,9 @@ from network.base.emitter import EventEmitter
 from network.base.protocol import BaseProtocol
 from network.base.server import BaseServer
 from network.typing import Address
-from typing import Optional, Type
+from typing import AsyncIterator, Optional, Tuple, Type
 
+from .limiter import SSDPRateLimiter
 from .message import SSDPMessage
 from .protocol import SSDPProtocol, SSDPSearchProtocol
 from .windows import WindowsSearchProtocol
@@ -19,12 +20,13 @@ REUSE_PORT = True if hasattr(socket, 'SO_REUSEPORT') else None
 
 # Class
 class SSDPServer(BaseServer, EventEmitter):
-    def __init__(self, multicast: Address, ttl: int = 4):
+    def __init__(self, multicast: Address, ttl: int = 4, limiter: Optional[SSDPRateLimiter] = None):
         super().__init__()
 
         # - parameters
         self.multicast = multicast
         self.ttl = ttl
+        self.limiter = limiter
 
         # - internals
         self.__started = False
@@ -47,7 +49,7 @@ class SSDPServer(BaseServer, EventEmitter):
 
     def _protocol_factory(self, protocol: Type[SSDPProtocol] = SSDPProtocol):
         return lambda: protocol(
-            self.multicast, ttl=self.ttl
+            self.multicast, ttl=self.ttl, limiter=self.limiter
         )
 
     async def start(self):
@@ -62,25 +64,28 @@ class SSDPServer(BaseServer, EventEmitter):
             self._protocol.on('recv', self._on_message)
             self.__started = True
 
-    def send(self, msg: SSDPMessage):
+    async def send(self, msg: SSDPMessage):
         assert self.__started
-        self._protocol.send(msg)
+        await self._protocol.send(msg)
 
-    async def search(self, *targets: str, mx: int = 5) -> BaseProtocol[SSDPMessage]:
-        # Prepare protocol
+    def send_raw(self, data: bytes, addr: Optional[Address] = None):
+        assert self.__started
+        self._protocol.send_raw(data, addr)
+
+    async def _search_protocol(self) -> BaseProtocol[SSDPMessage]:
         if ON_WINDOWS:
-            protocol = WindowsSearchProtocol(self.multicast, ttl=self.ttl)
+            return WindowsSearchProtocol(self.multicast, ttl=self.ttl)
 
-        else:
-            _, protocol = await self._loop.create_datagram_endpoint(
-                self._protocol_factory(SSDPSearchProtocol),
-                family=socket.AF_INET,
-                allow_broadcast=True
-            )
+        _, protocol = await self._loop.create_datagram_endpoint(
+            self._protocol_factory(SSDPSearchProtocol),
+            family=socket.AF_INET,
+            allow_broadcast=True
+        )
 
-        protocol.on('recv', self._on_message)
+        return protocol
 
-        # Send message
+    @staticmethod
+    async def _send_search(protocol: BaseProtocol[SSDPMessage], targets: Tuple[str, ...], mx: int):
         for st in targets:
             msg = SSDPMessage(
                 method='M-SEARCH',
@@ -94,6 +99,14 @@ class SSDPServer(BaseServer, EventEmitter):
 
             await protocol.send(msg)
 
+    async def search(self, *targets: str, mx: int = 5) -> BaseProtocol[SSDPMessage]:
+        # Prepare protocol
+        protocol = await self._search_protocol()
+        protocol.on('recv', self._on_message)
+
+        # Send message
+        await self._send_search(protocol, targets, mx)
+
         async def close():
             await asyncio.sleep(mx * 2)
             await protocol.close()
@@ -102,6 +115,67 @@ class SSDPServer(BaseServer, EventEmitter):
 
         return protocol
 
+    async def search_iter(
+            self, *targets: str,
+            mx: int = 5, limit: Optional[int] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[SSDPMessage, Address]]:
+        """
+        Send a M-SEARCH and yields responses as soon as they are received.
+        Responses are deduplicated by USN and address. The search socket is closed as soon as
+        limit responses have been yielded, timeout (defaults to mx * 2) expires or the consumer stops iterating.
+        """
+
+        queue = asyncio.Queue()  # type: asyncio.Queue[Optional[Tuple[SSDPMessage, Address]]]
+        seen = set()             # (usn, address)
+
+        def on_recv(msg: SSDPMessage, addr: Address):
+            self._on_message(msg, addr)
+
+            if msg.is_response:
+                queue.put_nowait((msg, addr))
+
+        # Prepare protocol
+        protocol = await self._search_protocol()
+        protocol.on('recv', on_recv)
+        protocol.on('disconnected', lambda: queue.put_nowait(None))
+
+        try:
+            # Send message
+            await self._send_search(protocol, targets, mx)
+
+            deadline = self._loop.time() + (mx * 2 if timeout is None else timeout)
+            count = 0
+
+            while limit is None or count < limit:
+                remaining = deadline - self._loop.time()
+
+                if remaining <= 0:
+                    break
+
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+
+                except asyncio.TimeoutError:
+                    break
+
+                if item is None:
+                    break
+
+                # Deduplicate
+                msg, addr = item
+                key = (str(msg.usn), addr)
+
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                count += 1
+
+                yield msg, addr
+
+        finally:
+            await protocol.close()
+
     async def stop(self):
         if self.__started:
             await self._protocol.close()
@@ -1,36 +1,54 @@
 import asyncio
-import math
 import logging
 
-from network.base.emitter import EventEmitter
+from network.base.coalesce import Coalescer
+from network.base.emitter import EventEmitter, SerialDispatcher
 from network.base.machine import StateMachine
-from network.gena import get_gena_session, GENASubscription
-from network.soap import SOAPSession
+from network.gena import get_gena_session, GENAShardError, GENASubscription
+from network.soap import PRIORITY_INTERACTIVE, SOAPCache, SOAPError, SOAPSession
 from network.utils.style import style as _s
-from typing import Any, Dict, List, Optional, Union
+from collections import deque
+from functools import partial
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from urllib.parse import urljoin
 from xml.etree import ElementTree as ET
 
-from .constants import XML_DEVICE_NS, XML_SERVICE_NS
+from .constants import XML_DEVICE_NS
+from .scpd import SCPD, ArgumentDef, StateVariableDef, parse_scpd
+from .signature import ActionSignature
 from .types import SSDPType, get_type
 from .urn import URN
 from .xml import get_service_id
 
+if TYPE_CHECKING:
+    from network.gena import GENAMulticastListener
+
 # Constants
 _s_type = _s.bold + _s.purple
 
+ARRAY_END_CODES = (
+    713,  # SpecifiedArrayIndexInvalid
+    714,  # NoSuchEntryInArray
+)
+
 
 # Utils
-def xml_text(e: Optional[ET.Element]) -> Optional[str]:
-    return None if e is None else e.text
+def merge_changes(pending: Tuple[Any, Any], change: Tuple[Any, Any]) -> Optional[Tuple[Any, Any]]:
+    # First old value, latest new value (dropped if back to the old one)
+    if pending[0] == change[1]:
+        return None
 
+    return pending[0], change[1]
 
-def call_later(delay, fun):
-    async def wait():
-        await asyncio.sleep(delay)
-        await fun()
 
-    return asyncio.create_task(wait())
+def discard_tasks(tasks: Iterable[asyncio.Future]):
+    for task in tasks:
+        if task.done():
+            if not task.cancelled():
+                task.exception()  # mark exception as retrieved
+        else:
+            task.cancel()
 
 
 # Classes
@@ -44,26 +62,36 @@ class SSDPService(StateMachine):
     - down (was: str) : each time the service goes to the state 'down' (was is the previous state)
     """
 
-    def __init__(self, xmld: ET.Element, xmls: ET.Element, base_url: str):
+    def __init__(
+            self, xmld: ET.Element, xmls: Union[ET.Element, SCPD], base_url: str, *,
+            dispatcher: Optional[SerialDispatcher] = None
+    ):
         super().__init__('down')
 
         # Attributes
         self.id = get_service_id(xmld, base_url)
+        self.dispatcher = dispatcher
 
         # - internals
         self._actions = {}        # type: Dict[str, Action]
         self._state = {}          # type: Dict[str, StateVariable]
-        self._subscriptions = {}  # type: Dict[str, GENASubscription]
+        self._values = {}         # type: Dict[str, Any]
+        self._subscription = None  # type: Optional[GENASubscription]
+        self._subscribed = set()
+        self._subscribe_lock = asyncio.Lock()
+        self._resync_task = None   # type: Optional[asyncio.Future]
+        self._multicast = None     # type: Optional[Tuple[GENAMulticastListener, str]]
         self._logger = logging.getLogger(f'ssdp:service:{self.id}')
 
-        # - protocols
-        self._gena = get_gena_session()
-        self._soap = SOAPSession()
-
         # Parse xml
         self._parse_xml_device(xmld, base_url)
         self._parse_xml_service(xmls)
 
+        # - protocols
+        self._gena = get_gena_session(self.event_sub)
+        self._soap = SOAPSession()
+        self.cache = SOAPCache()
+
         # Setup callbacks
         self.on('up', self._on_up)
         self.on('down', self._on_down)
@@ -94,65 +122,348 @@ class SSDPService(StateMachine):
         self.control = urljoin(base_url, xml.find('upnp:controlURL', XML_DEVICE_NS).text)
         self.event_sub = urljoin(base_url, xml.find('upnp:eventSubURL', XML_DEVICE_NS).text)
 
-    def _parse_xml_service(self, xml: ET.Element):
+    def _parse_xml_service(self, xml: Union[ET.Element, SCPD]):
+        scpd = xml if isinstance(xml, SCPD) else parse_scpd(xml)
+
+        # Gather state (known variables are updated in place, keeping their listeners)
+        state = {}  # type: Dict[str, StateVariable]
+        redefined = False
+
+        for definition in scpd.state_variables.values():
+            var = self._state.get(definition.name)
+
+            if var is None:
+                var = StateVariable(definition, self)
+
+            elif var.definition != definition:
+                var._define(definition)
+                redefined = True
+
+            state[definition.name] = var
+
+        self._state = state
+
         # Gather actions
-        for child in xml.find('upnp:actionList', XML_SERVICE_NS):
-            action = Action(child, self)
-            self._actions[action.name] = action
+        actions = {}  # type: Dict[str, Action]
+
+        for name, arguments in scpd.actions.items():
+            action = self._actions.get(name)
+
+            if action is None or action.definition != tuple(arguments):
+                action = Action(name, arguments, self)
 
-        # Gather state
-        for child in xml.find('upnp:serviceStateTable', XML_SERVICE_NS):
-            state_var = StateVariable(child, self)
-            self._state[state_var.name] = state_var
+            elif redefined:
+                action._signature = None  # argument types may have changed
+
+            actions[name] = action
+
+        self._actions = actions
 
     async def _on_up(self, was: str):
         # Open GENA session
-        self._subscriptions = {}
+        self._subscription = None
+        self._subscribed = set()
         await self._gena.open()
 
     async def _on_down(self, was: str):
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+            self._resync_task = None
+
+        # Stop multicast events
+        if self._multicast is not None:
+            listener, uuid = self._multicast
+            listener.unregister(uuid, self.id)
+
+            self._multicast = None
+
         # Close GENA session
         await self._gena.close()
 
-    async def call(self, action: Union[str, 'Action'], args: Dict[str, Any]) -> Dict[str, Any]:
+    def _sub_update(self, values: Dict[str, str], seq: int):
+        self._apply(values)
+
+        for name in values:
+            var = self._state.get(name)
+
+            if var is not None:
+                var._emit_update(var.value)
+
+    def _sub_dropped(self, seq: int):
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.ensure_future(self._resync())
+
+    def _sub_expired(self, was: str):
+        # Lost subscription (failed renewal), while variables are still subscribed
+        sub = self._subscription
+
+        if self.state != 'up' or not self._subscribed or sub is None or not sub.expired:
+            return
+
+        if self._resync_task is None or self._resync_task.done():
+            self._logger.warning('Subscription lost, subscribing again')
+            self._resync_task = asyncio.ensure_future(self._resubscribe(sub.timeout))
+
+    async def _resync(self):
+        try:
+            await self.resync()
+
+        except Exception as err:
+            self._logger.warning(f'Unable to resync events: {err!r}')
+            await self._resubscribe()
+
+    async def _resubscribe(self, timeout: int = 3600, *, delay: float = 1, max_delay: float = 60):
+        # Retried with exponential backoff, until subscribed or no longer needed
+        while self.state == 'up' and self._subscribed:
+            try:
+                await self.subscribe(timeout=timeout or 3600)
+                return
+
+            except Exception as err:
+                self._logger.warning(f'Unable to subscribe: {err!r}, retrying in {delay:.0f}s')
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    def _invalidate(self, variables: Iterable[str]):
+        variables = set(variables)
+
+        for name in list(self.cache.ttls):
+            action = self._actions.get(name)
+
+            if action is None or any(arg.state_variable.name in variables for arg in action.results):
+                self.cache.invalidate(name)
+
+    def _apply(self, values: Dict[str, str]) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Merge evented values into the state table, emitting changed on each variable whose value differs.
+        Returns changes, by variable name (old, new).
+        """
+
+        self._invalidate(values)
+        changes = {}
+
+        for name, raw in values.items():
+            var = self._state.get(name)
+
+            if var is None:
+                continue
+
+            try:
+                value = var.type.to_python(raw)
+
+            except (TypeError, ValueError):
+                self._logger.warning(f'Invalid evented value for {name}: {raw!r}')
+                continue
+
+            old = self._values.get(name, var.default_value)
+
+            if name in self._values and old == value:
+                continue
+
+            self._values[name] = value
+            changes[name] = (old, value)
+
+        for name, (old, value) in changes.items():
+            self._state[name]._emit_changed(old, value)
+
+        return changes
+
+    async def _call(self, action: 'Action', args: Dict[str, Any], priority: int) -> Dict[str, Any]:
+        # Convert and check arguments (before touching the network)
+        signature = action.signature
+        soap_args = signature.encode(args)
+
+        # Request (over the shared keep-alive transport)
+        results = await self._soap.call(
+            self.control, self.type.urn, action.name, soap_args,
+            template=signature.template, results=signature.result_names, priority=priority
+        )
+
+        # Convert response
+        return signature.decode(results)
+
+    async def call(
+            self, action: Union[str, 'Action'], args: Dict[str, Any], *,
+            priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
         if isinstance(action, str):
             action = self.action(action)
 
-        # Convert arguments
-        soap_args = {}
+        if action.name in self.cache:
+            return await self.cache.get(action.name, args, lambda: self._call(action, args, priority))
 
-        for n, v in args.items():
-            var = action.argument(n).state_variable
-            soap_args[n] = var.type.from_python(v)
+        return await self._call(action, args, priority)
 
-        # Request
-        async with self._soap as session:
-            results = await session.call(self.control, self.type.urn, action.name, soap_args)
+    def set_cache_ttl(self, action: str, ttl: Optional[float]):
+        """
+        Cache results of the given (idempotent) action during ttl seconds, None disables the cache.
+        Cached results are invalidated by events on the related state variables.
+        """
 
-        # Convert response
-        py_resp = {}
+        if ttl is None:
+            self.cache.ttls.pop(action, None)
+            self.cache.invalidate(action)
 
-        for n, v in results.items():
-            var = action.argument(n).state_variable
-            py_resp[n] = var.type.to_python(v)
+        else:
+            self.cache.ttls[action] = ttl
 
-        return py_resp
+    def configure_soap(self, **options):
+        """
+        Replace the SOAP session used by this service, options are the ones of SOAPSession
+        (timeout, attempt_timeout, retry, hedge, hedged_actions).
+        """
 
-    async def subscribe(self, var: str, *, timeout: int = 3600) -> GENASubscription:
-        return await self._gena.subscribe(self.event_sub, var, timeout=timeout)
+        self._soap = SOAPSession(**options)
 
-    async def renew(self, sub: GENASubscription, *, timeout: Optional[int] = None) -> GENASubscription:
-        return await self._gena.renew(sub, timeout=timeout)
+    async def call_many(
+            self, calls: Iterable[Tuple[Union[str, 'Action'], Dict[str, Any]]], *,
+            concurrency: int = 4, return_exceptions: bool = False, priority: int = PRIORITY_INTERACTIVE
+    ) -> List[Dict[str, Any]]:
+        """
+        Run all calls, at most concurrency at a time, and returns their results in order.
+        Unless return_exceptions is set, the first error cancels the remaining calls.
+        """
 
-    async def unsubscribe(self, sub: GENASubscription) -> GENASubscription:
-        return await self._gena.unsubscribe(sub)
+        semaphore = asyncio.Semaphore(concurrency)
 
-    def update(self, xmld: ET.Element, xmls: ET.Element, base_url: str):
-        # Resets
-        self._actions = {}
-        self._state = {}
+        async def call(action: Union[str, 'Action'], args: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.call(action, args, priority=priority)
 
-        # Parse xml
+        tasks = [asyncio.ensure_future(call(action, args)) for action, args in calls]
+
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+        finally:
+            discard_tasks(tasks)
+
+    async def iterate(
+            self, action: Union[str, 'Action'], args: Optional[Dict[str, Any]] = None, *,
+            index: Optional[str] = None, start: int = 0, window: int = 4,
+            end_codes: Iterable[int] = ARRAY_END_CODES, priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Enumerate an index paged action (like GetGenericPortMappingEntry), yielding results in index order.
+        Up to window calls are sent ahead, enumeration stops on the first error in end_codes.
+        """
+
+        if isinstance(action, str):
+            action = self.action(action)
+
+        if index is None:
+            names = [arg.name for arg in action.parameters if arg.name.endswith('Index')]
+
+            if len(names) != 1:
+                raise ValueError(f'Unable to find index argument of {action.name}')
+
+            index = names[0]
+
+        args = args or {}
+        end_codes = set(end_codes)
+        pending = deque()
+
+        try:
+            i = start
+
+            while True:
+                while len(pending) < window:
+                    pending.append(asyncio.ensure_future(self.call(action, {**args, index: i}, priority=priority)))
+                    i += 1
+
+                try:
+                    result = await pending.popleft()
+
+                except SOAPError as err:
+                    if err.code in end_codes:
+                        return
+
+                    raise
+
+                yield result
+
+        finally:
+            discard_tasks(pending)
+
+    async def subscribe(self, *variables: str, timeout: int = 3600) -> GENASubscription:
+        """
+        Subscribe to the service events. All variables share a single subscription (events always
+        hold every evented variable), renewed automatically by the shared GENA client.
+        With a sharded GENA server, services owned by another shard can not be subscribed here
+        (raises GENAShardError): their events are handled by the process of that shard.
+        """
+
+        if not self._gena.owns(self.event_sub):
+            raise GENAShardError(self.event_sub, self._gena.owner(self.event_sub))
+
+        async with self._subscribe_lock:
+            self._subscribed.update(variables)
+
+            if self._subscription is None or self._subscription.expired:
+                self._watch(await self._gena.subscribe(self.event_sub, timeout=timeout))
+
+        return self._subscription
+
+    def _watch(self, sub: GENASubscription):
+        sub.on('update', self._sub_update)
+        sub.on('dropped', self._sub_dropped)
+        sub.on('expired', self._sub_expired)
+
+        self._subscription = sub
+
+        # Last known values (resumed subscription)
+        if sub.value:
+            self._apply(sub.value)
+
+    async def resync(self) -> Optional[GENASubscription]:
+        """
+        Replace the subscription by a new one, whose initial event holds every evented value.
+        Done automatically when the GENA server had to drop events of this service.
+        """
+
+        async with self._subscribe_lock:
+            sub, self._subscription = self._subscription, None
+
+            if sub is None:
+                return None
+
+            self._logger.info('Subscribing again to get current values')
+            self._watch(await self._gena.resubscribe(sub))
+
+        return self._subscription
+
+    def listen_multicast(self, listener: 'GENAMulticastListener', uuid: str):
+        """
+        Receive multicast events of this service (uuid is the one of its device), merged like GENA events.
+        """
+
+        listener.register(uuid, self.id, self._sub_update)
+        self._multicast = (listener, uuid)
+
+    async def renew(self, *, timeout: Optional[int] = None) -> Optional[GENASubscription]:
+        if not self.subscribed:
+            return None
+
+        return await self._gena.renew(self._subscription, timeout=timeout)
+
+    async def unsubscribe(self, *variables: str):
+        """
+        Remove the given variables (all if none given), the subscription ends with the last one.
+        """
+
+        async with self._subscribe_lock:
+            if variables:
+                self._subscribed.difference_update(variables)
+            else:
+                self._subscribed.clear()
+
+            if not self._subscribed and self._subscription is not None:
+                sub, self._subscription = self._subscription, None
+                await self._gena.unsubscribe(sub)
+
+    def update(self, xmld: ET.Element, xmls: Union[ET.Element, SCPD], base_url: str):
+        # Unchanged actions and variables are kept (with their listeners and known values)
         self._parse_xml_device(xmld, base_url)
         self._parse_xml_service(xmls)
 
@@ -185,21 +496,31 @@ class SSDPService(StateMachine):
     def state_variables(self) -> List['StateVariable']:
         return list(self._state.values())
 
+    @property
+    def subscribed(self) -> bool:
+        return self._subscription is not None and not self._subscription.expired
+
+    @property
+    def values(self) -> Mapping[str, Any]:
+        """
+        Read-only view of the last evented value of each state variable (typed)
+        """
+
+        return MappingProxyType(self._values)
+
 
 class Action:
-    def __init__(self, xml: ET.Element, service: SSDPService):
+    def __init__(self, name: str, arguments: Iterable[ArgumentDef], service: SSDPService):
         # Attributes
-        self.name = xml.find('upnp:name', XML_SERVICE_NS).text
-        self._arguments = {}  # type: Dict[str, Argument]
-
-        xal = xml.find('upnp:argumentList', XML_SERVICE_NS)
-        if xal is not None:
-            for child in xal:
-                arg = Argument(child, service)
-                self._arguments[arg.name] = arg
+        self.name = name
+        self.definition = tuple(arguments)
+        self._arguments = {
+            definition.name: Argument(definition, service) for definition in self.definition
+        }  # type: Dict[str, Argument]
 
         # - internals
         self._service = service
+        self._signature = None  # type: Optional[ActionSignature]
 
     def __repr__(self):
         return _s.blue(f'<Action: {_s.reset}{self.name}{_s.blue}>')
@@ -218,14 +539,17 @@ class Action:
         return self._arguments[name]
 
     async def call(self, **kwargs) -> Dict[str, Any]:
-        # check args
-        for n in kwargs:
-            assert n in self._arguments
-
-        # call
         return await self._service.call(self, kwargs)
 
     # Properties
+    @property
+    def signature(self) -> ActionSignature:
+        # Compiled on first use, once state variables are known
+        if self._signature is None:
+            self._signature = ActionSignature(self, self._service.type.urn)
+
+        return self._signature
+
     @property
     def arguments(self) -> List['Argument']:
         return list(self._arguments.values())
@@ -246,15 +570,15 @@ class Action:
 
 
 class Argument:
-    def __init__(self, xml: ET.Element, service: SSDPService):
+    def __init__(self, definition: ArgumentDef, service: SSDPService):
         # Attributes
-        self.name = xml.find('upnp:name', XML_SERVICE_NS).text
-        self.direction = xml.find('upnp:direction', XML_SERVICE_NS).text
-        self.retval = xml.find('upnp:retval', XML_SERVICE_NS) is not None
+        self.name = definition.name
+        self.direction = definition.direction
+        self.retval = definition.retval
 
         # - internals
         self._service = service
-        self._state_variable = xml.find('upnp:relatedStateVariable', XML_SERVICE_NS).text
+        self._state_variable = definition.state_variable
 
     def __repr__(self):
         return _s.blue(
@@ -275,35 +599,26 @@ class Argument:
 
 
 class StateVariable(EventEmitter):
-    def __init__(self, xml: ET.Element, service: SSDPService):
-        super().__init__()
-
-        # Attributes
-        self.send_events = xml.attrib.get('sendEvents', 'yes') == 'yes'
-        self.multicast = xml.attrib.get('multicast', 'no') == 'yes'
-
-        self.name = xml.find('upnp:name', XML_SERVICE_NS).text
-        self._default_value = xml_text(xml.find('upnp:defaultValue', XML_SERVICE_NS))
+    """
+    class StateVariable:
+    State variable of a service, its value is kept up to date by the service's GENA events.
 
-        xtype = xml.find('upnp:dataType', XML_SERVICE_NS)
-        self.type = get_type(xtype.attrib.get('type', xtype.text))
+    Events:
+    - update (value: Any)          : each time an event contains the variable
+    - changed (old: Any, new: Any) : each time an event changes the value of the variable
+    """
 
-        xavl = xml.find('upnp:allowedValueList', XML_SERVICE_NS)
-        if xavl is not None:
-            self.allowed_values = [
-                self.type.to_python(child.text)
-                for child in xavl or None
-            ]
-        else:
-            self.allowed_values = None
+    def __init__(self, definition: StateVariableDef, service: SSDPService):
+        super().__init__()
 
-        xavr = xml.find('upnp:allowedValueRange', XML_SERVICE_NS)
-        self.allowed_range = None if xavr is None else ValueRange(xavr, self.type)
+        # Attributes
+        self.name = definition.name
+        self._define(definition)
 
         # - internals
         self._service = service
-        self._subscription = None    # type: Optional[GENASubscription]
-        self.__renew_handler = None  # type: Optional[asyncio.Task]
+        self._emit_update = partial(self.emit, 'update')
+        self._emit_changed = partial(self.emit, 'changed')
 
     def __repr__(self):
         return _s.blue(
@@ -311,66 +626,74 @@ class StateVariable(EventEmitter):
         )
 
     # Methods
-    def _sub_update(self, value: str, seq: int):
-        self.emit('update', self.type.to_python(value))
+    def _define(self, definition: StateVariableDef):
+        self.definition = definition
+        self.send_events = definition.send_events
+        self.multicast = definition.multicast
+        self.type = get_type(definition.data_type)
 
-    def _sub_expired(self):
-        if self.__renew_handler is not None:
-            self.__renew_handler.cancel()
+        try:
+            self.default_value = self.type.to_python(definition.default_value)
 
-    async def _renew(self):
-        await self._service.renew(self._subscription)
+        except (TypeError, ValueError):
+            self.default_value = None
 
-        delay = math.floor(self._subscription.timeout * 0.8)
-        self.__renew_handler = call_later(delay, self._renew)
+        if definition.allowed_values is not None:
+            self.allowed_values = [self.type.to_python(value) for value in definition.allowed_values]
+        else:
+            self.allowed_values = None
 
-    async def subscribe(self, timeout: int = 3600):
-        if self.subscribed:
-            return
+        if definition.allowed_range is not None:
+            self.allowed_range = ValueRange(*definition.allowed_range, stype=self.type)
+        else:
+            self.allowed_range = None
 
-        # Subscribe
-        sub = await self._service.subscribe(self.name, timeout=timeout)
-        sub.on('update', self._sub_update)
-        sub.on('expired', self._sub_expired)
+    def coalesce(self, *, window: float = 0, min_interval: float = 0, max_delay: Optional[float] = None):
+        """
+        Coalesce update and changed events of this variable, for all its listeners (see Coalescer).
+        Coalesced changed events hold the first old value and the latest new one.
+        Without arguments, events are emitted as they come.
+        """
 
-        self._subscription = sub
+        for emitter in (self._emit_update, self._emit_changed):
+            if isinstance(emitter, Coalescer):
+                emitter.flush()
 
-        # Automatic renew
-        if timeout > 0:
-            delay = math.floor(timeout * 0.8)
-            self.__renew_handler = call_later(delay, self._renew)
+        if not window and not min_interval and max_delay is None:
+            self._emit_update = partial(self.emit, 'update')
+            self._emit_changed = partial(self.emit, 'changed')
+
+        else:
+            policy = dict(window=window, min_interval=min_interval, max_delay=max_delay)
+
+            self._emit_update = Coalescer(partial(self.emit, 'update'), **policy)
+            self._emit_changed = Coalescer(partial(self.emit, 'changed'), merge=merge_changes, **policy)
+
+    async def subscribe(self, timeout: int = 3600):
+        # Shared with the other variables of the service
+        await self._service.subscribe(self.name, timeout=timeout)
 
     async def unsubscribe(self):
         if not self.subscribed:
             return
 
-        # Unsubscribe
-        await self._service.unsubscribe(self._subscription)
+        await self._service.unsubscribe(self.name)
 
     # Property
-    @property
-    def default_value(self):
-        return self.type.to_python(self._default_value)
-
     @property
     def subscribed(self):
-        return self._subscription is not None and not self._subscription.expired
+        return self._service.subscribed and self.name in self._service._subscribed
 
     @property
     def value(self):
-        if self._subscription is None:
-            return self.default_value
-
-        return self.type.to_python(self._subscription.value[self.name])
+        return self._service._values.get(self.name, self.default_value)
 
 
 class ValueRange:
-    def __init__(self, xml: ET.Element, stype: SSDPType):
-        self.minimum = stype.from_python(xml.find('upnp:minimum', XML_SERVICE_NS).text)
-        self.maximum = stype.from_python(xml.find('upnp:maximum', XML_SERVICE_NS).text)
-
-        step = xml_text(xml.find('upnp:step', XML_SERVICE_NS))
-        self.step = stype.from_python(step)
+    def __init__(self, minimum: str, maximum: str, step: Optional[str] = None, *, stype: SSDPType):
+        self.minimum = stype.to_python(minimum)
+        self.maximum = stype.to_python(maximum)
+        self.step = None if step is None else stype.to_python(step)
 
     def __repr__(self):
         if self.step is not None:
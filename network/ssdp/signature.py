@@ -0,0 +1,124 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from network.soap import SOAPTemplate, compile_template
+
+if TYPE_CHECKING:
+    from .service import Action, Argument
+
+
+# Classes
+class ArgumentSignature:
+    """
+    class ArgumentSignature:
+    Converter and constraints of an argument, resolved once from its related state variable.
+    """
+
+    __slots__ = ('name', 'type', 'to_python', 'from_python', 'coerce', 'allowed_values', 'minimum', 'maximum', 'step')
+
+    def __init__(self, arg: 'Argument'):
+        var = arg.state_variable
+
+        # Attributes
+        self.name = arg.name
+        self.type = var.type
+
+        # - bound converters
+        self.to_python = var.type.to_python
+        self.from_python = var.type.from_python
+        self.coerce = var.type.coerce
+
+        # - constraints
+        self.allowed_values = None if var.allowed_values is None else frozenset(var.allowed_values)
+
+        rng = var.allowed_range
+        self.minimum = None if rng is None else rng.minimum
+        self.maximum = None if rng is None else rng.maximum
+        self.step = None if rng is None else rng.step
+
+    def __repr__(self):
+        return f'<ArgumentSignature: {self.type} {self.name}>'
+
+    # Methods
+    def encode(self, value: Any) -> str:
+        value = self.coerce(value)
+
+        if self.allowed_values is not None and value not in self.allowed_values:
+            raise ValueError(f'{self.name}: {value!r} is not an allowed value')
+
+        if self.minimum is not None:
+            if not self.minimum <= value <= self.maximum:
+                raise ValueError(f'{self.name}: {value!r} is out of range [{self.minimum}, {self.maximum}]')
+
+            if self.step and (value - self.minimum) % self.step:
+                raise ValueError(f'{self.name}: {value!r} does not match step {self.step}')
+
+        return self.from_python(value)
+
+    def decode(self, value: Optional[str]) -> Any:
+        if value is None:
+            return None
+
+        return self.to_python(value)
+
+
+class ActionSignature:
+    """
+    class ActionSignature:
+    Ordered in and out arguments of an action, with their converters and constraints.
+    Calls are converted and checked locally, bad arguments never reach the device.
+    """
+
+    def __init__(self, action: 'Action', service_type: str):
+        # Attributes
+        self.name = action.name
+        self.parameters = tuple(ArgumentSignature(arg) for arg in action.parameters)
+        self.results = tuple(ArgumentSignature(arg) for arg in action.results)
+
+        self.parameter_names = tuple(arg.name for arg in self.parameters)
+        self.result_names = tuple(arg.name for arg in self.results)
+
+        # - internals
+        self._results = {arg.name: arg for arg in self.results}  # type: Dict[str, ArgumentSignature]
+        self._template = compile_template(service_type, self.name, self.parameter_names)
+
+    def __repr__(self):
+        return f'<ActionSignature: {self.name}({", ".join(self.parameter_names)}) -> ({", ".join(self.result_names)})>'
+
+    # Methods
+    def encode(self, args: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Convert and check arguments, in declaration order.
+        Raises TypeError on unknown or missing arguments, and ValueError on invalid values.
+        """
+
+        if len(args) != len(self.parameters):
+            unknown = set(args).difference(self.parameter_names)
+
+            if unknown:
+                raise TypeError(f'{self.name}() got unexpected arguments: {", ".join(sorted(unknown))}')
+
+        soap_args = {}
+
+        for arg in self.parameters:
+            try:
+                value = args[arg.name]
+            except KeyError:
+                raise TypeError(f'{self.name}() missing argument: {arg.name}') from None
+
+            soap_args[arg.name] = arg.encode(value)
+
+        return soap_args
+
+    def decode(self, results: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        decoded = {}
+
+        for name, value in results.items():
+            arg = self._results.get(name)
+            decoded[name] = value if arg is None else arg.decode(value)
+
+        return decoded
+
+    # Properties
+    @property
+    def template(self) -> SOAPTemplate:
+        return self._template
@@ -0,0 +1,487 @@
+from typing import Dict, Optional, Tuple, Union
+
+from .scpd import SCPD, ArgumentDef, StateVariableDef
+from .urn import URN
+
+
+# Utils
+def _args(*specs: str) -> Tuple[ArgumentDef, ...]:
+    arguments = []
+
+    for spec in specs:
+        direction, name, state_variable = spec.split()
+        arguments.append(ArgumentDef(name, direction, state_variable))
+
+    return tuple(arguments)
+
+
+def _var(
+        name: str, data_type: str = 'string', *values: str,
+        events: bool = False, default: Optional[str] = None
+) -> StateVariableDef:
+    return StateVariableDef(name, data_type, default, values or None, send_events=events)
+
+
+def _scpd(actions: Dict[str, Tuple[ArgumentDef, ...]], *variables: StateVariableDef) -> SCPD:
+    return SCPD(actions, {var.name: var for var in variables})
+
+
+# WAN connections
+_CONNECTION_STATUS = (
+    'Unconfigured', 'Connecting', 'Connected', 'PendingDisconnect', 'Disconnecting', 'Disconnected'
+)
+
+_PORT_MAPPING_VARIABLES = (
+    _var('ExternalIPAddress', events=True),
+    _var('PortMappingNumberOfEntries', 'ui2', events=True),
+    _var('PortMappingEnabled', 'boolean'),
+    _var('PortMappingLeaseDuration', 'ui4'),
+    _var('RemoteHost'),
+    _var('ExternalPort', 'ui2'),
+    _var('InternalPort', 'ui2'),
+    _var('PortMappingProtocol', 'string', 'TCP', 'UDP'),
+    _var('InternalClient'),
+    _var('PortMappingDescription'),
+)
+
+_PORT_MAPPING_ACTIONS = {
+    'GetGenericPortMappingEntry': _args(
+        'in NewPortMappingIndex PortMappingNumberOfEntries',
+        'out NewRemoteHost RemoteHost',
+        'out NewExternalPort ExternalPort',
+        'out NewProtocol PortMappingProtocol',
+        'out NewInternalPort InternalPort',
+        'out NewInternalClient InternalClient',
+        'out NewEnabled PortMappingEnabled',
+        'out NewPortMappingDescription PortMappingDescription',
+        'out NewLeaseDuration PortMappingLeaseDuration',
+    ),
+    'GetSpecificPortMappingEntry': _args(
+        'in NewRemoteHost RemoteHost',
+        'in NewExternalPort ExternalPort',
+        'in NewProtocol PortMappingProtocol',
+        'out NewInternalPort InternalPort',
+        'out NewInternalClient InternalClient',
+        'out NewEnabled PortMappingEnabled',
+        'out NewPortMappingDescription PortMappingDescription',
+        'out NewLeaseDuration PortMappingLeaseDuration',
+    ),
+    'AddPortMapping': _args(
+        'in NewRemoteHost RemoteHost',
+        'in NewExternalPort ExternalPort',
+        'in NewProtocol PortMappingProtocol',
+        'in NewInternalPort InternalPort',
+        'in NewInternalClient InternalClient',
+        'in NewEnabled PortMappingEnabled',
+        'in NewPortMappingDescription PortMappingDescription',
+        'in NewLeaseDuration PortMappingLeaseDuration',
+    ),
+    'DeletePortMapping': _args(
+        'in NewRemoteHost RemoteHost',
+        'in NewExternalPort ExternalPort',
+        'in NewProtocol PortMappingProtocol',
+    ),
+    'GetExternalIPAddress': _args('out NewExternalIPAddress ExternalIPAddress'),
+}
+
+_CONNECTION_ACTIONS = {
+    'SetConnectionType': _args('in NewConnectionType ConnectionType'),
+    'GetConnectionTypeInfo': _args(
+        'out NewConnectionType ConnectionType',
+        'out NewPossibleConnectionTypes PossibleConnectionTypes',
+    ),
+    'RequestConnection': (),
+    'RequestTermination': (),
+    'ForceTermination': (),
+    'SetAutoDisconnectTime': _args('in NewAutoDisconnectTime AutoDisconnectTime'),
+    'SetIdleDisconnectTime': _args('in NewIdleDisconnectTime IdleDisconnectTime'),
+    'SetWarnDisconnectDelay': _args('in NewWarnDisconnectDelay WarnDisconnectDelay'),
+    'GetStatusInfo': _args(
+        'out NewConnectionStatus ConnectionStatus',
+        'out NewLastConnectionError LastConnectionError',
+        'out NewUptime Uptime',
+    ),
+    'GetAutoDisconnectTime': _args('out NewAutoDisconnectTime AutoDisconnectTime'),
+    'GetIdleDisconnectTime': _args('out NewIdleDisconnectTime IdleDisconnectTime'),
+    'GetWarnDisconnectDelay': _args('out NewWarnDisconnectDelay WarnDisconnectDelay'),
+    'GetNATRSIPStatus': _args(
+        'out NewRSIPAvailable RSIPAvailable',
+        'out NewNATEnabled NATEnabled',
+    ),
+}
+
+_CONNECTION_VARIABLES = (
+    _var('ConnectionType'),
+    _var('PossibleConnectionTypes', events=True),
+    _var('ConnectionStatus', 'string', *_CONNECTION_STATUS, events=True),
+    _var('Uptime', 'ui4'),
+    _var('LastConnectionError'),
+    _var('AutoDisconnectTime', 'ui4'),
+    _var('IdleDisconnectTime', 'ui4'),
+    _var('WarnDisconnectDelay', 'ui4'),
+    _var('RSIPAvailable', 'boolean'),
+    _var('NATEnabled', 'boolean'),
+)
+
+WAN_IP_CONNECTION_1 = _scpd(
+    {**_CONNECTION_ACTIONS, **_PORT_MAPPING_ACTIONS},
+    *_CONNECTION_VARIABLES, *_PORT_MAPPING_VARIABLES
+)
+
+WAN_IP_CONNECTION_2 = _scpd(
+    {
+        **_CONNECTION_ACTIONS, **_PORT_MAPPING_ACTIONS,
+        'DeletePortMappingRange': _args(
+            'in NewStartPort ExternalPort',
+            'in NewEndPort ExternalPort',
+            'in NewProtocol PortMappingProtocol',
+            'in NewManage A_ARG_TYPE_Manage',
+        ),
+        'GetListOfPortMappings': _args(
+            'in NewStartPort ExternalPort',
+            'in NewEndPort ExternalPort',
+            'in NewProtocol PortMappingProtocol',
+            'in NewManage A_ARG_TYPE_Manage',
+            'in NewNumberOfPorts PortMappingNumberOfEntries',
+            'out NewPortListing A_ARG_TYPE_PortListing',
+        ),
+        'AddAnyPortMapping': _args(
+            'in NewRemoteHost RemoteHost',
+            'in NewExternalPort ExternalPort',
+            'in NewProtocol PortMappingProtocol',
+            'in NewInternalPort InternalPort',
+            'in NewInternalClient InternalClient',
+            'in NewEnabled PortMappingEnabled',
+            'in NewPortMappingDescription PortMappingDescription',
+            'in NewLeaseDuration PortMappingLeaseDuration',
+            'out NewReservedPort ExternalPort',
+        ),
+    },
+    *_CONNECTION_VARIABLES, *_PORT_MAPPING_VARIABLES,
+    _var('SystemUpdateID', 'ui4', events=True),
+    _var('A_ARG_TYPE_Manage', 'boolean'),
+    _var('A_ARG_TYPE_PortListing'),
+)
+
+WAN_PPP_CONNECTION_1 = _scpd(
+    {
+        **_CONNECTION_ACTIONS,
+        'ConfigureConnection': _args('in NewUserName UserName', 'in NewPassword Password'),
+        'GetLinkLayerMaxBitRates': _args(
+            'out NewUpstreamMaxBitRate UpstreamMaxBitRate',
+            'out NewDownstreamMaxBitRate DownstreamMaxBitRate',
+        ),
+        'GetPPPEncryptionProtocol': _args('out NewPPPEncryptionProtocol PPPEncryptionProtocol'),
+        'GetPPPCompressionProtocol': _args('out NewPPPCompressionProtocol PPPCompressionProtocol'),
+        'GetPPPAuthenticationProtocol': _args('out NewPPPAuthenticationProtocol PPPAuthenticationProtocol'),
+        'GetUserName': _args('out NewUserName UserName'),
+        'GetPassword': _args('out NewPassword Password'),
+        **_PORT_MAPPING_ACTIONS,
+    },
+    *_CONNECTION_VARIABLES, *_PORT_MAPPING_VARIABLES,
+    _var('UpstreamMaxBitRate', 'ui4'),
+    _var('DownstreamMaxBitRate', 'ui4'),
+    _var('UserName'),
+    _var('Password'),
+    _var('PPPEncryptionProtocol'),
+    _var('PPPCompressionProtocol'),
+    _var('PPPAuthenticationProtocol'),
+)
+
+WAN_COMMON_INTERFACE_CONFIG_1 = _scpd(
+    {
+        'SetEnabledForInternet': _args('in NewEnabledForInternet EnabledForInternet'),
+        'GetEnabledForInternet': _args('out NewEnabledForInternet EnabledForInternet'),
+        'GetCommonLinkProperties': _args(
+            'out NewWANAccessType WANAccessType',
+            'out NewLayer1UpstreamMaxBitRate Layer1UpstreamMaxBitRate',
+            'out NewLayer1DownstreamMaxBitRate Layer1DownstreamMaxBitRate',
+            'out NewPhysicalLinkStatus PhysicalLinkStatus',
+        ),
+        'GetWANAccessProvider': _args('out NewWANAccessProvider WANAccessProvider'),
+        'GetMaximumActiveConnections': _args('out NewMaximumActiveConnections MaximumActiveConnections'),
+        'GetTotalBytesSent': _args('out NewTotalBytesSent TotalBytesSent'),
+        'GetTotalBytesReceived': _args('out NewTotalBytesReceived TotalBytesReceived'),
+        'GetTotalPacketsSent': _args('out NewTotalPacketsSent TotalPacketsSent'),
+        'GetTotalPacketsReceived': _args('out NewTotalPacketsReceived TotalPacketsReceived'),
+        'GetActiveConnection': _args(
+            'in NewActiveConnectionIndex NumberOfActiveConnections',
+            'out NewActiveConnDeviceContainer ActiveConnectionDeviceContainer',
+            'out NewActiveConnectionServiceID ActiveConnectionServiceID',
+        ),
+    },
+    _var('WANAccessType'),
+    _var('Layer1UpstreamMaxBitRate', 'ui4'),
+    _var('Layer1DownstreamMaxBitRate', 'ui4'),
+    _var('PhysicalLinkStatus', events=True),
+    _var('WANAccessProvider'),
+    _var('MaximumActiveConnections', 'ui2'),
+    _var('NumberOfActiveConnections', 'ui2'),
+    _var('ActiveConnectionDeviceContainer'),
+    _var('ActiveConnectionServiceID'),
+    _var('TotalBytesSent', 'ui4'),
+    _var('TotalBytesReceived', 'ui4'),
+    _var('TotalPacketsSent', 'ui4'),
+    _var('TotalPacketsReceived', 'ui4'),
+    _var('EnabledForInternet', 'boolean', events=True),
+)
+
+LAYER3_FORWARDING_1 = _scpd(
+    {
+        'SetDefaultConnectionService': _args('in NewDefaultConnectionService DefaultConnectionService'),
+        'GetDefaultConnectionService': _args('out NewDefaultConnectionService DefaultConnectionService'),
+    },
+    _var('DefaultConnectionService', events=True),
+)
+
+# AV
+CONNECTION_MANAGER_1 = _scpd(
+    {
+        'GetProtocolInfo': _args('out Source SourceProtocolInfo', 'out Sink SinkProtocolInfo'),
+        'PrepareForConnection': _args(
+            'in RemoteProtocolInfo A_ARG_TYPE_ProtocolInfo',
+            'in PeerConnectionManager A_ARG_TYPE_ConnectionManager',
+            'in PeerConnectionID A_ARG_TYPE_ConnectionID',
+            'in Direction A_ARG_TYPE_Direction',
+            'out ConnectionID A_ARG_TYPE_ConnectionID',
+            'out AVTransportID A_ARG_TYPE_AVTransportID',
+            'out RcsID A_ARG_TYPE_RcsID',
+        ),
+        'ConnectionComplete': _args('in ConnectionID A_ARG_TYPE_ConnectionID'),
+        'GetCurrentConnectionIDs': _args('out ConnectionIDs CurrentConnectionIDs'),
+        'GetCurrentConnectionInfo': _args(
+            'in ConnectionID A_ARG_TYPE_ConnectionID',
+            'out RcsID A_ARG_TYPE_RcsID',
+            'out AVTransportID A_ARG_TYPE_AVTransportID',
+            'out ProtocolInfo A_ARG_TYPE_ProtocolInfo',
+            'out PeerConnectionManager A_ARG_TYPE_ConnectionManager',
+            'out PeerConnectionID A_ARG_TYPE_ConnectionID',
+            'out Direction A_ARG_TYPE_Direction',
+            'out Status A_ARG_TYPE_ConnectionStatus',
+        ),
+    },
+    _var('SourceProtocolInfo', events=True),
+    _var('SinkProtocolInfo', events=True),
+    _var('CurrentConnectionIDs', events=True),
+    _var(
+        'A_ARG_TYPE_ConnectionStatus', 'string',
+        'OK', 'ContentFormatMismatch', 'InsufficientBandwidth', 'UnreliableChannel', 'Unknown'
+    ),
+    _var('A_ARG_TYPE_ConnectionManager'),
+    _var('A_ARG_TYPE_Direction', 'string', 'Input', 'Output'),
+    _var('A_ARG_TYPE_ProtocolInfo'),
+    _var('A_ARG_TYPE_ConnectionID', 'i4'),
+    _var('A_ARG_TYPE_AVTransportID', 'i4'),
+    _var('A_ARG_TYPE_RcsID', 'i4'),
+)
+
+_BROWSE_RESULTS = (
+    'out Result A_ARG_TYPE_Result',
+    'out NumberReturned A_ARG_TYPE_Count',
+    'out TotalMatches A_ARG_TYPE_Count',
+    'out UpdateID A_ARG_TYPE_UpdateID',
+)
+
+CONTENT_DIRECTORY_1 = _scpd(
+    {
+        'GetSearchCapabilities': _args('out SearchCaps SearchCapabilities'),
+        'GetSortCapabilities': _args('out SortCaps SortCapabilities'),
+        'GetSystemUpdateID': _args('out Id SystemUpdateID'),
+        'Browse': _args(
+            'in ObjectID A_ARG_TYPE_ObjectID',
+            'in BrowseFlag A_ARG_TYPE_BrowseFlag',
+            'in Filter A_ARG_TYPE_Filter',
+            'in StartingIndex A_ARG_TYPE_Index',
+            'in RequestedCount A_ARG_TYPE_Count',
+            'in SortCriteria A_ARG_TYPE_SortCriteria',
+            *_BROWSE_RESULTS
+        ),
+        'Search': _args(
+            'in ContainerID A_ARG_TYPE_ObjectID',
+            'in SearchCriteria A_ARG_TYPE_SearchCriteria',
+            'in Filter A_ARG_TYPE_Filter',
+            'in StartingIndex A_ARG_TYPE_Index',
+            'in RequestedCount A_ARG_TYPE_Count',
+            'in SortCriteria A_ARG_TYPE_SortCriteria',
+            *_BROWSE_RESULTS
+        ),
+        'CreateObject': _args(
+            'in ContainerID A_ARG_TYPE_ObjectID',
+            'in Elements A_ARG_TYPE_Result',
+            'out ObjectID A_ARG_TYPE_ObjectID',
+            'out Result A_ARG_TYPE_Result',
+        ),
+        'DestroyObject': _args('in ObjectID A_ARG_TYPE_ObjectID'),
+        'UpdateObject': _args(
+            'in ObjectID A_ARG_TYPE_ObjectID',
+            'in CurrentTagValue A_ARG_TYPE_TagValueList',
+            'in NewTagValue A_ARG_TYPE_TagValueList',
+        ),
+    },
+    _var('TransferIDs', events=True),
+    _var('A_ARG_TYPE_ObjectID'),
+    _var('A_ARG_TYPE_Result'),
+    _var('A_ARG_TYPE_SearchCriteria'),
+    _var('A_ARG_TYPE_BrowseFlag', 'string', 'BrowseMetadata', 'BrowseDirectChildren'),
+    _var('A_ARG_TYPE_Filter'),
+    _var('A_ARG_TYPE_SortCriteria'),
+    _var('A_ARG_TYPE_Index', 'ui4'),
+    _var('A_ARG_TYPE_Count', 'ui4'),
+    _var('A_ARG_TYPE_UpdateID', 'ui4'),
+    _var('A_ARG_TYPE_TagValueList'),
+    _var('SearchCapabilities'),
+    _var('SortCapabilities'),
+    _var('SystemUpdateID', 'ui4', events=True),
+    _var('ContainerUpdateIDs', events=True),
+)
+
+
+def _instance_args(*specs: str) -> Tuple[ArgumentDef, ...]:
+    return _args('in InstanceID A_ARG_TYPE_InstanceID', *specs)
+
+
+def _channel_args(*specs: str) -> Tuple[ArgumentDef, ...]:
+    return _instance_args('in Channel A_ARG_TYPE_Channel', *specs)
+
+
+RENDERING_CONTROL_1 = _scpd(
+    {
+        'ListPresets': _instance_args('out CurrentPresetNameList PresetNameList'),
+        'SelectPreset': _instance_args('in PresetName A_ARG_TYPE_PresetName'),
+        'GetBrightness': _instance_args('out CurrentBrightness Brightness'),
+        'SetBrightness': _instance_args('in DesiredBrightness Brightness'),
+        'GetContrast': _instance_args('out CurrentContrast Contrast'),
+        'SetContrast': _instance_args('in DesiredContrast Contrast'),
+        'GetMute': _channel_args('out CurrentMute Mute'),
+        'SetMute': _channel_args('in DesiredMute Mute'),
+        'GetVolume': _channel_args('out CurrentVolume Volume'),
+        'SetVolume': _channel_args('in DesiredVolume Volume'),
+        'GetVolumeDB': _channel_args('out CurrentVolume VolumeDB'),
+        'SetVolumeDB': _channel_args('in DesiredVolume VolumeDB'),
+        'GetVolumeDBRange': _channel_args('out MinValue VolumeDB', 'out MaxValue VolumeDB'),
+        'GetLoudness': _channel_args('out CurrentLoudness Loudness'),
+        'SetLoudness': _channel_args('in DesiredLoudness Loudness'),
+    },
+    _var('PresetNameList'),
+    _var('LastChange', events=True),
+    _var('Brightness', 'ui2'),
+    _var('Contrast', 'ui2'),
+    _var('Mute', 'boolean'),
+    _var('Volume', 'ui2'),
+    _var('VolumeDB', 'i2'),
+    _var('Loudness', 'boolean'),
+    _var('A_ARG_TYPE_Channel'),
+    _var('A_ARG_TYPE_InstanceID', 'ui4'),
+    _var('A_ARG_TYPE_PresetName'),
+)
+
+AV_TRANSPORT_1 = _scpd(
+    {
+        'SetAVTransportURI': _instance_args(
+            'in CurrentURI AVTransportURI',
+            'in CurrentURIMetaData AVTransportURIMetaData',
+        ),
+        'SetNextAVTransportURI': _instance_args(
+            'in NextURI NextAVTransportURI',
+            'in NextURIMetaData NextAVTransportURIMetaData',
+        ),
+        'GetMediaInfo': _instance_args(
+            'out NrTracks NumberOfTracks',
+            'out MediaDuration CurrentMediaDuration',
+            'out CurrentURI AVTransportURI',
+            'out CurrentURIMetaData AVTransportURIMetaData',
+            'out NextURI NextAVTransportURI',
+            'out NextURIMetaData NextAVTransportURIMetaData',
+            'out PlayMedium PlaybackStorageMedium',
+            'out RecordMedium RecordStorageMedium',
+            'out WriteStatus RecordMediumWriteStatus',
+        ),
+        'GetTransportInfo': _instance_args(
+            'out CurrentTransportState TransportState',
+            'out CurrentTransportStatus TransportStatus',
+            'out CurrentSpeed TransportPlaySpeed',
+        ),
+        'GetPositionInfo': _instance_args(
+            'out Track CurrentTrack',
+            'out TrackDuration CurrentTrackDuration',
+            'out TrackMetaData CurrentTrackMetaData',
+            'out TrackURI CurrentTrackURI',
+            'out RelTime RelativeTimePosition',
+            'out AbsTime AbsoluteTimePosition',
+            'out RelCount RelativeCounterPosition',
+            'out AbsCount AbsoluteCounterPosition',
+        ),
+        'GetDeviceCapabilities': _instance_args(
+            'out PlayMedia PossiblePlaybackStorageMedia',
+            'out RecMedia PossibleRecordStorageMedia',
+            'out RecQualityModes PossibleRecordQualityModes',
+        ),
+        'GetTransportSettings': _instance_args(
+            'out PlayMode CurrentPlayMode',
+            'out RecQualityMode CurrentRecordQualityMode',
+        ),
+        'Stop': _instance_args(),
+        'Play': _instance_args('in Speed TransportPlaySpeed'),
+        'Pause': _instance_args(),
+        'Seek': _instance_args('in Unit A_ARG_TYPE_SeekMode', 'in Target A_ARG_TYPE_SeekTarget'),
+        'Next': _instance_args(),
+        'Previous': _instance_args(),
+        'SetPlayMode': _instance_args('in NewPlayMode CurrentPlayMode'),
+        'GetCurrentTransportActions': _instance_args('out Actions CurrentTransportActions'),
+    },
+    _var('TransportState'),
+    _var('TransportStatus'),
+    _var('PlaybackStorageMedium'),
+    _var('RecordStorageMedium'),
+    _var('PossiblePlaybackStorageMedia'),
+    _var('PossibleRecordStorageMedia'),
+    _var('CurrentPlayMode', default='NORMAL'),
+    _var('TransportPlaySpeed', default='1'),
+    _var('RecordMediumWriteStatus'),
+    _var('CurrentRecordQualityMode'),
+    _var('PossibleRecordQualityModes'),
+    _var('NumberOfTracks', 'ui4'),
+    _var('CurrentTrack', 'ui4'),
+    _var('CurrentTrackDuration'),
+    _var('CurrentMediaDuration'),
+    _var('CurrentTrackMetaData'),
+    _var('CurrentTrackURI'),
+    _var('AVTransportURI'),
+    _var('AVTransportURIMetaData'),
+    _var('NextAVTransportURI'),
+    _var('NextAVTransportURIMetaData'),
+    _var('RelativeTimePosition'),
+    _var('AbsoluteTimePosition'),
+    _var('RelativeCounterPosition', 'i4'),
+    _var('AbsoluteCounterPosition', 'i4'),
+    _var('CurrentTransportActions'),
+    _var('LastChange', events=True),
+    _var(
+        'A_ARG_TYPE_SeekMode', 'string',
+        'ABS_TIME', 'REL_TIME', 'ABS_COUNT', 'REL_COUNT', 'TRACK_NR', 'CHANNEL_FREQ', 'TAPE-INDEX', 'FRAME'
+    ),
+    _var('A_ARG_TYPE_SeekTarget'),
+    _var('A_ARG_TYPE_InstanceID', 'ui4'),
+)
+
+# Constants
+STANDARD_SCPDS = {
+    'urn:schemas-upnp-org:service:WANIPConnection:1': WAN_IP_CONNECTION_1,
+    'urn:schemas-upnp-org:service:WANIPConnection:2': WAN_IP_CONNECTION_2,
+    'urn:schemas-upnp-org:service:WANPPPConnection:1': WAN_PPP_CONNECTION_1,
+    'urn:schemas-upnp-org:service:WANCommonInterfaceConfig:1': WAN_COMMON_INTERFACE_CONFIG_1,
+    'urn:schemas-upnp-org:service:Layer3Forwarding:1': LAYER3_FORWARDING_1,
+    'urn:schemas-upnp-org:service:ContentDirectory:1': CONTENT_DIRECTORY_1,
+    'urn:schemas-upnp-org:service:ConnectionManager:1': CONNECTION_MANAGER_1,
+    'urn:schemas-upnp-org:service:RenderingControl:1': RENDERING_CONTROL_1,
+    'urn:schemas-upnp-org:service:AVTransport:1': AV_TRANSPORT_1,
+}  # type: Dict[str, SCPD]
+
+
+def get_standard_scpd(service_type: Union[str, URN]) -> Optional[SCPD]:
+    """
+    Bundled description of a standard service type. Only closed value lists are included,
+    so vendor extensions are not rejected locally.
+    """
+
+    return STANDARD_SCPDS.get(str(service_type))
@@ -1,39 +1,78 @@
 import asyncio
 import itertools
 import logging
+import weakref
 
-from network.base.emitter import EventEmitter
+from network.base.emitter import EventEmitter, SerialDispatcher
+from network.soap import PRIORITY_BACKGROUND
 from network.typing import Address
-from typing import Dict, Iterable, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 from weakref import WeakValueDictionary
 
 from .device import SSDPRemoteDevice
 from .message import SSDPMessage
 from .server import SSDPServer
+from .service import SSDPService, discard_tasks
+from .stubs import StubCache
 from .urn import URN
 from .xml import log_xml_errors, get_device_xml
 
+if TYPE_CHECKING:
+    from network.gena import GENAMulticastListener
+
 # Logging
 logger = logging.getLogger("ssdp")
 
 
-# Class
+# Classes
+class FanOutResult(NamedTuple):
+    device: SSDPRemoteDevice
+    service: SSDPService
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    # Properties
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class SSDPStore(EventEmitter):
     """
     Class SSDPStore:
     Collect and manages SSDP remote devices.
 
+    Device and service handlers can be run through a SerialDispatcher, so each of them
+    handles its events in order while the global amount of running handlers stays bounded.
+
+    With trust_standard, services of standard types are built from bundled descriptions,
+    without waiting for their SCPD (which is checked afterwards).
+
+    With multicast, services holding multicast state variables receive their events through
+    the given listener (no subscription needed).
+
+    With stubs, service descriptions go through the given StubCache: a description already seen
+    (same hash, even by a previous run) is loaded from its generated module instead of being parsed.
+
     Events:
     - new (device: SSDPRemoteDevice) : each time a new device is detected
     - up (device: SSDPRemoteDevice, msg: SSDPMessage) : each time a device is activated
     - down (device: SSDPRemoteDevice) : each time a device is unactivated
     """
 
-    def __init__(self):
+    def __init__(
+            self, *,
+            dispatcher: Optional[SerialDispatcher] = None, trust_standard: bool = False,
+            multicast: Optional['GENAMulticastListener'] = None, stubs: Optional[StubCache] = None
+    ):
         super().__init__()
 
         # Attributes
         self._loop = asyncio.get_event_loop()
+        self._dispatcher = dispatcher
+        self._trust_standard = trust_standard
+        self._multicast = multicast
+        self._stubs = stubs
 
         # - data
         self._tasks = {}    # type: Dict[str, asyncio.Task]
@@ -71,7 +110,11 @@ class SSDPStore(EventEmitter):
         assert msg.location is not None, f'Invalid message: no LOCATION header ({msg.kind} from {addr[0]})'
 
         xml, uuid = await get_device_xml(msg.location)
-        device = SSDPRemoteDevice(msg, xml, addr[0])
+        device = SSDPRemoteDevice(
+            msg, xml, addr[0],
+            dispatcher=self._dispatcher, trust_standard=self._trust_standard, multicast=self._multicast,
+            stubs=self._stubs
+        )
         self._devices[uuid] = device
 
         # Connect events
@@ -111,8 +154,23 @@ class SSDPStore(EventEmitter):
             obj.on('response', self.on_adv_message)
 
         elif isinstance(obj, SSDPRemoteDevice):
-            obj.on('up', lambda msg, was: self.on_up(obj, msg))
-            obj.on('down', lambda was: self.on_down(obj))
+            # Devices must not keep the store alive
+            ref = weakref.ref(self)
+
+            def on_up(msg: SSDPMessage, was: str):
+                store = ref()
+
+                if store is not None:
+                    store.on_up(obj, msg)
+
+            def on_down(was: str):
+                store = ref()
+
+                if store is not None:
+                    store.on_down(obj)
+
+            obj.on('up', on_up)
+            obj.on('down', on_down)
 
     def get(self, uuid: str) -> Optional[SSDPRemoteDevice]:
         return self._devices.get(uuid) or self._sub_devices.get(uuid)
@@ -129,6 +187,55 @@ class SSDPStore(EventEmitter):
     def roots(self) -> Iterable[SSDPRemoteDevice]:
         return list(self._devices.values())
 
+    def services(self, service_type: Union[str, URN]) -> List[Tuple[SSDPRemoteDevice, SSDPService]]:
+        """
+        Services of the given type, on devices that are up.
+        """
+
+        return [
+            (device, service)
+            for device in self if device.state == 'up'
+            for service in device.find_service(service_type) if service.state == 'up'
+        ]
+
+    async def fan_out(
+            self, service_type: Union[str, URN], action: str, args: Optional[Dict[str, Any]] = None, *,
+            concurrency: int = 32, per_host: int = 1, timeout: Optional[float] = None,
+            priority: int = PRIORITY_BACKGROUND
+    ) -> AsyncIterator[FanOutResult]:
+        """
+        Call action on every service of the given type, yielding results (or errors) as they come.
+        At most concurrency calls are running, and at most per_host on each device host.
+        Devices that are down are skipped.
+        """
+
+        args = args or {}
+        semaphore = asyncio.Semaphore(concurrency)
+        hosts = {}  # type: Dict[str, asyncio.Semaphore]
+        results = asyncio.Queue()  # type: asyncio.Queue[FanOutResult]
+
+        async def call(device: SSDPRemoteDevice, service: SSDPService):
+            host = hosts.setdefault(device.address, asyncio.Semaphore(per_host))
+
+            async with semaphore, host:
+                try:
+                    coro = service.call(action, args, priority=priority)
+                    res = await (coro if timeout is None else asyncio.wait_for(coro, timeout))
+
+                    results.put_nowait(FanOutResult(device, service, res))
+
+                except Exception as err:
+                    results.put_nowait(FanOutResult(device, service, error=err))
+
+        tasks = [asyncio.ensure_future(call(device, service)) for device, service in self.services(service_type)]
+
+        try:
+            for _ in range(len(tasks)):
+                yield await results.get()
+
+        finally:
+            discard_tasks(tasks)
+
     def _show(self, dev: SSDPRemoteDevice, lvl: int) -> int:
         count = len(dev.children)
 
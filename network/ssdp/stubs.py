@@ -0,0 +1,229 @@
+import importlib.util
+import keyword
+import logging
+import os
+import re
+import sys
+
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+from xml.etree import ElementTree as ET
+
+from .scpd import SCPD, parse_scpd, scpd_hash
+from .urn import URN
+from .xml import get_data
+
+if TYPE_CHECKING:
+    from .service import SSDPService
+
+# Constants
+PY_TYPES = {
+    'ui1': 'int', 'ui2': 'int', 'ui4': 'int', 'ui8': 'int',
+    'i1': 'int', 'i2': 'int', 'i4': 'int', 'i8': 'int', 'int': 'int',
+    'r4': 'float', 'r8': 'float', 'number': 'float', 'fixed.14.4': 'float', 'float': 'float',
+    'boolean': 'bool',
+}
+
+# Logging
+logger = logging.getLogger('ssdp:stubs')
+
+
+# Class
+class ServiceStub:
+    """
+    class ServiceStub:
+    Base of generated clients: one async method per action, calling the bound service.
+    """
+
+    # Attributes
+    service_type = None  # type: str
+    definition = None    # type: SCPD
+
+    def __init__(self, service: 'SSDPService'):
+        self.service = service
+
+        # Resolve actions and compile their signatures once
+        self._actions = {name: service.action(name) for name in self.definition.actions}
+
+        for action in self._actions.values():
+            action.signature
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.service.id}>'
+
+    # Methods
+    async def _call(self, action: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.service.call(self._actions[action], args)
+
+
+class StubCache:
+    """
+    class StubCache:
+    Generated stub modules, stored on disk by service type and SCPD hash.
+    A cached module is imported directly, without parsing the SCPD again.
+    Given to a store (or device), services are built from the DEFINITION of their stub module.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        # Attributes
+        self.directory = directory or default_cache_dir()
+
+        # - internals
+        self._modules = {}  # type: Dict[str, ModuleType]
+
+    def __repr__(self):
+        return f'<StubCache: {self.directory}>'
+
+    # Methods
+    def path(self, service_type: Union[str, URN], digest: str) -> str:
+        return os.path.join(self.directory, f'{module_name(service_type)}_{digest}.py')
+
+    def load(self, service_type: Union[str, URN], digest: str) -> Optional[ModuleType]:
+        path = self.path(service_type, digest)
+        module = self._modules.get(path)
+
+        if module is None and os.path.exists(path):
+            module = import_stub(path)
+            self._modules[path] = module
+
+        return module
+
+    def store(self, service_type: Union[str, URN], digest: str, scpd: SCPD) -> ModuleType:
+        path = self.path(service_type, digest)
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write then rename, concurrent processes may generate the same stub
+        tmp = f'{path}.{os.getpid()}.tmp'
+
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(generate_stub(str(service_type), scpd, digest))
+
+        os.replace(tmp, path)
+        logger.info(f'Generated stub for {service_type} ({path})')
+
+        module = import_stub(path)
+        self._modules[path] = module
+
+        return module
+
+    def get(self, service_type: Union[str, URN], data: bytes) -> ModuleType:
+        digest = scpd_hash(data)
+        module = self.load(service_type, digest)
+
+        if module is None:
+            module = self.store(service_type, digest, parse_scpd(ET.fromstring(data)))
+
+        return module
+
+    async def fetch(self, service_type: Union[str, URN], url: str) -> ModuleType:
+        return self.get(service_type, await get_data(url))
+
+
+# Utils
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'network', 'stubs')
+
+
+def module_name(service_type: Union[str, URN]) -> str:
+    return re.sub(r'\W+', '_', str(service_type)).strip('_')
+
+
+def class_name(service_type: Union[str, URN]) -> str:
+    urn = URN(str(service_type))
+    name = re.sub(r'\W+', '', urn.type) + re.sub(r'\W+', '_', urn.version or '')
+
+    # Types may start with a digit
+    if not name.isidentifier() or keyword.iskeyword(name):
+        name = f'Service{name}'
+
+    return name
+
+
+def is_identifier(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name) and not name.startswith('_') \
+        and name not in ('service', 'definition')
+
+
+def import_stub(path: str) -> ModuleType:
+    name = 'network_stub_' + os.path.splitext(os.path.basename(path))[0]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    sys.modules[name] = module
+    return module
+
+
+def generate_stub(service_type: str, scpd: SCPD, digest: str) -> str:
+    """
+    Generate the source of a stub module: SCPD tables as literals and a typed client class.
+    """
+
+    lines = [
+        f'# Generated from {service_type} description ({digest}), do not edit.',
+        'from typing import Any, Dict',
+        '',
+        'from network.ssdp.scpd import SCPD, ArgumentDef, StateVariableDef',
+        'from network.ssdp.stubs import ServiceStub',
+        '',
+        '# Constants',
+        f'SERVICE_TYPE = {service_type!r}',
+        f'SCPD_HASH = {digest!r}',
+        '',
+        'DEFINITION = SCPD(',
+        '    actions={',
+    ]
+
+    for name, arguments in scpd.actions.items():
+        lines.append(f'        {name!r}: (')
+        lines.extend(f'            {arg!r},' for arg in arguments)
+        lines.append('        ),')
+
+    lines.append('    },')
+    lines.append('    state_variables={')
+    lines.extend(f'        {name!r}: {var!r},' for name, var in scpd.state_variables.items())
+    lines.append('    },')
+    lines.append(')')
+
+    # Client class
+    lines.extend([
+        '',
+        '',
+        '# Class',
+        f'class {class_name(service_type)}(ServiceStub):',
+        '    # Attributes',
+        '    service_type = SERVICE_TYPE',
+        '    definition = DEFINITION',
+        '',
+        '    # Methods',
+    ])
+
+    for name, arguments in scpd.actions.items():
+        names = [arg.name for arg in arguments]
+
+        if not is_identifier(name) or not all(is_identifier(n) for n in names):
+            lines.append(f'    # {name}: not a valid python signature, use service.call')
+            continue
+
+        params = ''.join(
+            f', {arg.name}: {_py_type(scpd, arg.state_variable)}'
+            for arg in arguments if arg.direction == 'in'
+        )
+        args = ', '.join(f'{arg.name!r}: {arg.name}' for arg in arguments if arg.direction == 'in')
+
+        lines.append(f'    async def {name}(self{params}) -> Dict[str, Any]:')
+        lines.append(f'        return await self._call({name!r}, {{{args}}})')
+        lines.append('')
+
+    if lines[-1] == '':
+        lines.pop()
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _py_type(scpd: SCPD, state_variable: str) -> str:
+    var = scpd.state_variables.get(state_variable)
+    return 'Any' if var is None else PY_TYPES.get(var.data_type, 'str')
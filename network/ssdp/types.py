@@ -1,3 +1,19 @@
+from typing import Any
+
+# Constants
+INT_BOUNDS = {
+    'ui1': (0, 2 ** 8 - 1),
+    'ui2': (0, 2 ** 16 - 1),
+    'ui4': (0, 2 ** 32 - 1),
+    'ui8': (0, 2 ** 64 - 1),
+    'i1': (-2 ** 7, 2 ** 7 - 1),
+    'i2': (-2 ** 15, 2 ** 15 - 1),
+    'i4': (-2 ** 31, 2 ** 31 - 1),
+    'int': (-2 ** 31, 2 ** 31 - 1),
+    'i8': (-2 ** 63, 2 ** 63 - 1),
+}
+
+
 # Class
 class SSDPType:
     def __init__(self, name: str):
@@ -16,14 +32,41 @@ class SSDPType:
     def from_python(self, val) -> str:
         return str(val)
 
+    def coerce(self, val) -> Any:
+        """
+        Check and convert a python value (or its string form) before sending it.
+        Raises TypeError or ValueError if the value is not acceptable.
+        """
+
+        return val
+
 
 class SSDPBool(SSDPType):
+    # Constants
+    TRUE = ('1', 'true', 'yes')
+    FALSE = ('0', 'false', 'no')
+
     # Methods
     def to_python(self, val: str) -> bool:
-        return val in ('1', 'true', 'yes')
+        return val is not None and val.strip().lower() in self.TRUE
+
+    def from_python(self, val) -> str:
+        return '1' if self.coerce(val) else '0'
+
+    def coerce(self, val) -> bool:
+        if isinstance(val, str):
+            if val.lower() in self.TRUE:
+                return True
+
+            if val.lower() in self.FALSE:
+                return False
 
-    def from_python(self, val: bool) -> str:
-        return '1' if val else '0'
+            raise ValueError(f'Invalid boolean: {val!r}')
+
+        if isinstance(val, (bool, int)) and val in (0, 1):
+            return bool(val)
+
+        raise TypeError(f'Expected a boolean, got {type(val).__name__}')
 
 
 class SSDPInt(SSDPType):
@@ -31,19 +74,40 @@ class SSDPInt(SSDPType):
     def to_python(self, val: str) -> int:
         return int(val)
 
+    def coerce(self, val) -> int:
+        if isinstance(val, bool) or not isinstance(val, (int, str)):
+            raise TypeError(f'Expected an integer, got {type(val).__name__}')
+
+        val = int(val)
+        minimum, maximum = INT_BOUNDS.get(self.name, (None, None))
+
+        if minimum is not None and not minimum <= val <= maximum:
+            raise ValueError(f'{val} is out of {self.name} bounds')
+
+        return val
+
 
 class SSDPFloat(SSDPType):
     # Methods
     def to_python(self, val: str) -> float:
         return float(val)
 
+    def coerce(self, val) -> float:
+        if isinstance(val, bool) or not isinstance(val, (int, float, str)):
+            raise TypeError(f'Expected a number, got {type(val).__name__}')
+
+        return float(val)
+
 
 # Utils
 def get_type(name: str) -> SSDPType:
-    if name in ('ui1', 'ui2', 'ui4', 'ui8', 'i1', 'i2', 'i4', 'i8', 'int'):
+    if name in INT_BOUNDS:
         return SSDPInt(name)
 
-    elif name in ('r4', 'r8', 'number', 'fixed.14.4', 'float', 'number'):
+    elif name in ('r4', 'r8', 'number', 'fixed.14.4', 'float'):
         return SSDPFloat(name)
 
+    elif name == 'boolean':
+        return SSDPBool(name)
+
     return SSDPType(name)
@@ -3,6 +3,7 @@ import inspect
 import logging
 
 from functools import wraps
+from network.soap import get_soap_transport
 from typing import Callable
 from urllib.parse import urljoin
 from xml.etree import ElementTree as ET
@@ -14,15 +15,20 @@ logger = logging.getLogger('ssdp:xml')
 
 
 # Utils
-async def get_xml(url: str) -> ET.Element:
+async def get_data(url: str) -> bytes:
     logger.info(f'Getting {url}')
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            assert response.status == 200, f'Unable to get {url} (status {response.status})'
+    # Through the shared keep-alive transport (devices are also called there)
+    session = await get_soap_transport().open()
+
+    async with session.get(url) as response:
+        assert response.status == 200, f'Unable to get {url} (status {response.status})'
+
+        return await response.read()
+
 
-            data = await response.read()
-            return ET.fromstring(data)
+async def get_xml(url: str) -> ET.Element:
+    return ET.fromstring(await get_data(url))
 
 
 def get_device_uuid(xml: ET.Element, url: str) -> str:
@@ -39,6 +45,13 @@ def get_service_id(xml: ET.Element, url: str) -> str:
     return sid.text.strip()
 
 
+def get_service_type(xml: ET.Element, url: str) -> str:
+    stype = xml.find('upnp:serviceType', XML_DEVICE_NS)
+    assert stype is not None, f'Invalid description: no serviceType element ({url})'
+
+    return stype.text.strip()
+
+
 def get_service_scpd_url(xml: ET.Element, url: str) -> str:
     scpd = xml.find('upnp:SCPDURL', XML_DEVICE_NS)
     assert scpd is not None, f'Invalid description: no SCPDURL element ({url})'
@@ -0,0 +1,26 @@
+import aiohttp
+import asyncio
+
+from typing import Optional
+
+
+# Utils
+async def close_session(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    Close a client session bound to the given loop, possibly another one than the current loop.
+    """
+
+    if session.closed:
+        return
+
+    # Still running (in another thread): close it there
+    if loop is not None and loop is not asyncio.get_event_loop() and loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+
+    try:
+        await session.close()
+
+    except RuntimeError:
+        # Its loop is closed, and its connections with it
+        session.detach()
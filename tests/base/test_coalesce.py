@@ -0,0 +1,80 @@
+import asyncio
+
+from network.base.coalesce import Coalescer
+from network.base.emitter import EventEmitter
+
+
+# Utils
+async def _feed(coalescer: Coalescer, count: int, period: float):
+    for i in range(count):
+        coalescer(i)
+        await asyncio.sleep(period)
+
+
+def _run(count: int, period: float, wait: float = 0.1, **policy):
+    calls = []
+
+    async def main():
+        coalescer = Coalescer(lambda i: calls.append(i), **policy)
+
+        await _feed(coalescer, count, period)
+        await asyncio.sleep(wait)
+
+        return coalescer
+
+    return asyncio.run(main()), calls
+
+
+# Test cases
+def test_passthrough():
+    coalescer, calls = _run(5, 0, wait=0)
+
+    assert calls == [0, 1, 2, 3, 4]
+    assert coalescer.emitted == 5
+
+
+def test_window():
+    # Latest value wins, once calls stop for window seconds
+    _, calls = _run(10, 0.005, window=0.05)
+    assert calls == [9]
+
+
+def test_max_delay():
+    # Calls never stop, but none is held more than max_delay
+    _, calls = _run(20, 0.01, window=0.05, max_delay=0.06)
+
+    assert 2 <= len(calls) <= 5
+    assert calls[-1] == 19
+
+
+def test_min_interval():
+    # First call goes through, then at most one call every min_interval
+    coalescer, calls = _run(20, 0.005, min_interval=0.04)
+
+    assert calls[0] == 0
+    assert calls[-1] == 19
+    assert len(calls) < 8
+    assert coalescer.calls == 20
+
+
+def test_merge_and_emitter():
+    emitter = EventEmitter()
+    calls = []
+
+    def listener(value):
+        calls.append(value)
+
+    async def main():
+        coalescer = Coalescer(listener, window=0.02, merge=lambda a, b: (a[0] + b[0],))
+        emitter.on('event', coalescer)
+
+        for i in range(4):
+            emitter.emit('event', i)
+
+        await asyncio.sleep(0.05)
+
+        # Removed through its target
+        assert emitter.remove_listener('event', listener)
+
+    asyncio.run(main())
+    assert calls == [6]
@@ -0,0 +1,157 @@
+import asyncio
+import pytest
+
+from network.base.emitter import EventEmitter, SerialDispatcher
+
+
+# Test cases
+def test_dispatcher_order():
+    async def main():
+        dispatcher = SerialDispatcher()
+        emitter = EventEmitter()
+        emitter.dispatcher = dispatcher
+
+        results = []
+
+        @emitter.on('event')
+        async def handler(i: int):
+            await asyncio.sleep(0.01 if i == 0 else 0)
+            results.append(i)
+
+        for i in range(5):
+            emitter.emit('event', i)
+
+        assert dispatcher.depth(emitter) == 5
+
+        await asyncio.sleep(0.1)
+        return results, dispatcher.stats()
+
+    results, stats = asyncio.run(main())
+
+    assert results == [0, 1, 2, 3, 4]
+    assert stats['dispatched'] == 5
+    assert stats['queued'] == 0
+    assert stats['max_depth'] == 5
+
+
+def test_dispatcher_concurrency():
+    async def main():
+        dispatcher = SerialDispatcher(concurrency=2)
+        running = 0
+        peak = 0
+
+        async def handler():
+            nonlocal running, peak
+
+            running += 1
+            peak = max(peak, running)
+
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(10):
+            emitter = EventEmitter()
+            emitter.dispatcher = dispatcher
+            emitter.on('event', handler)
+            emitter.emit('event')
+
+        await asyncio.sleep(0.1)
+        return peak, dispatcher.stats()
+
+    peak, stats = asyncio.run(main())
+
+    assert peak == 2
+    assert stats['dispatched'] == 10
+    assert stats['queues'] == 0
+
+
+def test_emitter_listeners():
+    emitter = EventEmitter()
+    results = []
+
+    def listener(value: int):
+        results.append(value)
+
+    emitter.on('event', listener)
+    emitter.on('event', listener)  # registered once
+    emitter.once('event', lambda value: results.append(-value))
+
+    assert emitter.emit('event', 1) is True
+    assert emitter.emit('event', 2) is True
+    assert results == [1, -1, 2]
+
+    assert emitter.remove_listener('event', listener) is True
+    assert emitter.emit('event', 3) is False
+    assert emitter.event_names() == set()
+
+
+def test_emitter_once_then_on():
+    emitter = EventEmitter()
+    results = []
+
+    def listener(value: int):
+        results.append(value)
+
+    # Upgraded to a permanent listener, called once per event
+    emitter.once('event', listener)
+    emitter.on('event', listener)
+    emitter.once('event', listener)  # already registered
+
+    emitter.emit('event', 1)
+    emitter.emit('event', 2)
+
+    assert results == [1, 2]
+    assert emitter.listeners('event') == [listener]
+
+
+def test_emitter_weak_listeners():
+    class Listener:
+        def __init__(self):
+            self.results = []
+
+        def on_event(self, value: int):
+            self.results.append(value)
+
+    emitter = EventEmitter()
+    obj = Listener()
+
+    emitter.on('event', obj.on_event)
+    emitter.emit('event', 1)
+
+    assert obj.results == [1]
+    assert emitter.listeners('event') == [obj.on_event]
+
+    # Listener is removed with its instance
+    del obj
+    assert emitter.listeners('event') == []
+
+
+def test_emitter_errors():
+    emitter = EventEmitter()
+
+    @emitter.on('event')
+    def listener():
+        raise ValueError('test')
+
+    with pytest.raises(ValueError):
+        emitter.emit('event')
+
+    errors = []
+    emitter.on('error', errors.append)
+    emitter.emit('event')
+
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_emitter_wait():
+    async def main():
+        emitter = EventEmitter()
+        asyncio.get_running_loop().call_soon(emitter.emit, 'event', 1, 2)
+
+        result = await emitter.wait('event')
+        return result, emitter.listeners('event')
+
+    result, listeners = asyncio.run(main())
+
+    assert result == (1, 2)
+    assert listeners == []
@@ -0,0 +1,135 @@
+import asyncio
+
+from network.gena import GENAClient, GENAServer, GENASubscription
+
+
+# Utils
+class FakeSubscription:
+    def __init__(self, sid: str, timeout: int):
+        self.id = sid
+        self.timeout = timeout
+        self.expired = False
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+# Test cases
+def test_renewals():
+    client = GENAClient(ratio=0.1, jitter=0.05, batch=1)
+    renewed = []
+
+    async def main():
+        loop = asyncio.get_event_loop()
+        all_renewed = asyncio.Event()
+
+        async def renew(sub):
+            renewed.append(sub.id)
+            sub.timeout = 1000  # next renewal far away
+
+            if len(renewed) == 9:
+                all_renewed.set()
+
+        start = loop.time()
+        subs = [FakeSubscription(str(i), 1) for i in range(10)]
+
+        for sub in subs:
+            client.schedule(sub, renew)
+
+        # Spread by jitter
+        due = [client.due(sub) for sub in subs]
+        assert all(0.05 <= d - start <= 0.1 for d in due)
+        assert len(set(due)) > 1
+
+        client.cancel(subs[0])
+        await asyncio.wait_for(all_renewed.wait(), 5)
+
+        # Renewed ones are scheduled again
+        assert all(client.due(sub) - start >= 50 for sub in subs[1:])
+        assert client.due(subs[0]) is None
+
+        await client.close()
+
+    asyncio.run(main())
+
+    # All due within batch seconds: renewed at once
+    assert sorted(renewed) == [str(i) for i in range(1, 10)]
+    assert client.metrics['batches'] == 1
+
+
+def test_failed_renewal():
+    client = GENAClient(ratio=0.1, jitter=0)
+
+    async def renew(sub):
+        raise OSError('unreachable')
+
+    async def main():
+        sub = FakeSubscription('1', 1)
+        client.schedule(sub, renew)
+
+        await asyncio.sleep(0.15)
+        due = client.due(sub)
+
+        await client.close()
+        return due
+
+    assert asyncio.run(main()) is None
+    assert client.metrics['failures'] == 1
+
+
+def test_failed_auto_renewal():
+    client = GENAClient()
+    session = GENAServer().new_session(client)
+    expired = []
+
+    async def renew(sub, *, timeout=None):
+        raise OSError('unreachable')
+
+    session.renew = renew
+
+    async def main():
+        sub = GENASubscription('http://127.0.0.1/evt')
+        sub.id = '1234'
+        sub.on('expired', lambda was: expired.append(was))
+
+        try:
+            await session._auto_renew(sub)
+
+        except OSError:
+            pass
+
+        return sub.expired
+
+    # Ended, so that its owner can subscribe again
+    assert asyncio.run(main())
+    assert expired == ['valid']
+
+
+def test_pace():
+    client = GENAClient(rate=100)
+
+    async def main():
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        await asyncio.gather(*(client.pace() for _ in range(5)))
+        return loop.time() - start
+
+    assert asyncio.run(main()) >= 0.035
+    assert client.metrics['paced'] == 4
+
+
+def test_new_loop_session():
+    client = GENAClient()
+
+    async def open():
+        return await client.open()
+
+    # Sessions are bound to their loop: the previous one is closed
+    first = asyncio.run(open())
+    second = asyncio.run(open())
+
+    assert first.closed
+    assert not second.closed
+
+    asyncio.run(client.close())
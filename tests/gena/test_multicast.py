@@ -0,0 +1,51 @@
+from network.gena import GENAMulticastListener
+from network.ssdp import SSDPMessage
+
+# Constants
+BODY = '''<?xml version="1.0"?>
+<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">
+    <e:property><Volume>42</Volume></e:property>
+</e:propertyset>'''
+
+
+# Utils
+def event_msg(seq: int, svcid: str = 'urn:upnp-org:serviceId:RenderingControl') -> SSDPMessage:
+    return SSDPMessage(message=(
+        f'NOTIFY * HTTP/1.0\r\n'
+        f'HOST: 239.255.255.246:7900\r\n'
+        f'CONTENT-TYPE: text/xml; charset="utf-8"\r\n'
+        f'USN: uuid:Device-UUID::urn:schemas-upnp-org:service:RenderingControl:1\r\n'
+        f'SVCID: {svcid}\r\n'
+        f'NT: upnp:event\r\n'
+        f'NTS: upnp:propchange\r\n'
+        f'SEQ: {seq}\r\n'
+        f'LVL: upnp:/info\r\n'
+        f'BOOTID.UPNP.ORG: 1\r\n'
+        f'\r\n'
+        f'{BODY}'
+    ))
+
+
+# Test cases
+def test_route():
+    listener = GENAMulticastListener()
+    events = []
+
+    listener.register('device-uuid', 'urn:upnp-org:serviceId:RenderingControl', lambda v, s: events.append((v, s)))
+
+    listener._on_message(event_msg(1), ('192.168.1.2', 7900))
+    listener._on_message(event_msg(1), ('192.168.1.2', 7900))  # duplicate
+    listener._on_message(event_msg(2, 'urn:upnp-org:serviceId:Other'), ('192.168.1.2', 7900))
+    listener._on_message(event_msg(0), ('192.168.1.2', 7900))  # device restarted
+
+    assert events == [({'Volume': '42'}, 1), ({'Volume': '42'}, 0)]
+    assert listener.stats() == {'services': 1, 'received': 4, 'routed': 2, 'dropped': 1}
+
+
+def test_invalid_event():
+    listener = GENAMulticastListener()
+    msg = event_msg(1)
+    msg.body = '<not xml'
+
+    listener._on_message(msg, ('192.168.1.2', 7900))
+    assert listener.dropped == 1
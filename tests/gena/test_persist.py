@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from network.gena import GENAClient, GENAServer, GENASubscriptionStore, configure_gena_server, configure_gena_store
+from network.gena import run
+
+# Constants
+BODY = b'''<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">
+    <e:property><Volume>42</Volume></e:property>
+</e:propertyset>'''
+
+
+# Utils
+class FakeDevice:
+    def __init__(self):
+        self.requests = []
+        self.sids = set()
+        self._ids = itertools.count()
+
+    async def handler(self, request: web.Request) -> web.Response:
+        sid = request.headers.get('SID')
+        self.requests.append((request.method, sid))
+
+        if sid is None:
+            sid = f'uuid:{next(self._ids)}'
+            self.sids.add(sid)
+
+        elif sid not in self.sids:
+            return web.Response(status=412)
+
+        return web.Response(headers={'SID': sid, 'TIMEOUT': 'Second-300'})
+
+
+async def _subscribe(device_url: str, path: str, server: GENAServer, client: GENAClient):
+    store = GENASubscriptionStore(path, delay=0)
+    session = server.new_session(client, callback=store.callback(device_url), store=store)
+    await session.open()
+
+    sub = await session.subscribe(device_url, renew=False)
+    store.save()
+
+    return session, sub
+
+
+async def _run(path: str, forget: bool):
+    device = FakeDevice()
+    app = web.Application()
+    app.router.add_route('SUBSCRIBE', '/evt', device.handler)
+
+    http = TestServer(app)
+    await http.start_server()
+
+    server = GENAServer(host='127.0.0.1', port=0)
+    client = GENAClient()
+    url = str(http.make_url('/evt'))
+
+    try:
+        # First run, receives an event
+        session, sub = await _subscribe(url, path, server, client)
+        sub._event(1, BODY)
+        await asyncio.sleep(0.01)  # saved after delay
+
+        server.unregister(sub)
+        server._sessions.clear()
+
+        if forget:
+            device.sids.clear()
+
+        # Restart
+        session2, sub2 = await _subscribe(url, path, server, client)
+        return device.requests, session, session2, sub, sub2
+
+    finally:
+        await client.close()
+        await server.stop()
+        await http.close()
+
+
+# Test cases
+def test_resume(tmp_path):
+    requests, session, session2, sub, sub2 = asyncio.run(_run(str(tmp_path / 'subs.json'), False))
+
+    # Renewed, on the same callback
+    assert requests == [('SUBSCRIBE', None), ('SUBSCRIBE', 'uuid:0')]
+    assert session2._callback == session._callback
+    assert sub2.id == sub.id
+    assert sub2.seq == 1
+    assert sub2.value == {'Volume': '42'}
+
+
+def test_resume_fallback(tmp_path):
+    requests, _, _, sub, sub2 = asyncio.run(_run(str(tmp_path / 'subs.json'), True))
+
+    # Device forgot the subscription: subscribe again
+    assert requests == [('SUBSCRIBE', None), ('SUBSCRIBE', 'uuid:0'), ('SUBSCRIBE', None)]
+    assert sub2.id == '1'
+    assert sub2.value == {}
+
+
+def test_shard_store(tmp_path):
+    server = run.get_gena_server()
+    path = str(tmp_path / 'subscriptions.json')
+
+    try:
+        assert configure_gena_store(path).path == path
+
+        # One file per shard
+        configure_gena_server(shards=2, shard=1)
+        assert configure_gena_store(path).path == str(tmp_path / 'subscriptions.1.json')
+
+    finally:
+        configure_gena_store(None)
+        run._server = server
@@ -0,0 +1,83 @@
+from network.gena.protocol import GENANotifyProtocol
+
+# Constants
+REQUEST = (
+    b'NOTIFY /cb HTTP/1.1\r\n'
+    b'NT: upnp:event\r\nNTS: upnp:propchange\r\nSID: uuid:1234\r\nSEQ: 0\r\n'
+    b'Content-Length: 5\r\n\r\nhello'
+)
+
+
+# Utils
+class FakeTransport:
+    def __init__(self):
+        self.data = b''
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.data += data
+
+    def close(self):
+        self.closed = True
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+
+def _protocol(status: int = 200):
+    calls = []
+
+    def handler(callback, headers, body):
+        calls.append((callback, headers, body))
+        return status
+
+    protocol = GENANotifyProtocol(handler)
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+
+    return protocol, transport, calls
+
+
+# Test cases
+def test_keep_alive():
+    protocol, transport, calls = _protocol()
+
+    # Two pipelined requests, the second one split across packets
+    protocol.data_received(REQUEST + REQUEST[:30])
+    protocol.data_received(REQUEST[30:])
+
+    assert len(calls) == 2
+    assert calls[0][0] == 'cb'
+    assert calls[0][1]['SID'] == 'uuid:1234'
+    assert calls[0][2] == b'hello'
+
+    assert transport.data == b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n' * 2
+    assert not transport.closed
+
+
+def test_handler_status():
+    protocol, transport, _ = _protocol(412)
+    protocol.data_received(REQUEST)
+
+    assert transport.data.startswith(b'HTTP/1.1 412 Precondition Failed\r\n')
+
+
+def test_connection_close():
+    protocol, transport, _ = _protocol()
+    protocol.data_received(REQUEST.replace(b'SEQ: 0', b'SEQ: 0\r\nConnection: close'))
+
+    assert transport.closed
+
+
+def test_bad_requests():
+    protocol, transport, calls = _protocol()
+    protocol.data_received(b'GET /cb HTTP/1.1\r\nContent-Length: 0\r\n\r\n')
+
+    assert transport.data.startswith(b'HTTP/1.1 405')
+    assert calls == []
+
+    protocol, transport, _ = _protocol()
+    protocol.data_received(b'NOTIFY /cb HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n')
+
+    assert transport.data.startswith(b'HTTP/1.1 411')
+    assert transport.closed
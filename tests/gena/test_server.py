@@ -0,0 +1,158 @@
+import asyncio
+
+from aiohttp.test_utils import make_mocked_request
+from network.gena import GENAServer, GENASubscription
+from network.gena.server import OVERFLOW_DROP_NEWEST, OVERFLOW_REJECT
+
+# Constants
+BODY = b'''<?xml version="1.0"?>
+<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">
+    <e:property><ExternalIPAddress>1.2.3.4</ExternalIPAddress></e:property>
+</e:propertyset>'''
+
+
+# Utils
+class Payload:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def readany(self) -> bytes:
+        data, self.data = self.data, b''
+        return data
+
+
+class FakeSubscription:
+    def __init__(self, sid: str):
+        self.id = sid
+        self.expired = False
+        self.events = []
+        self.drops = []
+
+    def _event(self, seq: int, body: bytes):
+        self.events.append((seq, body))
+
+    def _drop(self, seq: int):
+        self.drops.append(seq)
+
+
+def _notify(sid: str = 'uuid:1234', seq: str = '0', **headers):
+    headers = {'NT': 'upnp:event', 'NTS': 'upnp:propchange', 'SID': sid, 'SEQ': seq, **headers}
+    return make_mocked_request('NOTIFY', '/cb', headers=headers, payload=Payload(BODY))
+
+
+# Test cases
+def test_notify():
+    server = GENAServer()
+    sub = FakeSubscription('1234')
+    server.register(sub)
+
+    async def main():
+        res = await server._handler(_notify())
+
+        # Acknowledged before processing
+        assert res.status == 200
+        assert sub.events == []
+
+        await asyncio.sleep(0)
+        return res
+
+    asyncio.run(main())
+
+    assert sub.events == [(0, BODY)]
+    assert server.stats()['processed'] == 1
+
+
+def test_invalid_notify():
+    server = GENAServer()
+    server.register(FakeSubscription('1234'))
+
+    async def main():
+        return [
+            (await server._handler(req)).status
+            for req in (
+                _notify(sid='uuid:unknown'),
+                _notify(sid='1234'),
+                _notify(seq='first'),
+                _notify(NT='upnp:other'),
+                make_mocked_request('GET', '/cb'),
+            )
+        ]
+
+    assert asyncio.run(main()) == [412, 412, 400, 412, 405]
+
+
+def test_overflow():
+    async def run(overflow: str):
+        server = GENAServer(max_queue=2, overflow=overflow)
+        sub = FakeSubscription('1234')
+        server.register(sub)
+
+        statuses = [(await server._handler(_notify(seq=str(seq)))).status for seq in range(4)]
+        await asyncio.sleep(0.01)
+
+        return statuses, [seq for seq, _ in sub.events], sub.drops, server.stats()
+
+    statuses, seqs, drops, stats = asyncio.run(run('drop-oldest'))
+    assert statuses == [200] * 4
+    assert seqs == [2, 3]
+    assert drops == [0, 1]
+    assert stats['dropped'] == 2
+    assert stats['max_depth'] == 2
+
+    statuses, seqs, drops, stats = asyncio.run(run(OVERFLOW_DROP_NEWEST))
+    assert statuses == [200] * 4
+    assert seqs == [0, 1]
+    assert drops == [2, 3]
+
+    statuses, seqs, drops, stats = asyncio.run(run(OVERFLOW_REJECT))
+    assert statuses == [200, 200, 503, 503]
+    assert drops == [2, 3]
+    assert stats['rejected'] == 2
+
+
+def test_dropped_event():
+    sub = GENASubscription('http://127.0.0.1/evt')
+    dropped = []
+    sub.on('dropped', dropped.append)
+
+    sub._drop(3)
+    sub._drop(4)
+
+    # Flagged once
+    assert sub.stale
+    assert dropped == [3]
+
+
+def test_notify_protocol_path():
+    server = GENAServer(transport='asyncio')
+    sub = FakeSubscription('1234')
+    server.register(sub)
+
+    async def main():
+        headers = {'NT': 'upnp:event', 'NTS': 'upnp:propchange', 'SID': 'uuid:1234', 'SEQ': '3'}
+
+        assert server._notify('cb', headers, BODY) == 200
+        assert server._notify('cb', {**headers, 'SID': 'uuid:0000'}, BODY) == 412
+
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sub.events == [(3, BODY)]
+
+
+def test_restart():
+    server = GENAServer(host='127.0.0.1', port=0)
+
+    async def main():
+        await server.start()
+        await server.stop()
+        assert not server.started
+
+        # Started again, on a new runner
+        await server.start()
+        assert server.started
+
+        await server.stop()
+
+    asyncio.run(main())
+    assert not server.started
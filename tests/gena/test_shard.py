@@ -0,0 +1,168 @@
+import asyncio
+import os
+import pytest
+
+from xml.etree import ElementTree as ET
+
+from network.gena import GENAClient, GENAServer, GENAShardError, shard_for
+from network.gena.shard import GENAShardProtocol, callback_shard, encode_frame, ensure_private_dir
+from network.ssdp.service import SSDPService
+from network.ssdp.standard import get_standard_scpd
+
+# Constants
+BODY = b'<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"/>'
+HEADERS = {'NT': 'upnp:event', 'NTS': 'upnp:propchange', 'SID': 'uuid:1234', 'SEQ': '1'}
+
+XML_DEVICE = '''<service xmlns="urn:schemas-upnp-org:device-1-0">
+    <serviceType>urn:schemas-upnp-org:service:WANIPConnection:1</serviceType>
+    <serviceId>urn:upnp-org:serviceId:WANIPConn1</serviceId>
+    <SCPDURL>/scpd.xml</SCPDURL>
+    <controlURL>/ctl</controlURL>
+    <eventSubURL>/evt</eventSubURL>
+</service>'''
+
+
+# Utils
+class FakeSubscription:
+    def __init__(self, sid: str):
+        self.id = sid
+        self.expired = False
+        self.events = []
+
+    def _event(self, seq: int, body: bytes):
+        self.events.append((seq, body))
+
+
+class StuckWriter:
+    """
+    Connection to a shard that never reads
+    """
+
+    def __init__(self):
+        self.transport = self
+        self.written = []
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_write_buffer_size(self) -> int:
+        return sum(len(frame) for frame in self.written)
+
+    def write(self, frame: bytes):
+        self.written.append(frame)
+
+
+# Test cases
+def test_shard_for():
+    shards = [shard_for(f'uuid-{i}', 4) for i in range(100)]
+
+    assert shard_for('uuid-1', 4) == shards[1]
+    assert set(shards) == {0, 1, 2, 3}
+
+
+def test_callbacks():
+    server = GENAServer(shards=4, shard=2)
+    callback = server._gen_callback()
+
+    assert callback_shard(callback) == 2
+    assert callback_shard('abcdef') is None
+    assert server._owner(callback) is None
+    assert server._owner('3-abcdef') == 3
+
+
+def test_frames():
+    frames = []
+    protocol = GENAShardProtocol(lambda *frame: frames.append(frame))
+    data = encode_frame('1-abc', HEADERS, BODY) * 2
+
+    protocol.data_received(data[:10])
+    protocol.data_received(data[10:])
+
+    assert frames == [('1-abc', HEADERS, BODY)] * 2
+
+
+def test_forward(tmp_path):
+    receiver = GENAServer(shards=2, shard=0, ipc_dir=str(tmp_path))
+    owner = GENAServer(shards=2, shard=1, ipc_dir=str(tmp_path))
+    sub = FakeSubscription('1234')
+    owner.register(sub)
+
+    async def main():
+        await owner._start_ipc()
+
+        try:
+            assert receiver._notify('1-abc', HEADERS, BODY) == 200
+            await asyncio.sleep(0.05)
+
+        finally:
+            await owner.stop()
+            await receiver.stop()
+
+    asyncio.run(main())
+
+    assert receiver.stats()['forwarded'] == 1
+    assert sub.events == [(1, BODY)]
+
+
+def test_forward_buffer(tmp_path):
+    receiver = GENAServer(shards=2, shard=0, ipc_dir=str(tmp_path))
+    writer = StuckWriter()
+
+    frame = encode_frame('1-abc', HEADERS, BODY)
+    receiver._link.max_buffer = len(frame) * 3
+    receiver._link._writers[1] = writer
+
+    statuses = [receiver._notify('1-abc', HEADERS, BODY) for _ in range(5)]
+
+    assert statuses == [200] * 3 + [503] * 2
+    assert len(writer.written) == 3
+    assert receiver.stats()['forwarded'] == 3
+    assert receiver.stats()['forward_dropped'] == 2
+
+
+def test_ipc_dir(tmp_path):
+    assert GENAServer(shards=2, port=8081).ipc_dir != GENAServer(shards=2, port=8082).ipc_dir
+
+    private = str(tmp_path / 'private')
+    ensure_private_dir(private)
+    assert os.stat(private).st_mode & 0o777 == 0o700
+
+    shared = str(tmp_path / 'shared')
+    os.mkdir(shared)
+    os.chmod(shared, 0o777)
+
+    with pytest.raises(PermissionError):
+        ensure_private_dir(shared)
+
+
+def test_owned_subscriptions():
+    events = [f'http://10.0.0.{i}/evt' for i in range(20)]
+    servers = [GENAServer(shards=3, shard=shard) for shard in range(3)]
+
+    # Each event url belongs to one shard
+    assert all(sum(server.owns(event) for server in servers) == 1 for event in events)
+    assert GENAServer().owns(events[0])
+
+    async def main():
+        service = SSDPService(
+            ET.fromstring(XML_DEVICE), get_standard_scpd('urn:schemas-upnp-org:service:WANIPConnection:1'),
+            'http://127.0.0.1/'
+        )
+
+        client = GENAClient()
+        other = next(server for server in servers if not server.owns(service.event_sub))
+        service._gena = other.new_session(client)
+
+        try:
+            await service.subscribe('ExternalIPAddress')
+
+        except GENAShardError as err:
+            assert err.shard == other.owner(service.event_sub) != other.shard
+            return service.subscribed
+
+        finally:
+            service.down()
+            await asyncio.sleep(0.01)
+            await client.close()
+
+    assert asyncio.run(main()) is False
@@ -0,0 +1,87 @@
+import asyncio
+
+from network.soap import SOAPCache
+
+
+# Utils
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+
+        return {'NewExternalIPAddress': f'1.2.3.{self.calls}'}
+
+
+# Test cases
+def test_cache_ttl():
+    clock = Clock()
+    cache = SOAPCache({'GetExternalIPAddress': 10}, clock=clock)
+    fetch = Fetcher()
+
+    async def main():
+        first = await cache.get('GetExternalIPAddress', {}, fetch)
+        second = await cache.get('GetExternalIPAddress', {}, fetch)
+
+        clock.now += 11
+        third = await cache.get('GetExternalIPAddress', {}, fetch)
+
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+
+    assert first == second == {'NewExternalIPAddress': '1.2.3.1'}
+    assert third == {'NewExternalIPAddress': '1.2.3.2'}
+    assert cache.hits == 1 and cache.misses == 2
+
+
+def test_cache_single_flight():
+    cache = SOAPCache({'GetExternalIPAddress': 10})
+    fetch = Fetcher()
+
+    async def main():
+        return await asyncio.gather(*(cache.get('GetExternalIPAddress', {}, fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert fetch.calls == 1
+    assert all(res == {'NewExternalIPAddress': '1.2.3.1'} for res in results)
+    assert cache.shared == 4
+
+
+def test_cache_uncached():
+    cache = SOAPCache({'GetExternalIPAddress': 10})
+    fetch = Fetcher()
+
+    async def main():
+        await cache.get('GetStatusInfo', {}, fetch)
+        await cache.get('GetStatusInfo', {}, fetch)
+
+    asyncio.run(main())
+    assert fetch.calls == 2
+
+
+def test_cache_invalidate():
+    cache = SOAPCache({'GetExternalIPAddress': 10})
+    fetch = Fetcher()
+
+    async def main():
+        await cache.get('GetExternalIPAddress', {}, fetch)
+        cache.invalidate('GetExternalIPAddress')
+
+        return await cache.get('GetExternalIPAddress', {}, fetch)
+
+    result = asyncio.run(main())
+
+    assert fetch.calls == 2
+    assert result == {'NewExternalIPAddress': '1.2.3.2'}
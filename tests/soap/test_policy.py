@@ -0,0 +1,207 @@
+import aiohttp
+import asyncio
+import pytest
+
+from network.soap import CircuitBreaker, RetryPolicy, SOAPCircuitOpenError, SOAPRequest, SOAPSession, SOAPTransport
+
+
+# Utils
+def _request() -> SOAPRequest:
+    return SOAPRequest(
+        'http://127.0.0.1:1/ctl', 'urn:schemas-upnp-org:service:WANIPConnection:1', 'GetExternalIPAddress', {}
+    )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakySession(SOAPSession):
+    def __init__(self, failures: int, delay: float = 0, **kwargs):
+        super().__init__(SOAPTransport(), **kwargs)
+
+        self.failures = failures
+        self.delay = delay
+        self.posts = 0
+
+    async def _post(self, request):
+        self.posts += 1
+        await asyncio.sleep(self.delay)
+
+        if self.posts <= self.failures:
+            raise aiohttp.ClientConnectionError('connection refused')
+
+        return 'ok'
+
+
+# Test cases
+def test_retry_delay():
+    retry = RetryPolicy(backoff=1, max_backoff=3, jitter=0)
+
+    assert [retry.delay(a) for a in (1, 2, 3, 4)] == [1, 2, 3, 3]
+
+
+def test_breaker_states():
+    clock = Clock()
+    breaker = CircuitBreaker(2, 10, clock=clock)
+
+    breaker.failure()
+    assert breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    # Only one probe when half-open
+    clock.now += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == 'open'
+
+    clock.now += 10
+    assert breaker.allow()
+
+    breaker.success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+def test_session_retry():
+    session = FlakySession(2, retry=RetryPolicy(3, backoff=0))
+
+    assert asyncio.run(session.send(_request())) == 'ok'
+    assert session.posts == 3
+    assert session.metrics['retries'] == 2
+
+
+def test_session_breaker():
+    session = FlakySession(10)
+    session.transport.breaker_threshold = 2
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientError):
+                await session.send(_request())
+
+        with pytest.raises(SOAPCircuitOpenError):
+            await session.send(_request())
+
+    asyncio.run(main())
+    assert session.posts == 2
+    assert session.metrics['rejected'] == 1
+
+
+def test_session_deadline():
+    session = FlakySession(0, delay=1, timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(session.send(_request()))
+
+    assert session.metrics['timeouts'] == 1
+
+
+def test_session_deadline_breaker():
+    # Hanging device, only the call deadline applies
+    session = FlakySession(0, delay=1, timeout=0.02)
+    session.transport.breaker_threshold = 2
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await session.send(_request())
+
+        with pytest.raises(SOAPCircuitOpenError):
+            await session.send(_request())
+
+    asyncio.run(main())
+    assert session.posts == 2
+
+
+def test_session_deadline_probe():
+    clock = Clock()
+    session = FlakySession(0, delay=1, timeout=0.02)
+
+    breaker = CircuitBreaker(1, 10, clock=clock)
+    session.transport._breakers[_request().control_url] = breaker
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await session.send(_request())
+
+        assert breaker.state == 'open'
+
+        # Half-open probe interrupted by the deadline: opens the breaker again
+        clock.now += 10
+
+        with pytest.raises(asyncio.TimeoutError):
+            await session.send(_request())
+
+        assert breaker.state == 'open'
+
+        # Next probe is allowed
+        clock.now += 10
+        session.delay = 0
+
+        assert await session.send(_request()) == 'ok'
+        assert breaker.state == 'closed'
+
+    asyncio.run(main())
+
+
+def test_session_cancelled():
+    clock = Clock()
+    session = FlakySession(0, delay=1)
+
+    breaker = CircuitBreaker(2, 10, clock=clock)
+    session.transport._breakers[_request().control_url] = breaker
+
+    async def main():
+        # Cancelled callers (sent or waiting for a slot) are not device failures
+        tasks = [asyncio.ensure_future(session.send(_request())) for _ in range(8)]
+        await asyncio.sleep(0.01)
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert breaker.state == 'closed'
+
+        # Cancelled probe: another call may probe
+        breaker.failure()
+        breaker.failure()
+        clock.now += 10
+
+        probe = asyncio.ensure_future(session.send(_request()))
+        await asyncio.sleep(0.01)
+        assert breaker.probing
+
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        assert not breaker.probing
+        assert breaker.allow()
+
+    asyncio.run(main())
+    assert session.transport.scheduler.stats()['127.0.0.1']['in_flight'] == 0
+
+
+def test_session_hedge():
+    session = FlakySession(0, delay=0.05, hedge=0.01, hedged_actions=['GetExternalIPAddress'])
+
+    assert asyncio.run(session.send(_request())) == 'ok'
+    assert session.posts == 2
+    assert session.metrics['hedged'] == 1
+
+
+def test_session_hedge_not_allowed():
+    session = FlakySession(0, delay=0.05, hedge=0.01)
+
+    assert asyncio.run(session.send(_request())) == 'ok'
+    assert session.posts == 1
+    assert session.metrics['hedged'] == 0
@@ -1,5 +1,7 @@
 from network.soap import SOAPRequest
 from network.ssdp.urn import URN
+from network.utils.xml import add_ns
+from xml.etree import ElementTree as ET
 
 # Constants
 url = 'http://192.168.1.1:5885/control/'
@@ -43,3 +45,30 @@ def test_request_body():
     # Check body
     body = req.body()
     assert body == xml
+
+
+def test_request_body_escaped():
+    args = {'arg1': '<a & b>', 'arg2': '', 'arg3': 'éàü'}
+    req = SOAPRequest(url, stype.urn, 'test', args)
+
+    # Check body matches ElementTree serialization
+    root = ET.Element(add_ns('soap:Envelope', req.xml_ns()))
+    root.set(add_ns('soap:encodingStyle', req.xml_ns()), 'http://schemas.xmlsoap.org/soap/encoding/')
+
+    body = ET.SubElement(root, add_ns('soap:Body', req.xml_ns()))
+    action = ET.SubElement(body, add_ns('upnp:test', req.xml_ns()))
+
+    for n, v in args.items():
+        ET.SubElement(action, n).text = v
+
+    assert req.body() == ET.tostring(root, 'utf-8')
+
+
+def test_request_template_cache():
+    req1 = SOAPRequest(url, stype.urn, 'test', {'arg1': '458', 'arg2': '885'})
+    req2 = SOAPRequest(url, stype.urn, 'test', {'arg1': '1', 'arg2': '2'})
+    req3 = SOAPRequest(url, stype.urn, 'test', {'arg2': '2', 'arg1': '1'})
+
+    # Check templates are shared by argument order
+    assert req1.template is req2.template
+    assert req1.template is not req3.template
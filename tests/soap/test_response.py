@@ -1,3 +1,5 @@
+import pytest
+
 from network.soap import SOAPResponse
 from network.ssdp.urn import URN
 
@@ -60,3 +62,25 @@ def test_response_error():
     assert res.fault_string == 'UPnPError'
     assert res.error_code == 885
     assert res.error_description == 'error string'
+
+
+def test_response_bytes():
+    res = SOAPResponse(stype.urn, action, xml.encode('utf-8'))
+
+    # Check args
+    assert res.results == {'arg1': '458', 'arg2': '885'}
+
+
+def test_response_expected_results():
+    res = SOAPResponse(stype.urn, action, xml, results=['arg2', 'arg1', 'arg3'])
+
+    # Check args are filtered and ordered
+    assert list(res.results.items()) == [('arg2', '885'), ('arg1', '458')]
+
+    res = SOAPResponse(stype.urn, action, xml, results=['arg2'])
+    assert res.results == {'arg2': '885'}
+
+
+def test_response_invalid():
+    with pytest.raises(ValueError):
+        SOAPResponse(stype.urn, 'other', xml)
@@ -0,0 +1,123 @@
+import asyncio
+
+from network.soap import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, SOAPScheduler
+
+
+# Utils
+async def _run(scheduler: SOAPScheduler, order: list, name: str, service: str, priority: int):
+    async with scheduler.slot('gateway', service, priority):
+        order.append(name)
+        await asyncio.sleep(0.01)
+
+
+# Test cases
+def test_max_in_flight():
+    scheduler = SOAPScheduler(2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+
+        async with scheduler.slot('gateway', '/ctl'):
+            peak = max(peak, scheduler.stats()['gateway']['in_flight'])
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    stats = scheduler.stats()['gateway']
+
+    assert peak == 2
+    assert stats['in_flight'] == 0
+    assert stats['requests'] == 6
+    assert stats['waited'] == 4
+    assert stats['max_depth'] == 4
+
+
+def test_priorities_and_fairness():
+    scheduler = SOAPScheduler(1)
+    order = []
+
+    async def main():
+        first = asyncio.ensure_future(_run(scheduler, order, 'first', '/a', PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+
+        tasks = [
+            asyncio.ensure_future(_run(scheduler, order, name, service, priority))
+            for name, service, priority in [
+                ('poll-1', '/a', PRIORITY_BACKGROUND),
+                ('a-1', '/a', PRIORITY_INTERACTIVE),
+                ('a-2', '/a', PRIORITY_INTERACTIVE),
+                ('b-1', '/b', PRIORITY_INTERACTIVE),
+            ]
+        ]
+
+        await asyncio.gather(first, *tasks)
+
+    asyncio.run(main())
+    assert order == ['first', 'a-1', 'b-1', 'a-2', 'poll-1']
+
+
+def test_cancel_waiting():
+    scheduler = SOAPScheduler(1)
+    order = []
+
+    async def main():
+        first = asyncio.ensure_future(_run(scheduler, order, 'first', '/a', PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+
+        waiting = asyncio.ensure_future(_run(scheduler, order, 'cancelled', '/a', PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+
+        assert scheduler.depth('gateway') == 1
+        waiting.cancel()
+
+        await first
+        await _run(scheduler, order, 'last', '/a', PRIORITY_INTERACTIVE)
+
+    asyncio.run(main())
+
+    assert order == ['first', 'last']
+    assert scheduler.depth('gateway') == 0
+    assert scheduler.stats()['gateway']['in_flight'] == 0
+
+
+def test_cancel_before_release():
+    scheduler = SOAPScheduler(1)
+
+    async def main():
+        await scheduler.acquire('gateway', '/a')
+
+        waiting = asyncio.ensure_future(scheduler.acquire('gateway', '/a'))
+        await asyncio.sleep(0)
+
+        # Released before the cancelled waiter runs again
+        waiting.cancel()
+        scheduler.release('gateway')
+
+        try:
+            await waiting
+
+        except asyncio.CancelledError:
+            pass
+
+        assert scheduler.stats()['gateway']['in_flight'] == 0
+        assert scheduler.depth('gateway') == 0
+
+        # Host is still usable
+        await asyncio.wait_for(scheduler.acquire('gateway', '/a'), 1)
+        scheduler.release('gateway')
+
+    asyncio.run(main())
+
+
+def test_limit():
+    scheduler = SOAPScheduler(4)
+    scheduler.limit('gateway', 1)
+
+    async def main():
+        async with scheduler.slot('gateway', '/a'):
+            return scheduler.stats()['gateway']['max_in_flight']
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,22 @@
+import asyncio
+
+from network.soap import SOAPTransport
+
+
+# Test cases
+def test_new_loop_session():
+    transport = SOAPTransport()
+
+    async def open():
+        return await transport.open()
+
+    # Sessions are bound to their loop: the previous one is closed
+    first = asyncio.run(open())
+    second = asyncio.run(open())
+
+    assert first is not second
+    assert first.closed
+    assert not second.closed
+
+    asyncio.run(transport.close())
+    assert second.closed
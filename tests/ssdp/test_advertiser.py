@@ -0,0 +1,73 @@
+import asyncio
+
+from network.ssdp import SSDPAdvertiser, SSDPLocalDevice, SSDPMessage, SSDPServer
+
+# Constants
+uuid = 'device-uuid'
+child_uuid = 'child-uuid'
+
+dtype = 'urn:schemas-upnp-org:device:deviceType:2'
+ctype = 'urn:schemas-upnp-org:device:childType:1'
+stype = 'urn:schemas-upnp-org:service:serviceType:1'
+
+
+# Utils
+def build_advertiser() -> SSDPAdvertiser:
+    server = SSDPServer(('239.255.255.250', 1900))
+    advertiser = SSDPAdvertiser(server, max_age=900)
+
+    advertiser.register(SSDPLocalDevice(
+        uuid, dtype,
+        location='http://example.com/',
+        children=[SSDPLocalDevice(child_uuid, ctype, services=[stype])]
+    ))
+
+    return advertiser
+
+
+# Test cases
+def test_local_device_targets():
+    device = SSDPLocalDevice(
+        uuid, dtype,
+        location='http://example.com/',
+        children=[SSDPLocalDevice(child_uuid, ctype, services=[stype])]
+    )
+
+    assert device.targets() == [
+        ('upnp:rootdevice', f'uuid:{uuid}::upnp:rootdevice'),
+        (f'uuid:{uuid}', f'uuid:{uuid}'),
+        (dtype, f'uuid:{uuid}::{dtype}'),
+        (f'uuid:{child_uuid}', f'uuid:{child_uuid}'),
+        (ctype, f'uuid:{child_uuid}::{ctype}'),
+        (stype, f'uuid:{child_uuid}::{stype}'),
+    ]
+
+
+def test_advertiser_responses():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        advertiser = build_advertiser()
+
+        # Check index
+        assert len(advertiser.responses('ssdp:all')) == 6
+        assert len(advertiser.responses('upnp:rootdevice')) == 1
+        assert len(advertiser.responses('urn:schemas-upnp-org:device:unknown:1')) == 0
+
+        # Check lower versions are matched
+        msg = SSDPMessage(message=advertiser.responses('urn:schemas-upnp-org:device:deviceType:1')[0].decode())
+
+        assert msg.is_response is True
+        assert msg.st == 'urn:schemas-upnp-org:device:deviceType:1'
+        assert msg.usn == f'uuid:{uuid}::{dtype}'
+        assert msg.location == 'http://example.com/'
+        assert msg.max_age == 900
+
+        # Check unregister
+        advertiser.unregister(uuid)
+        assert len(advertiser.responses('ssdp:all')) == 0
+
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
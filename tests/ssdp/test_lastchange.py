@@ -0,0 +1,90 @@
+import asyncio
+
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+from network.gena.subscription import parse_propertyset
+from network.ssdp import Change, LastChange
+from network.ssdp.service import SSDPService
+from network.ssdp.standard import get_standard_scpd
+
+# Constants
+SERVICE_TYPE = 'urn:schemas-upnp-org:service:RenderingControl:1'
+
+XML_DEVICE = f'''<service xmlns="urn:schemas-upnp-org:device-1-0">
+    <serviceType>{SERVICE_TYPE}</serviceType>
+    <serviceId>urn:upnp-org:serviceId:RenderingControl</serviceId>
+    <SCPDURL>/scpd.xml</SCPDURL>
+    <controlURL>/ctl</controlURL>
+    <eventSubURL>/evt</eventSubURL>
+</service>'''
+
+FIRST = '''<Event xmlns="urn:schemas-upnp-org:metadata-1-0/RCS/">
+    <InstanceID val="0">
+        <Volume channel="Master" val="20"/>
+        <Mute channel="Master" val="0"/>
+        <PresetNameList val="FactoryDefaults"/>
+    </InstanceID>
+    <InstanceID val="1">
+        <Volume channel="Master" val="5"/>
+    </InstanceID>
+</Event>'''
+
+SECOND = '''<Event xmlns="urn:schemas-upnp-org:metadata-1-0/RCS/">
+    <InstanceID val="0">
+        <Volume channel="Master" val="25"/>
+        <Mute channel="Master" val="0"/>
+    </InstanceID>
+</Event>'''
+
+
+# Test cases
+def test_decode():
+    lastchange = LastChange()
+    changes = lastchange.decode(FIRST)
+
+    assert len(changes) == 4
+    assert lastchange.instances == [0, 1]
+    assert lastchange.value('Volume', 1, 'Master') == '5'
+    assert lastchange.decode('<Event') == []
+
+
+def test_service():
+    changes = []
+    volumes = []
+
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+
+        lastchange = LastChange(service)
+        lastchange.on('changed', changes.append)
+        lastchange.on('changed:Volume', volumes.append)
+
+        # Escaped in the propertyset, unescaped by the XML parser
+        for doc in (FIRST, SECOND):
+            body = (
+                '<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">'
+                f'<e:property><LastChange>{escape(doc)}</LastChange></e:property>'
+                '</e:propertyset>'
+            )
+
+            service._sub_update(parse_propertyset(body), 0)
+
+        state = dict(lastchange.instance(0))
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return state
+
+    state = asyncio.run(main())
+
+    assert state == {('Volume', 'Master'): 25, ('Mute', 'Master'): False, ('PresetNameList', None): 'FactoryDefaults'}
+    assert volumes == [
+        Change(0, 'Volume', None, 20, 'Master'),
+        Change(1, 'Volume', None, 5, 'Master'),
+        Change(0, 'Volume', 20, 25, 'Master'),
+    ]
+
+    # Unchanged Mute not emitted again
+    assert len(changes) == 5
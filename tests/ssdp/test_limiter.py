@@ -0,0 +1,93 @@
+from network.ssdp import SSDPMessage, SSDPRateLimiter
+
+
+# Utils
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def notify_msg(uuid: str) -> SSDPMessage:
+    return SSDPMessage(method='NOTIFY', headers={
+        'NT': 'upnp:rootdevice',
+        'NTS': 'ssdp:alive',
+        'USN': f'uuid:{uuid}::upnp:rootdevice'
+    })
+
+
+# Test cases
+def test_address_bucket():
+    clock = Clock()
+    limiter = SSDPRateLimiter(address_rate=10, address_burst=5, clock=clock)
+
+    # Burst
+    assert all(limiter.allow_address('192.168.1.2') for _ in range(5))
+    assert limiter.allow_address('192.168.1.2') is False
+    assert limiter.dropped['address'] == 1
+
+    # Other sources are not affected
+    assert limiter.allow_address('192.168.1.3') is True
+
+    # Refill
+    clock.now += 0.1
+    assert limiter.allow_address('192.168.1.2') is True
+    assert limiter.allow_address('192.168.1.2') is False
+
+
+def test_uuid_bucket():
+    clock = Clock()
+    limiter = SSDPRateLimiter(uuid_rate=1, uuid_burst=2, clock=clock)
+
+    assert limiter.allow_message(notify_msg('noisy')) is True
+    assert limiter.allow_message(notify_msg('noisy')) is True
+    assert limiter.allow_message(notify_msg('noisy')) is False
+    assert limiter.allow_message(notify_msg('quiet')) is True
+
+    assert limiter.stats()['uuids'] == {'noisy': 1}
+
+
+def test_quarantine():
+    clock = Clock()
+    limiter = SSDPRateLimiter(
+        address_rate=1, address_burst=1,
+        quarantine_after=3, quarantine_time=60,
+        clock=clock
+    )
+
+    # Flood
+    for _ in range(4):
+        limiter.allow_address('192.168.1.2')
+
+    assert limiter.quarantined == ['192.168.1.2']
+
+    # Still dropped after refill
+    clock.now += 10
+    assert limiter.allow_address('192.168.1.2') is False
+    assert limiter.dropped['quarantine'] == 1
+
+    # Released after quarantine time
+    clock.now += 60
+    assert limiter.allow_address('192.168.1.2') is True
+    assert limiter.quarantined == []
+
+
+def test_max_sources():
+    clock = Clock()
+    limiter = SSDPRateLimiter(
+        address_rate=1, address_burst=10, quarantine_after=100000,
+        max_sources=100, clock=clock
+    )
+
+    # Spoofed sources, none of them idle
+    for i in range(10000):
+        clock.now += 0.001
+        assert limiter.allow_address(f'10.{i // 65536}.{i // 256 % 256}.{i % 256}') is True
+
+        # Recently used: never evicted
+        limiter.allow_address('192.168.1.2')
+
+    assert len(limiter._addresses) <= 100
+    assert limiter.stats()['addresses']['192.168.1.2'] > 0
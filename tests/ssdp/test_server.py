@@ -0,0 +1,141 @@
+import asyncio
+
+from network.ssdp import SSDPServer
+from network.ssdp.protocol import SSDPSearchProtocol
+
+# Constants
+multicast = ('239.255.255.250', 1900)
+
+gateway = ('192.168.1.1', 1900)
+printer = ('192.168.1.2', 1900)
+
+
+# Utils
+class FakeTransport:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    def get_extra_info(self, name: str):
+        return self  # socket
+
+    def setsockopt(self, *args):
+        pass
+
+    def sendto(self, data: bytes, addr):
+        self.sent.append((data, addr))
+
+    def close(self):
+        self.closed = True
+
+
+def response(uuid: str) -> bytes:
+    return f'HTTP/1.1 200 OK\r\n' \
+           f'CACHE-CONTROL: max-age=900\r\n' \
+           f'EXT: \r\n' \
+           f'LOCATION: http://example.com/\r\n' \
+           f'ST: upnp:rootdevice\r\n' \
+           f'USN: uuid:{uuid}::upnp:rootdevice\r\n' \
+           f'\r\n'.encode()
+
+
+def build_server():
+    server = SSDPServer(multicast)
+    protocol = SSDPSearchProtocol(multicast)
+    transport = FakeTransport()
+
+    protocol.connection_made(transport)
+
+    async def search_protocol():
+        return protocol
+
+    server._search_protocol = search_protocol
+
+    return server, protocol, transport
+
+
+# Test cases
+def test_search_iter_streams():
+    async def main():
+        server, protocol, transport = build_server()
+        search = server.search_iter('upnp:rootdevice', timeout=1)
+
+        # Search sent, nothing received yet
+        first = asyncio.ensure_future(search.__anext__())
+        await asyncio.sleep(0)
+
+        assert len(transport.sent) == 5
+        assert not first.done()
+
+        # Yielded as soon as received
+        protocol.datagram_received(response('gateway'), gateway)
+        msg, addr = await asyncio.wait_for(first, 0.5)
+
+        assert str(msg.usn) == 'uuid:gateway::upnp:rootdevice'
+        assert addr == gateway
+
+        protocol.datagram_received(response('printer'), printer)
+        msg, addr = await asyncio.wait_for(search.__anext__(), 0.5)
+
+        assert addr == printer
+        await search.aclose()
+
+    asyncio.run(main())
+
+
+def test_search_iter_duplicates():
+    async def main():
+        server, protocol, transport = build_server()
+        received = []
+
+        def deliver():
+            protocol.datagram_received(response('gateway'), gateway)
+            protocol.datagram_received(response('gateway'), gateway)  # duplicate
+            protocol.datagram_received(response('gateway'), printer)  # another address
+            protocol.datagram_received(response('printer'), printer)
+
+        asyncio.get_event_loop().call_soon(deliver)
+
+        async for msg, addr in server.search_iter('upnp:rootdevice', timeout=0.1):
+            received.append((str(msg.usn), addr))
+
+        return received
+
+    assert asyncio.run(main()) == [
+        ('uuid:gateway::upnp:rootdevice', gateway),
+        ('uuid:gateway::upnp:rootdevice', printer),
+        ('uuid:printer::upnp:rootdevice', printer),
+    ]
+
+
+def test_search_iter_timeout():
+    async def main():
+        server, protocol, transport = build_server()
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        received = [item async for item in server.search_iter('upnp:rootdevice', timeout=0.05)]
+
+        assert received == []
+        assert 0.05 <= loop.time() - start < 0.5
+        assert transport.closed
+
+    asyncio.run(main())
+
+
+def test_search_iter_aclose():
+    async def main():
+        server, protocol, transport = build_server()
+        search = server.search_iter('upnp:rootdevice', timeout=1)
+
+        asyncio.get_event_loop().call_soon(protocol.datagram_received, response('gateway'), gateway)
+        await search.__anext__()
+
+        # Consumer stops early: search socket closed at once
+        assert not transport.closed
+        await search.aclose()
+
+        assert transport.closed
+        assert protocol.transport is None
+
+    asyncio.run(main())
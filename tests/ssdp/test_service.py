@@ -0,0 +1,405 @@
+import asyncio
+import pytest
+
+from xml.etree import ElementTree as ET
+
+from network.gena import GENASubscription
+from network.soap import SOAPError, SOAPSession, SOAPTransport
+from network.ssdp.scpd import SCPD
+from network.ssdp.service import SSDPService
+from network.ssdp.standard import get_standard_scpd
+
+# Constants
+SERVICE_TYPE = 'urn:schemas-upnp-org:service:WANIPConnection:1'
+
+XML_DEVICE = f'''<service xmlns="urn:schemas-upnp-org:device-1-0">
+    <serviceType>{SERVICE_TYPE}</serviceType>
+    <serviceId>urn:upnp-org:serviceId:WANIPConn1</serviceId>
+    <SCPDURL>/scpd.xml</SCPDURL>
+    <controlURL>/ctl</controlURL>
+    <eventSubURL>/evt</eventSubURL>
+</service>'''
+
+
+# Utils
+class FakeCalls:
+    """
+    Replaces SSDPService.call: answers after delay seconds, fails with the given error codes by index.
+    """
+
+    def __init__(self, delay: float = 0.01, errors=None):
+        self.delay = delay
+        self.errors = errors or {}
+
+        self.active = 0
+        self.max_active = 0
+        self.started = []
+        self.finished = []
+
+    async def __call__(self, action, args, *, priority):
+        i = args.get('NewPortMappingIndex', args.get('i'))
+
+        self.started.append(i)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        try:
+            await asyncio.sleep(self.delay * (1 + i % 3))  # out of order answers
+
+            if i in self.errors:
+                raise SOAPError(self.errors[i], 'error')
+
+            self.finished.append(i)
+            return {'i': i}
+
+        finally:
+            self.active -= 1
+
+
+class FakeGENASession:
+    def __init__(self):
+        self.subscriptions = []
+        self.resubscribed = []
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def owns(self, event: str) -> bool:
+        return True
+
+    async def subscribe(self, event: str, *, timeout: int) -> GENASubscription:
+        sub = GENASubscription(event)
+        sub.id = str(len(self.subscriptions))
+        self.subscriptions.append(sub)
+
+        return sub
+
+    async def unsubscribe(self, sub: GENASubscription):
+        sub._end()
+
+    async def resubscribe(self, sub: GENASubscription) -> GENASubscription:
+        self.resubscribed.append(sub.id)
+        return await self.subscribe(sub.event, timeout=sub.timeout)
+
+
+def _service(calls: FakeCalls) -> SSDPService:
+    service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+    service.call = calls
+
+    return service
+
+
+async def _stop(service: SSDPService):
+    service.down()
+    await asyncio.sleep(0.01)
+
+
+# Test cases
+def test_merged_state():
+    changes = []
+
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+
+        ip = service.state_variable('ExternalIPAddress')
+        entries = service.state_variable('PortMappingNumberOfEntries')
+
+        ip.on('changed', lambda old, new: changes.append(('ip', old, new)))
+        entries.on('changed', lambda old, new: changes.append(('entries', old, new)))
+
+        service._apply({'ExternalIPAddress': '1.2.3.4', 'PortMappingNumberOfEntries': '2'})
+        service._apply({'PortMappingNumberOfEntries': '2'})  # unchanged
+        service._apply({'PortMappingNumberOfEntries': '3'})  # ip is kept
+        service._apply({'PortMappingNumberOfEntries': 'invalid', 'Unknown': 'x'})
+
+        values = dict(service.values), ip.value, entries.value
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return values
+
+    values, ip, entries = asyncio.run(main())
+
+    assert values == {'ExternalIPAddress': '1.2.3.4', 'PortMappingNumberOfEntries': 3}
+    assert (ip, entries) == ('1.2.3.4', 3)
+    assert changes == [
+        ('ip', None, '1.2.3.4'),
+        ('entries', None, 2),
+        ('entries', 2, 3),
+    ]
+
+
+def test_coalesced_changes():
+    updates = []
+    changes = []
+
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+
+        entries = service.state_variable('PortMappingNumberOfEntries')
+        entries.coalesce(window=0.02)
+        entries.on('update', updates.append)
+        entries.on('changed', lambda old, new: changes.append((old, new)))
+
+        for raw in ('1', '2', '3'):
+            service._sub_update({'PortMappingNumberOfEntries': raw}, 0)
+
+        await asyncio.sleep(0.05)
+
+        # Back to the old value: no change
+        for raw in ('4', '3'):
+            service._sub_update({'PortMappingNumberOfEntries': raw}, 0)
+
+        await asyncio.sleep(0.05)
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+    assert updates == [3, 3]
+    assert changes == [(None, 3)]
+
+
+def test_update_in_place():
+    changes = []
+
+    async def main():
+        standard = get_standard_scpd(SERVICE_TYPE)
+        service = SSDPService(ET.fromstring(XML_DEVICE), standard, 'http://127.0.0.1/')
+
+        entries = service.state_variable('PortMappingNumberOfEntries')
+        entries.coalesce(max_delay=0)
+        entries.on('changed', lambda old, new: changes.append((old, new)))
+
+        ip = service.state_variable('ExternalIPAddress')
+        mapping = service.action('GetSpecificPortMappingEntry')
+        service._apply({'PortMappingNumberOfEntries': '2'})
+
+        # Device's description: no allowed values, a retyped variable, a missing action
+        state_variables = {
+            name: definition._replace(allowed_values=None)
+            for name, definition in standard.state_variables.items()
+        }
+        state_variables['ExternalIPAddress'] = state_variables['ExternalIPAddress']._replace(data_type='ui4')
+
+        actions = dict(standard.actions)
+        del actions['ForceTermination']
+
+        service.update(ET.fromstring(XML_DEVICE), SCPD(actions, state_variables), 'http://127.0.0.1/')
+        service._apply({'PortMappingNumberOfEntries': '3'})
+
+        result = (
+            service.state_variable('PortMappingNumberOfEntries') is entries,
+            service.state_variable('ExternalIPAddress') is ip, ip.type.name,
+            service.action('GetSpecificPortMappingEntry') is mapping,
+            'ForceTermination' in {action.name for action in service.actions},
+        )
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return result
+
+    assert asyncio.run(main()) == (True, True, 'ui4', True, False)
+    assert changes == [(None, 2), (2, 3)]
+
+
+def test_call_many():
+    calls = FakeCalls()
+
+    async def main():
+        service = _service(calls)
+        results = await service.call_many([('Test', {'i': i}) for i in range(10)], concurrency=3)
+
+        await _stop(service)
+        return results
+
+    assert asyncio.run(main()) == [{'i': i} for i in range(10)]
+    assert calls.max_active == 3
+
+
+def test_call_many_error():
+    calls = FakeCalls(errors={2: 501})
+
+    async def main():
+        service = _service(calls)
+
+        with pytest.raises(SOAPError):
+            await service.call_many([('Test', {'i': i}) for i in range(10)], concurrency=3)
+
+        # Remaining calls are cancelled
+        await asyncio.sleep(0.1)
+        await _stop(service)
+
+    asyncio.run(main())
+    assert calls.active == 0
+    assert len(calls.started) < 10
+
+
+def test_call_many_return_exceptions():
+    calls = FakeCalls(errors={2: 501})
+
+    async def main():
+        service = _service(calls)
+        results = await service.call_many([('Test', {'i': i}) for i in range(4)], return_exceptions=True)
+
+        await _stop(service)
+        return results
+
+    results = asyncio.run(main())
+
+    assert isinstance(results[2], SOAPError)
+    assert [results[i] for i in (0, 1, 3)] == [{'i': 0}, {'i': 1}, {'i': 3}]
+
+
+@pytest.mark.parametrize('code', [713, 714])
+def test_iterate(code):
+    calls = FakeCalls(errors={5: code, 6: code, 7: code, 8: code})
+
+    async def main():
+        service = _service(calls)
+        results = [result async for result in service.iterate('GetGenericPortMappingEntry', window=3)]
+
+        await asyncio.sleep(0.1)
+        await _stop(service)
+        return results
+
+    assert asyncio.run(main()) == [{'i': i} for i in range(5)]
+    assert calls.active == 0
+    assert max(calls.started) <= 7  # at most window calls ahead
+
+
+def test_iterate_error():
+    calls = FakeCalls(errors={3: 501})
+
+    async def main():
+        service = _service(calls)
+        results = []
+
+        with pytest.raises(SOAPError):
+            async for result in service.iterate('GetGenericPortMappingEntry', window=3):
+                results.append(result)
+
+        await asyncio.sleep(0.1)
+        await _stop(service)
+        return results
+
+    assert asyncio.run(main()) == [{'i': i} for i in range(3)]
+    assert calls.active == 0
+    assert calls.finished == [0, 1, 2]
+
+
+def test_iterate_early_exit():
+    calls = FakeCalls()
+
+    async def main():
+        service = _service(calls)
+        results = []
+
+        iterator = service.iterate('GetGenericPortMappingEntry', window=4)
+
+        async for result in iterator:
+            results.append(result)
+
+            if len(results) == 2:
+                break
+
+        await iterator.aclose()
+        await asyncio.sleep(0.1)
+        await _stop(service)
+        return results
+
+    assert asyncio.run(main()) == [{'i': 0}, {'i': 1}]
+    assert calls.active == 0
+    assert len(calls.finished) < len(calls.started)
+
+
+def test_resync_on_dropped_events():
+    gena = FakeGENASession()
+
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+        service._gena = gena
+        await asyncio.sleep(0)  # up
+
+        first = await service.subscribe('ExternalIPAddress')
+        first._drop(4)
+        first._drop(5)
+        await asyncio.sleep(0.01)
+
+        result = service._subscription is gena.subscriptions[-1], service.subscribed
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return result
+
+    assert asyncio.run(main()) == (True, True)
+    assert gena.resubscribed == ['0']
+    assert len(gena.subscriptions) == 2
+
+
+def test_resubscribe_on_lost_subscription():
+    gena = FakeGENASession()
+
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+        service._gena = gena
+        await asyncio.sleep(0)  # up
+
+        first = await service.subscribe('ExternalIPAddress')
+        first._end()  # failed renewal
+        await asyncio.sleep(0.01)
+
+        result = service._subscription is gena.subscriptions[-1], service.subscribed
+
+        # Not after unsubscribe
+        await service.unsubscribe()
+        gena.subscriptions[-1]._end()
+        await asyncio.sleep(0.01)
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return result
+
+    assert asyncio.run(main()) == (True, True)
+    assert len(gena.subscriptions) == 2
+
+
+def test_call_many_cancelled_breaker():
+    async def main():
+        service = SSDPService(ET.fromstring(XML_DEVICE), get_standard_scpd(SERVICE_TYPE), 'http://127.0.0.1/')
+        soap = SOAPSession(SOAPTransport(breaker_threshold=2))
+        service._soap = soap
+
+        async def post(request):
+            await asyncio.sleep(1)
+
+        soap._post = post
+
+        # Lookahead dropped / early exit: remaining calls are cancelled
+        task = asyncio.ensure_future(service.call_many(
+            [('GetSpecificPortMappingEntry', {
+                'NewRemoteHost': '', 'NewExternalPort': port, 'NewProtocol': 'TCP'
+            }) for port in range(8)],
+            concurrency=8
+        ))
+        await asyncio.sleep(0.01)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        state = soap.transport.breaker(service.control).state
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return state
+
+    assert asyncio.run(main()) == 'closed'
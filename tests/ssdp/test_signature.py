@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+
+from xml.etree import ElementTree as ET
+
+from network.ssdp.service import SSDPService
+from network.ssdp.types import get_type
+
+# Constants
+XML_DEVICE = '''<service xmlns="urn:schemas-upnp-org:device-1-0">
+    <serviceType>urn:schemas-upnp-org:service:WANIPConnection:1</serviceType>
+    <serviceId>urn:upnp-org:serviceId:WANIPConn1</serviceId>
+    <SCPDURL>/scpd.xml</SCPDURL>
+    <controlURL>/ctl</controlURL>
+    <eventSubURL>/evt</eventSubURL>
+</service>'''
+
+XML_SERVICE = '''<scpd xmlns="urn:schemas-upnp-org:service-1-0">
+    <actionList>
+        <action>
+            <name>AddPortMapping</name>
+            <argumentList>
+                <argument>
+                    <name>NewExternalPort</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>ExternalPort</relatedStateVariable>
+                </argument>
+                <argument>
+                    <name>NewProtocol</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>PortMappingProtocol</relatedStateVariable>
+                </argument>
+                <argument>
+                    <name>NewEnabled</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>PortMappingEnabled</relatedStateVariable>
+                </argument>
+            </argumentList>
+        </action>
+    </actionList>
+    <serviceStateTable>
+        <stateVariable sendEvents="no">
+            <name>ExternalPort</name>
+            <dataType>ui2</dataType>
+            <allowedValueRange>
+                <minimum>1</minimum>
+                <maximum>65535</maximum>
+            </allowedValueRange>
+        </stateVariable>
+        <stateVariable sendEvents="no">
+            <name>PortMappingEnabled</name>
+            <dataType>boolean</dataType>
+        </stateVariable>
+        <stateVariable sendEvents="no">
+            <name>PortMappingProtocol</name>
+            <dataType>string</dataType>
+            <allowedValueList>
+                <allowedValue>TCP</allowedValue>
+                <allowedValue>UDP</allowedValue>
+            </allowedValueList>
+        </stateVariable>
+    </serviceStateTable>
+</scpd>'''
+
+
+# Utils
+def _signature():
+    async def build():
+        service = SSDPService(ET.fromstring(XML_DEVICE), ET.fromstring(XML_SERVICE), 'http://127.0.0.1/')
+        signature = service.action('AddPortMapping').signature
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return signature
+
+    return asyncio.run(build())
+
+
+# Test cases
+def test_encode():
+    signature = _signature()
+
+    assert signature.parameter_names == ('NewExternalPort', 'NewProtocol', 'NewEnabled')
+    assert signature.encode({'NewEnabled': True, 'NewProtocol': 'TCP', 'NewExternalPort': 8080}) == {
+        'NewExternalPort': '8080',
+        'NewProtocol': 'TCP',
+        'NewEnabled': '1',
+    }
+    assert signature.encode({'NewEnabled': 'false', 'NewProtocol': 'UDP', 'NewExternalPort': '53'}) == {
+        'NewExternalPort': '53',
+        'NewProtocol': 'UDP',
+        'NewEnabled': '0',
+    }
+
+
+def test_encode_arguments():
+    signature = _signature()
+
+    with pytest.raises(TypeError):
+        signature.encode({'NewExternalPort': 8080, 'NewProtocol': 'TCP'})
+
+    with pytest.raises(TypeError):
+        signature.encode({'NewExternalPort': 8080, 'NewProtocol': 'TCP', 'NewEnabled': True, 'NewLease': 0})
+
+
+@pytest.mark.parametrize('args', [
+    {'NewExternalPort': 0, 'NewProtocol': 'TCP', 'NewEnabled': True},
+    {'NewExternalPort': 70000, 'NewProtocol': 'TCP', 'NewEnabled': True},
+    {'NewExternalPort': 'http', 'NewProtocol': 'TCP', 'NewEnabled': True},
+    {'NewExternalPort': 8080, 'NewProtocol': 'SCTP', 'NewEnabled': True},
+    {'NewExternalPort': 8080, 'NewProtocol': 'TCP', 'NewEnabled': 'maybe'},
+])
+def test_encode_invalid(args):
+    with pytest.raises(ValueError):
+        _signature().encode(args)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1', True), ('true', True), ('True', True), ('TRUE', True), ('yes', True),
+    ('0', False), ('false', False), ('False', False), ('no', False),
+])
+def test_decode_boolean(value, expected):
+    assert get_type('boolean').to_python(value) is expected
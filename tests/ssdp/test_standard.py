@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+
+from xml.etree import ElementTree as ET
+
+from network.ssdp.scpd import call_signature
+from network.ssdp.service import SSDPService
+from network.ssdp.standard import STANDARD_SCPDS, get_standard_scpd
+
+# Constants
+XML_DEVICE = '''<service xmlns="urn:schemas-upnp-org:device-1-0">
+    <serviceType>{}</serviceType>
+    <serviceId>urn:upnp-org:serviceId:test</serviceId>
+    <SCPDURL>/scpd.xml</SCPDURL>
+    <controlURL>/ctl</controlURL>
+    <eventSubURL>/evt</eventSubURL>
+</service>'''
+
+
+# Test cases
+@pytest.mark.parametrize('service_type', sorted(STANDARD_SCPDS))
+def test_standard_scpd(service_type):
+    scpd = get_standard_scpd(service_type)
+
+    for arguments in scpd.actions.values():
+        for arg in arguments:
+            assert arg.direction in ('in', 'out')
+            assert arg.state_variable in scpd.state_variables
+
+
+def test_call_signature():
+    scpd = get_standard_scpd('urn:schemas-upnp-org:service:WANIPConnection:1')
+    signature = call_signature(scpd)
+
+    # Allowed values and defaults do not matter
+    relaxed = scpd._replace(state_variables={
+        name: definition._replace(allowed_values=None, default_value='x')
+        for name, definition in scpd.state_variables.items()
+    })
+
+    assert call_signature(relaxed) == signature
+
+    # Argument directions do
+    arguments = scpd.actions['AddPortMapping']
+    swapped = scpd._replace(actions={
+        **scpd.actions,
+        'AddPortMapping': (arguments[0]._replace(direction='out'),) + arguments[1:]
+    })
+
+    assert call_signature(swapped) != signature
+
+
+@pytest.mark.parametrize('service_type', sorted(STANDARD_SCPDS))
+def test_standard_service(service_type):
+    async def main():
+        service = SSDPService(
+            ET.fromstring(XML_DEVICE.format(service_type)), get_standard_scpd(service_type), 'http://127.0.0.1/'
+        )
+
+        signatures = [action.signature for action in service.actions]
+
+        service.down()
+        await asyncio.sleep(0.01)
+
+        return signatures
+
+    assert len(asyncio.run(main())) == len(STANDARD_SCPDS[service_type].actions)
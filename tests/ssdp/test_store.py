@@ -0,0 +1,77 @@
+import asyncio
+
+from network.ssdp import SSDPStore
+
+# Constants
+IGD = 'urn:schemas-upnp-org:service:WANIPConnection:1'
+
+
+# Utils
+class FakeService:
+    def __init__(self, address: str, delay: float, state: str = 'up'):
+        self.address = address
+        self.delay = delay
+        self.state = state
+        self.calls = 0
+
+    async def call(self, action, args, *, priority):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        if self.address.endswith('.13'):
+            raise ConnectionError('unreachable')
+
+        return {'NewExternalIPAddress': self.address}
+
+
+class FakeDevice:
+    def __init__(self, uuid: str, address: str, service: FakeService, state: str = 'up'):
+        self.uuid = uuid
+        self.address = address
+        self.service = service
+        self.state = state
+
+    def find_service(self, *stype):
+        return [self.service] if IGD in stype else []
+
+
+# Test cases
+def test_fan_out():
+    async def main():
+        store = SSDPStore()
+        devices = [
+            FakeDevice('a', '10.0.0.1', FakeService('10.0.0.1', 0.05)),
+            FakeDevice('b', '10.0.0.2', FakeService('10.0.0.2', 0.01)),
+            FakeDevice('c', '10.0.0.13', FakeService('10.0.0.13', 0.005)),
+            FakeDevice('d', '10.0.0.4', FakeService('10.0.0.4', 0), state='down'),
+            FakeDevice('e', '10.0.0.5', FakeService('10.0.0.5', 0, state='down')),
+        ]
+
+        for dev in devices:
+            store._devices[dev.uuid] = dev
+
+        results = [res async for res in store.fan_out(IGD, 'GetExternalIPAddress', concurrency=2)]
+        return devices, results
+
+    devices, results = asyncio.run(main())
+
+    # In completion order, skipping down devices and services
+    assert [res.device.uuid for res in results] == ['b', 'c', 'a']
+    assert [res.ok for res in results] == [True, False, True]
+    assert isinstance(results[1].error, ConnectionError)
+    assert results[2].result == {'NewExternalIPAddress': '10.0.0.1'}
+    assert devices[3].service.calls == 0
+    assert devices[4].service.calls == 0
+
+
+def test_fan_out_timeout():
+    async def main():
+        store = SSDPStore()
+        store._devices['a'] = FakeDevice('a', '10.0.0.1', FakeService('10.0.0.1', 1))
+
+        return [res async for res in store.fan_out(IGD, 'GetExternalIPAddress', timeout=0.01)]
+
+    results = asyncio.run(main())
+
+    assert len(results) == 1
+    assert isinstance(results[0].error, asyncio.TimeoutError)
@@ -0,0 +1,139 @@
+import asyncio
+import inspect
+
+from xml.etree import ElementTree as ET
+
+from network.ssdp import SSDPMessage, SSDPRemoteDevice, StubCache, parse_scpd
+from network.ssdp import device, stubs
+
+# Constants
+SERVICE_TYPE = 'urn:schemas-upnp-org:service:Layer3Forwarding:1'
+
+XML_SERVICE = b'''<scpd xmlns="urn:schemas-upnp-org:service-1-0">
+    <actionList>
+        <action>
+            <name>SetDefaultConnectionService</name>
+            <argumentList>
+                <argument>
+                    <name>NewDefaultConnectionService</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>DefaultConnectionService</relatedStateVariable>
+                </argument>
+            </argumentList>
+        </action>
+        <action>
+            <name>GetDefaultConnectionService</name>
+            <argumentList>
+                <argument>
+                    <name>NewDefaultConnectionService</name>
+                    <direction>out</direction>
+                    <relatedStateVariable>DefaultConnectionService</relatedStateVariable>
+                </argument>
+            </argumentList>
+        </action>
+    </actionList>
+    <serviceStateTable>
+        <stateVariable sendEvents="yes">
+            <name>DefaultConnectionService</name>
+            <dataType>string</dataType>
+        </stateVariable>
+    </serviceStateTable>
+</scpd>'''
+
+XML_DEVICE = '''<device xmlns="urn:schemas-upnp-org:device-1-0">
+    <deviceType>urn:schemas-upnp-org:device:InternetGatewayDevice:1</deviceType>
+    <friendlyName>Gateway</friendlyName>
+    <UDN>uuid:gateway</UDN>
+    <serviceList>
+        <service>
+            <serviceType>urn:schemas-upnp-org:service:Layer3Forwarding:1</serviceType>
+            <serviceId>urn:upnp-org:serviceId:L3Forwarding1</serviceId>
+            <SCPDURL>/l3f.xml</SCPDURL>
+            <controlURL>/ctl/l3f</controlURL>
+            <eventSubURL>/evt/l3f</eventSubURL>
+        </service>
+    </serviceList>
+</device>'''
+
+NOTIFY = (
+    'NOTIFY * HTTP/1.1\r\n'
+    'HOST: 239.255.255.250:1900\r\n'
+    'CACHE-CONTROL: max-age=1800\r\n'
+    'LOCATION: http://192.168.1.1:5000/rootDesc.xml\r\n'
+    'NT: upnp:rootdevice\r\n'
+    'NTS: ssdp:alive\r\n'
+    'USN: uuid:gateway::upnp:rootdevice\r\n'
+    '\r\n'
+)
+
+
+# Test cases
+def test_parse_scpd():
+    scpd = parse_scpd(ET.fromstring(XML_SERVICE))
+
+    assert list(scpd.actions) == ['SetDefaultConnectionService', 'GetDefaultConnectionService']
+    assert scpd.actions['GetDefaultConnectionService'][0].direction == 'out'
+    assert scpd.state_variables['DefaultConnectionService'].data_type == 'string'
+    assert scpd.state_variables['DefaultConnectionService'].send_events
+
+
+def test_generate_stub(tmp_path):
+    cache = StubCache(str(tmp_path))
+    module = cache.get(SERVICE_TYPE, XML_SERVICE)
+
+    assert module.SERVICE_TYPE == SERVICE_TYPE
+    assert module.DEFINITION == parse_scpd(ET.fromstring(XML_SERVICE))
+
+    client = module.Layer3Forwarding1
+    assert inspect.iscoroutinefunction(client.SetDefaultConnectionService)
+    assert list(inspect.signature(client.SetDefaultConnectionService).parameters) == [
+        'self', 'NewDefaultConnectionService'
+    ]
+
+
+def test_class_name(tmp_path):
+    assert stubs.class_name(SERVICE_TYPE) == 'Layer3Forwarding1'
+    assert stubs.class_name('urn:schemas-example-com:service:3DScene:1') == 'Service3DScene1'
+
+    module = StubCache(str(tmp_path)).get('urn:schemas-example-com:service:3DScene:1', XML_SERVICE)
+    assert inspect.iscoroutinefunction(module.Service3DScene1.GetDefaultConnectionService)
+
+
+def test_cached_stub(tmp_path, monkeypatch):
+    StubCache(str(tmp_path)).get(SERVICE_TYPE, XML_SERVICE)
+
+    # Loaded from disk, without parsing
+    def parse(xml):
+        raise AssertionError('SCPD parsed again')
+
+    monkeypatch.setattr(stubs, 'parse_scpd', parse)
+    module = StubCache(str(tmp_path)).get(SERVICE_TYPE, XML_SERVICE)
+
+    assert 'GetDefaultConnectionService' in module.DEFINITION.actions
+
+
+def test_device_stubs(tmp_path, monkeypatch):
+    StubCache(str(tmp_path)).get(SERVICE_TYPE, XML_SERVICE)
+
+    # Descriptions come through the cache, without parsing
+    async def get_data(url):
+        assert url == 'http://192.168.1.1:5000/l3f.xml'
+        return XML_SERVICE
+
+    def parse(xml):
+        raise AssertionError('SCPD parsed again')
+
+    monkeypatch.setattr(device, 'get_data', get_data)
+    monkeypatch.setattr(stubs, 'parse_scpd', parse)
+
+    async def main():
+        remote = SSDPRemoteDevice(
+            SSDPMessage(message=NOTIFY), ET.fromstring(XML_DEVICE), '192.168.1.1',
+            stubs=StubCache(str(tmp_path))
+        )
+
+        await asyncio.gather(*remote._tasks.values())
+        return remote.service('urn:upnp-org:serviceId:L3Forwarding1')
+
+    service = asyncio.run(main())
+    assert [action.name for action in service.actions] == ['SetDefaultConnectionService', 'GetDefaultConnectionService']
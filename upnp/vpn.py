@@ -58,8 +58,9 @@ class IGD:
             if device.type in IGD_URNS:
                 event.set()
 
-        protocol = await self.ssdp.search(*IGD_URNS)
-        await protocol.wait('disconnected')
+        async for _ in self.ssdp.search_iter(*IGD_URNS, limit=1):
+            pass
+
         await event.wait()
 
     async def stop(self):